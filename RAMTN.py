@@ -1,8 +1,32 @@
 import re
 import os
+import sys
 import json
-from typing import List, Dict, Optional, Any
-from dashscope import Generation
+import argparse
+import time
+import queue
+import asyncio
+import sqlite3
+import signal
+import socket
+import hashlib
+import heapq
+import threading
+import multiprocessing
+import uuid
+import weakref
+import random
+import contextvars
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager, redirect_stdout
+from contextvars import ContextVar
+from typing import List, Dict, Optional, Any, Tuple, Callable, Iterator
+import aiohttp
+import requests
+from dashscope import Generation, AioGeneration
 import dashscope
 from datetime import datetime
 
@@ -13,6 +37,247 @@ from datetime import datetime
 dashscope.base_http_api_url = 'https://dashscope.aliyuncs.com/api/v1'
 
 
+# ===================== Framework Registry =====================
+# Index file describing every framework file in a registry directory
+FRAMEWORK_INDEX_FILE = "index.json"
+FRAMEWORK_INDEX_VERSION = 1
+FRAMEWORK_FILE_EXTENSIONS = (".json", ".yaml", ".yml")
+
+# Optional directory of framework files opened by the global strategic_framework
+DEFAULT_REGISTRY_DIR = os.getenv("RAMTN_FRAMEWORK_REGISTRY")
+
+
+def _read_framework_file(path: str) -> Dict[str, Any]:
+    """Read one framework definition; FrameworkStore records yield their extracted framework"""
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError(f"PyYAML is required to load {path} (pip install pyyaml)")
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+
+    if not isinstance(data, dict):
+        raise ValueError(f"Framework file {path} does not contain a mapping")
+    if "extracted_framework" in data:
+        return data["extracted_framework"]
+    return data
+
+
+class FrameworkRegistry:
+    """
+    Lazily loaded strategic framework definitions
+    - Each entry is a loader plus summary metadata; the definition is only built or read on first use
+    - Registry directories carry an index file (key -> file, kind, name, description), so opening one
+      reads the index only, never the framework files
+    - Built-in dimensions and any number of extracted frameworks live side by side
+    - Loaded definitions are kept in an LRU bounded by max_loaded (None: keep everything)
+    """
+
+    DEFINITION = "definition"
+    EXTRACTED = "extracted"
+
+    def __init__(self, max_loaded: Optional[int] = None):
+        self.max_loaded = max_loaded
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._loaded: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.loads = 0
+        # Bumped on every registration; part of StrategicDecisionFramework.version
+        self.generation = 0
+
+    def register(self, key: str, loader: Callable[[], Dict[str, Any]], kind: str = DEFINITION,
+                 name: Optional[str] = None, description: Optional[str] = None, source: Optional[str] = None):
+        """Register a framework by loader; replaces any earlier entry with the same key"""
+        with self._lock:
+            self._entries[key] = {"kind": kind, "name": name, "description": description,
+                                  "loader": loader, "source": source}
+            self._loaded.pop(key, None)
+            self.generation += 1
+
+    def register_many(self, loaders: Dict[str, Callable[[], Dict[str, Any]]], kind: str = DEFINITION):
+        """Register several frameworks by loader under one lock; existing keys are kept"""
+        with self._lock:
+            for key, loader in loaders.items():
+                if key not in self._entries:
+                    self._entries[key] = {"kind": kind, "name": None, "description": None,
+                                          "loader": loader, "source": None}
+            self.generation += 1
+
+    def unregister(self, key: str):
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._loaded.pop(key, None)
+                self.generation += 1
+
+    def register_definition(self, key: str, definition: Dict[str, Any], kind: str = DEFINITION):
+        """Register an in-memory framework definition"""
+        name, description = self._summary_fields(definition)
+        self.register(key, lambda: definition, kind=kind, name=name, description=description)
+
+    def add_directory(self, directory: str, update_index: bool = True) -> int:
+        """
+        Register every framework listed in a directory's index file; returns the number registered
+        - update_index: bring the index up to date first (reads only files the index does not know)
+        """
+        if update_index:
+            index = self.build_index(directory)
+        else:
+            index = self.read_index(directory)
+
+        for key, entry in index.items():
+            path = os.path.join(directory, entry["file"])
+            self.register(key, lambda path=path: _read_framework_file(path), kind=entry.get("kind", self.DEFINITION),
+                          name=entry.get("name"), description=entry.get("description"), source=path)
+        return len(index)
+
+    @staticmethod
+    def read_index(directory: str) -> Dict[str, Dict[str, Any]]:
+        path = os.path.join(directory, FRAMEWORK_INDEX_FILE)
+        if not os.path.exists(path):
+            return {}
+        with open(path, "r", encoding="utf-8") as f:
+            record = json.load(f)
+        version = record.get("format_version", 0)
+        if version > FRAMEWORK_INDEX_VERSION:
+            raise ValueError(f"Framework index {path} has unsupported format version {version}")
+        return record.get("frameworks", {})
+
+    @classmethod
+    def build_index(cls, directory: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Create or refresh a directory's index file
+        - Entries for files that no longer exist are dropped; only files new to the index are read
+        """
+        index = cls.read_index(directory)
+        files = {name for name in os.listdir(directory)
+                 if name.endswith(FRAMEWORK_FILE_EXTENSIONS) and name != FRAMEWORK_INDEX_FILE}
+        known = {entry["file"] for entry in index.values()}
+
+        changed = False
+        for key in [key for key, entry in index.items() if entry["file"] not in files]:
+            del index[key]
+            changed = True
+        for name in sorted(files - known):
+            try:
+                definition = _read_framework_file(os.path.join(directory, name))
+            except (ValueError, ImportError, json.JSONDecodeError) as e:
+                print(f"Skipping framework file {name}: {e}")
+                continue
+            key = os.path.splitext(name)[0]
+            index[key] = cls._index_entry(name, definition)
+            changed = True
+
+        if changed:
+            cls._write_index(directory, index)
+        return index
+
+    def save(self, directory: str, key: str, definition: Dict[str, Any], kind: str = DEFINITION) -> str:
+        """Write a framework file into a registry directory, add it to the index and register it"""
+        os.makedirs(directory, exist_ok=True)
+        name = f"{key}.json"
+        path = os.path.join(directory, name)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(definition, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+        index = self.read_index(directory)
+        index[key] = self._index_entry(name, definition, kind)
+        self._write_index(directory, index)
+
+        entry = index[key]
+        self.register(key, lambda: _read_framework_file(path), kind=kind,
+                      name=entry["name"], description=entry["description"], source=path)
+        return path
+
+    @staticmethod
+    def _write_index(directory: str, index: Dict[str, Dict[str, Any]]):
+        path = os.path.join(directory, FRAMEWORK_INDEX_FILE)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"format_version": FRAMEWORK_INDEX_VERSION, "frameworks": index}, f,
+                      ensure_ascii=False, indent=1)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def _index_entry(cls, file_name: str, definition: Dict[str, Any], kind: Optional[str] = None) -> Dict[str, Any]:
+        if kind is None:
+            extracted = "framework_name" in definition or "key_insights" in definition
+            kind = cls.EXTRACTED if extracted else cls.DEFINITION
+        name, description = cls._summary_fields(definition)
+        return {"file": file_name, "kind": kind, "name": name, "description": description}
+
+    @staticmethod
+    def _summary_fields(definition: Dict[str, Any]) -> Tuple[str, str]:
+        name = definition.get("name") or definition.get("framework_name") or ""
+        return name, definition.get("description", "")
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        with self._lock:
+            definition = self._loaded.get(key)
+            if definition is not None:
+                self._loaded.move_to_end(key)
+                return definition
+            entry = self._entries[key]
+
+            definition = entry["loader"]()
+            self.loads += 1
+            self._loaded[key] = definition
+            if self.max_loaded is not None and len(self._loaded) > self.max_loaded:
+                self._loaded.popitem(last=False)
+            return definition
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._entries))
+
+    def keys(self, kind: Optional[str] = None) -> List[str]:
+        return [key for key, entry in self._entries.items() if kind is None or entry["kind"] == kind]
+
+    def items(self, kind: Optional[str] = None) -> List[Tuple[str, Dict[str, Any]]]:
+        """(key, definition) pairs; loads every matching framework"""
+        return [(key, self[key]) for key in self.keys(kind)]
+
+    def summaries(self, kind: Optional[str] = None) -> List[Tuple[str, str, str]]:
+        """(key, name, description) triples; only frameworks without indexed metadata are loaded"""
+        summaries = []
+        for key in self.keys(kind):
+            entry = self._entries[key]
+            if entry["name"] is None:
+                entry["name"], entry["description"] = self._summary_fields(self[key])
+            summaries.append((key, entry["name"], entry["description"]))
+        return summaries
+
+    def in_memory_keys(self, kind: Optional[str] = None) -> List[str]:
+        """Keys registered from in-memory definitions rather than files"""
+        return [key for key in self.keys(kind) if self._entries[key]["source"] is None]
+
+    def is_loaded(self, key: str) -> bool:
+        return key in self._loaded
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "registered": len(self._entries),
+            "extracted": len(self.keys(self.EXTRACTED)),
+            "loaded": len(self._loaded),
+            "loads": self.loads
+        }
+
+
 # ===================== Core Framework for Personal Strategic Decision System =====================
 class StrategicDecisionFramework:
     """
@@ -20,19 +285,35 @@ class StrategicDecisionFramework:
     - Provides reference for constructors, critics, and observers
     - Supports both framework extraction and implantation modes
     - Contains six strategic analysis dimensions for comprehensive decision support
+    - Frameworks live in a FrameworkRegistry and are built or read from disk on first use
+    - At most max_extracted extracted frameworks set in memory stay registered (least recently used
+      dropped first), so a long-lived engine does not grow with every distinct question
     """
 
-    def __init__(self):
-        """Initialize the strategic framework with six core analytical dimensions"""
-        self.frameworks = {
-            "three_dimensional_matrix": self._get_3d_matrix(),
-            "three_level_classification": self._get_3level_classification(),
-            "dynamic_stability": self._get_dynamic_stability(),
-            "option_management": self._get_option_management(),
-            "sequential_progressive": self._get_sequential_progressive(),
-            "hub_ecological_niche": self._get_hub_ecological_niche()
-        }
+    # Built-in dimensions and the methods that build them
+    BUILTIN_FRAMEWORKS = {
+        "three_dimensional_matrix": "_get_3d_matrix",
+        "three_level_classification": "_get_3level_classification",
+        "dynamic_stability": "_get_dynamic_stability",
+        "option_management": "_get_option_management",
+        "sequential_progressive": "_get_sequential_progressive",
+        "hub_ecological_niche": "_get_hub_ecological_niche"
+    }
+
+    def __init__(self, registry: Optional[FrameworkRegistry] = None, max_extracted: Optional[int] = 32):
+        """Initialize the strategic framework with six core analytical dimensions (built lazily)"""
+        self.frameworks = registry if registry is not None else FrameworkRegistry()
+        self.max_extracted = max_extracted
+        self._extracted_order: "OrderedDict[str, None]" = OrderedDict()  # In-memory extracted ids, oldest first
+        self.frameworks.register_many({framework_key: getattr(self, factory)
+                                       for framework_key, factory in self.BUILTIN_FRAMEWORKS.items()})
         self.extracted_framework = None  # Store user-extracted strategic system
+        self.extracted_framework_id = None  # Registry key of the active extracted framework, if any
+        self.supporting_framework_ids: List[str] = []  # Further extracted frameworks shown in the guidance
+        # Bumped whenever the extracted framework changes; with the registry generation it keys the
+        # memoized guidance and fit results
+        self._extraction_version = 0
+        self._cache: Dict[Tuple, Any] = {}
 
     def _get_3d_matrix(self) -> Dict[str, Any]:
         """Three-Dimensional Matrix - Ecological Niche Positioning Compass"""
@@ -183,19 +464,81 @@ class StrategicDecisionFramework:
             "application_guidance": "Every decision should be examined: 'Does this bring me closer to or further from a hub ecological niche?'"
         }
 
-    def set_extracted_framework(self, framework_data: Dict[str, Any]):
-        """Set user-extracted strategic system for subsequent analysis"""
+    @property
+    def version(self) -> int:
+        """Changes whenever the extracted framework or the registered frameworks change"""
+        return self._extraction_version + self.frameworks.generation
+
+    def set_extracted_framework(self, framework_data: Dict[str, Any], framework_id: Optional[str] = None):
+        """
+        Set user-extracted strategic system for subsequent analysis
+        - framework_id: also register it, so other extracted frameworks stay available side by side
+        """
         self.extracted_framework = framework_data
+        self.extracted_framework_id = framework_id
+        self.supporting_framework_ids = []
+        if framework_id is not None and self.frameworks.get(framework_id) is not framework_data:
+            self.register_extracted(framework_id, framework_data)
+        elif framework_id in self._extracted_order:
+            self._extracted_order.move_to_end(framework_id)
+        self._extraction_version += 1
+        self._cache.clear()
+
+    def register_extracted(self, framework_id: str, framework_data: Dict[str, Any]):
+        """Register an in-memory extracted framework, dropping the least recently used ones beyond max_extracted"""
+        self.frameworks.register_definition(framework_id, framework_data, kind=FrameworkRegistry.EXTRACTED)
+        self._extracted_order[framework_id] = None
+        self._extracted_order.move_to_end(framework_id)
+        if self.max_extracted is None:
+            return
+        in_use = {self.extracted_framework_id, *self.supporting_framework_ids}
+        for evicted in list(self._extracted_order):
+            if len(self._extracted_order) <= self.max_extracted:
+                break
+            if evicted not in in_use:
+                del self._extracted_order[evicted]
+                self.frameworks.unregister(evicted)
+
+    def set_supporting_frameworks(self, framework_ids: List[str]):
+        """Registered extracted frameworks to list next to the active one during implantation"""
+        self.supporting_framework_ids = list(framework_ids)
+        for framework_id in framework_ids:
+            if framework_id in self._extracted_order:
+                self._extracted_order.move_to_end(framework_id)
+        self._extraction_version += 1
+        self._cache.clear()
+
+    def reset(self):
+        """Forget extracted frameworks set in memory; built-in and file-backed frameworks stay loaded"""
+        for framework_id in self.frameworks.in_memory_keys(FrameworkRegistry.EXTRACTED):
+            self.frameworks.unregister(framework_id)
+        self._extracted_order.clear()
+        self.extracted_framework = None
+        self.extracted_framework_id = None
+        self.supporting_framework_ids = []
+        self._extraction_version += 1
+        self._cache.clear()
+
+    def use_extracted_framework(self, framework_id: str) -> Dict[str, Any]:
+        """Activate a registered extracted framework (loaded from disk on first use)"""
+        framework_data = self.frameworks[framework_id]
+        self.set_extracted_framework(framework_data, framework_id)
+        return framework_data
 
     def get_comprehensive_guidance(self, user_input: str, user_traits: Dict[str, Any] = None,
                                    mode: str = "extraction") -> str:
         """
         Get comprehensive strategic framework guidance
         Supports both extraction (framework distillation) and implantation (framework application) modes
+        The text depends only on mode and the extracted framework, so it is memoized per (mode, version)
         """
-        if user_traits is None:
-            user_traits = {}
+        key = ("guidance", mode, self.version)
+        guidance = self._cache.get(key)
+        if guidance is None:
+            guidance = self._cache[key] = self._build_comprehensive_guidance(mode)
+        return guidance
 
+    def _build_comprehensive_guidance(self, mode: str) -> str:
         guidance = "【Comprehensive Guidance for Personal Strategic Decision System】\n\n"
 
         if mode == "extraction":
@@ -207,8 +550,8 @@ class StrategicDecisionFramework:
 
         # Built-in framework guidance
         guidance += "● Built-in Strategic Framework Library:\n"
-        for framework_key, framework in self.frameworks.items():
-            guidance += f"  - {framework['name']}: {framework['description']}\n"
+        for framework_key, name, description in self.frameworks.summaries(FrameworkRegistry.DEFINITION):
+            guidance += f"  - {name}: {description}\n"
 
         # Extracted framework guidance (if exists)
         if self.extracted_framework and mode == "implantation":
@@ -219,6 +562,14 @@ class StrategicDecisionFramework:
                 for insight in self.extracted_framework['key_insights'][:3]:  # Show top 3 key insights
                     guidance += f"    * {insight}\n"
 
+        if self.supporting_framework_ids and mode == "implantation":
+            guidance += f"\n● Related Extracted Systems:\n"
+            for framework_id in self.supporting_framework_ids:
+                supporting = self.frameworks[framework_id]
+                guidance += f"  - {supporting.get('framework_name', framework_id)}\n"
+                for insight in supporting.get('key_insights', [])[:1]:
+                    guidance += f"    * {insight}\n"
+
         guidance += f"\n【{mode.upper()} MODE GUIDANCE】\n"
 
         if mode == "extraction":
@@ -241,7 +592,22 @@ class StrategicDecisionFramework:
         return guidance
 
     def analyze_framework_fit(self, user_traits: Dict[str, Any], framework_key: str) -> Dict[str, Any]:
-        """Analyze framework compatibility - simplified implementation"""
+        """
+        Analyze framework compatibility - simplified implementation
+        - Memoized per (framework, traits, version); callers get a copy they are free to modify
+        """
+        try:
+            traits_key = frozenset(user_traits.items())
+        except TypeError:
+            # LLM-derived traits may hold lists or dicts
+            traits_key = json.dumps(user_traits, sort_keys=True, ensure_ascii=False, default=str)
+        key = ("fit", framework_key, traits_key, self.version)
+        fit = self._cache.get(key)
+        if fit is None:
+            fit = self._cache[key] = self._build_framework_fit(user_traits, framework_key)
+        return dict(fit)
+
+    def _build_framework_fit(self, user_traits: Dict[str, Any], framework_key: str) -> Dict[str, Any]:
         if framework_key not in self.frameworks:
             return {
                 "overall_fit": 0.5,
@@ -267,45 +633,73 @@ class StrategicDecisionFramework:
         }
 
     def get_framework_guidance(self, framework_key: str, question: str) -> str:
-        """Get framework-specific guidance - simplified implementation"""
-        if framework_key in self.frameworks:
-            framework = self.frameworks[framework_key]
-            return f"Framework Guidance: {framework['name']} - {framework['description']}"
-        return "Using strategic framework for analysis"
+        """Get framework-specific guidance - simplified implementation, memoized per (framework, version)"""
+        key = ("framework_guidance", framework_key, self.version)
+        guidance = self._cache.get(key)
+        if guidance is None:
+            if framework_key in self.frameworks:
+                framework = self.frameworks[framework_key]
+                guidance = f"Framework Guidance: {framework['name']} - {framework['description']}"
+            else:
+                guidance = "Using strategic framework for analysis"
+            self._cache[key] = guidance
+        return guidance
+
+    def get_system_message(self, role: str, is_first_layer: bool = True, mode: str = "extraction") -> str:
+        """
+        Stable system message for constructor calls: role instructions, framework guidance (first layer)
+        and base constraints
+        - Identical for every call with the same (role, layer kind, mode, framework version), so the
+          provider can reuse its cached prefix instead of re-reading it
+        """
+        key = ("system", role, is_first_layer, mode, self.version)
+        system_message = self._cache.get(key)
+        if system_message is None:
+            parts = [SYSTEM_MESSAGES.get(role, SYSTEM_MESSAGES["default"])]
+            if is_first_layer:
+                parts.append(self.get_comprehensive_guidance("", mode=mode))
+            parts.append(STRATEGIC_BASE_CONSTRAINTS)
+            system_message = self._cache[key] = "\n\n".join(parts)
+        return system_message
 
 
 # Global strategic framework instance
 strategic_framework = StrategicDecisionFramework()
+if DEFAULT_REGISTRY_DIR:
+    strategic_framework.frameworks.add_directory(DEFAULT_REGISTRY_DIR)
 
 
 # ===================== Strategic Cognition Domain Prompt Templates =====================
-def create_strategic_prompt(question: str, is_first_layer: bool = True,
-                            previous_response: str = "", previous_critique: str = "",
-                            layer_num: int = 1, mode: str = "extraction") -> str:
-    """
-    Create strategic cognition domain prompts
-    Supports both extraction (framework distillation) and implantation (framework application) modes
-    """
-
-    # Get strategic framework guidance
-    framework_guidance = strategic_framework.get_comprehensive_guidance(question, mode=mode)
-
-    # Base constraints
-    base_constraints = """Important Requirements:
+# Base constraints shared by every constructor layer (part of the cached system prefix)
+STRATEGIC_BASE_CONSTRAINTS = """Important Requirements:
 1. All analysis must be based on the logical patterns and cognitive characteristics in user input
 2. Must clearly distinguish cognitive boundaries, label inference reliability  
 3. Must organize analysis content according to the following three categories, 3-8 core points per category
 4. Concise language, avoid repetition and over-argumentation
 5. Reference strategic decision system for analysis, but must apply personalizedly based on user specifics"""
 
+
+def create_strategic_system_message(role: str, is_first_layer: bool = True, mode: str = "extraction",
+                                    framework: Optional[StrategicDecisionFramework] = None) -> str:
+    """Constructor system message of the given framework (default: the global one), see get_system_message"""
+    if framework is None:
+        framework = strategic_framework
+    return framework.get_system_message(role, is_first_layer, mode)
+
+
+def create_strategic_prompt(question: str, is_first_layer: bool = True,
+                            previous_response: str = "", previous_critique: str = "",
+                            layer_num: int = 1, mode: str = "extraction",
+                            framework: Optional[StrategicDecisionFramework] = None) -> str:
+    """
+    Create strategic cognition domain prompts
+    Supports both extraction (framework distillation) and implantation (framework application) modes
+    Framework guidance and base constraints live in create_strategic_system_message, not in the prompt
+    """
     if is_first_layer:
         if mode == "extraction":
             prompt = f"""You are a professional strategic cognition AI advisor, specialized in extracting strategic decision systems from user input. Please distill decision patterns and strategic principles from user input, and output strictly according to format.
 
-{framework_guidance}
-
-{base_constraints}
-
 【Strategic Extraction Task】
 Extract the following from user input:
 1. Core values and decision logic
@@ -324,10 +718,6 @@ Please begin strategic extraction:"""
         else:  # implantation mode
             prompt = f"""You are a professional strategic cognition AI advisor, specialized in analyzing user problems using strategic frameworks. Please conduct deep analysis of user problems based on strategic decision systems, and output strictly according to format.
 
-{framework_guidance}
-
-{base_constraints}
-
 【Strategic Implantation Task】
 Analyze the following using strategic frameworks:
 1. Problem positioning within strategic frameworks
@@ -371,7 +761,6 @@ Previous Round {mode_description}:
 Previous Round Critique Points:
 {previous_critique}
 
-{base_constraints}
 {layer_constraints}
 
 Please make precise improvements based on critique:
@@ -387,6 +776,18 @@ Improved {mode_description}:"""
 
 
 # ===================== Confidence Triplet Parser =====================
+# Framework sections in priority order: an item goes to the first section whose keywords it contains
+FRAMEWORK_SECTION_KEYWORDS = (
+    ("key_insights", ("principle", "logic", "pattern", "values", "core", "key", "essence")),
+    ("decision_patterns", ("decision", "choice", "judgment", "consideration", "evaluation", "analysis")),
+    ("risk_considerations", ("risk", "limitation", "challenge", "problem", "uncertainty", "blind spot")),
+    ("application_boundaries", ("boundary", "limit", "applicable", "don't know", "unknown", "immeasurable"))
+)
+# One compiled alternation per section: a single search replaces a substring test per keyword
+_FRAMEWORK_SECTION_PATTERNS = tuple(re.compile("|".join(re.escape(keyword) for keyword in keywords))
+                                    for _, keywords in FRAMEWORK_SECTION_KEYWORDS)
+
+
 class ConfidenceTripletExtractor:
     """
     Parser for confidence triplets (I am confident/I speculate/I don't know)
@@ -395,9 +796,31 @@ class ConfidenceTripletExtractor:
     - Provides similarity analysis between different triplets
     """
 
+    HEADER_CATEGORIES = {
+        "I am confident": "confident",
+        "I speculate": "speculative",
+        "I don't know": "unknown"
+    }
+
+    # One scan finds every section boundary: any 【...】 header (or stray 【), or a bare header at
+    # the start of a line. Bare headers may carry markdown/list prefixes ("### ", "- ", "1. "), bold
+    # markers, and end with a colon or the end of the line (or a bullet right after the phrase)
+    _SECTION_PATTERN = re.compile(
+        r'【([^【】]*)】?'
+        r'|^[ \t]*(?:#{1,6}[ \t]*|(?:[-*•·]|\d+[.)])[ \t]+)?(?:\*\*|__)?[ \t]*'
+        r'(I am confident|I speculate|I don\'t know)[ \t]*(?:\*\*|__)?[ \t]*'
+        r'(?:[：:](?:[ \t]*(?:\*\*|__))?|(?=[ \t\r]*$|[•\-\*·]))',
+        re.MULTILINE
+    )
+    _BULLET_PATTERN = re.compile(r'[•\-\*•·]')
+
     @staticmethod
     def extract_triplets(text: str) -> Dict[str, List[str]]:
-        """Extract content from three confidence categories from text"""
+        """
+        Extract content from three confidence categories from text
+        - Single pass: each section body runs from its header to the next boundary
+        - Sections with unrecognized headers are skipped
+        """
         triplets = {
             "confident": [],  # I am confident
             "speculative": [],  # I speculate
@@ -407,27 +830,36 @@ class ConfidenceTripletExtractor:
         if not text:
             return triplets
 
-        # Define matching patterns
-        patterns = {
-            "confident": [r'【I am confident】\s*([^】]*?)(?=【|$)', r'I am confident[：:\s]*([^】]*?)(?=【|$)'],
-            "speculative": [r'【I speculate】\s*([^】]*?)(?=【|$)', r'I speculate[：:\s]*([^】]*?)(?=【|$)'],
-            "unknown": [r'【I don\'t know】\s*([^】]*?)(?=【|$)', r'I don\'t know[：:\s]*([^】]*?)(?=【|$)']
-        }
+        extractor = ConfidenceTripletExtractor
+        boundaries = list(extractor._SECTION_PATTERN.finditer(text))
+        for index, boundary in enumerate(boundaries):
+            label = (boundary.group(1) or boundary.group(2) or "").strip()
+            category = extractor.HEADER_CATEGORIES.get(label)
+            if category is None:
+                continue
 
-        for category, pattern_list in patterns.items():
-            for pattern in pattern_list:
-                matches = re.findall(pattern, text, re.DOTALL)
-                for match in matches:
-                    if match.strip():
-                        # Split into individual items
-                        items = re.split(r'[•\-\*•·]', match.strip())
-                        for item in items:
-                            item_clean = item.strip()
-                            if item_clean and len(item_clean) > 3:  # Filter out overly short content
-                                triplets[category].append(item_clean)
+            end = boundaries[index + 1].start() if index + 1 < len(boundaries) else len(text)
+            # Split into individual items
+            for item in extractor._BULLET_PATTERN.split(text[boundary.end():end]):
+                item_clean = item.strip()
+                if item_clean and len(item_clean) > 3:  # Filter out overly short content
+                    triplets[category].append(item_clean)
 
         return triplets
 
+    @staticmethod
+    def classify_items(items: List[str]) -> List[int]:
+        """Index into FRAMEWORK_SECTION_KEYWORDS of the first section whose keywords each item contains (-1: none)"""
+        sections = []
+        for item in items:
+            for section, pattern in enumerate(_FRAMEWORK_SECTION_PATTERNS):
+                if pattern.search(item):
+                    sections.append(section)
+                    break
+            else:
+                sections.append(-1)
+        return sections
+
     @staticmethod
     def extract_framework_from_triplets(triplets: Dict[str, List[str]]) -> Dict[str, Any]:
         """Extract strategic framework from triplets - optimized version"""
@@ -440,31 +872,17 @@ class ConfidenceTripletExtractor:
             "application_boundaries": []
         }
 
-        # Extract key insights from all categories (optimized logic)
+        # Classify items from all categories in one pass; dicts dedupe while keeping first-seen order
         all_items = []
         for category in ["confident", "speculative", "unknown"]:
             all_items.extend(triplets.get(category, []))
 
-        for item in all_items:
-            # Extract key insights - more comprehensive matching logic
-            if any(keyword in item for keyword in ["principle", "logic", "pattern", "values", "core", "key", "essence"]):
-                if item not in framework["key_insights"]:
-                    framework["key_insights"].append(item)
-
-            # Extract decision patterns - more comprehensive matching logic
-            elif any(keyword in item for keyword in ["decision", "choice", "judgment", "consideration", "evaluation", "analysis"]):
-                if item not in framework["decision_patterns"]:
-                    framework["decision_patterns"].append(item)
-
-            # Extract risk considerations - more comprehensive matching logic
-            elif any(keyword in item for keyword in ["risk", "limitation", "challenge", "problem", "uncertainty", "blind spot"]):
-                if item not in framework["risk_considerations"]:
-                    framework["risk_considerations"].append(item)
-
-            # Extract application boundaries - more comprehensive matching logic
-            elif any(keyword in item for keyword in ["boundary", "limit", "applicable", "don't know", "unknown", "immeasurable"]):
-                if item not in framework["application_boundaries"]:
-                    framework["application_boundaries"].append(item)
+        sections = [{} for _ in FRAMEWORK_SECTION_KEYWORDS]
+        for item, section in zip(all_items, ConfidenceTripletExtractor.classify_items(all_items)):
+            if section >= 0:
+                sections[section][item] = None
+        for (name, _), items in zip(FRAMEWORK_SECTION_KEYWORDS, sections):
+            framework[name] = list(items)
 
         # If insufficient content extracted, use heuristic methods to supplement
         if not framework["key_insights"] and triplets["confident"]:
@@ -530,6 +948,798 @@ class ConfidenceTripletExtractor:
         return total_similarity / category_count if category_count > 0 else 0
 
 
+# ===================== Content Stability Predictors =====================
+class StabilityPredictor(ABC):
+    """
+    Decides whether a layer's triplets have converged with the previous round
+    - A stable layer terminates early, skipping its critic and observer calls
+    - Subclasses implement similarity(); is_stable() applies the threshold
+    """
+
+    def __init__(self, threshold: float = 0.75):
+        self.threshold = threshold
+
+    @abstractmethod
+    def similarity(self, current: Dict[str, List[str]], previous: Dict[str, List[str]]) -> float:
+        ...
+
+    def is_stable(self, current: Dict[str, List[str]], previous: Dict[str, List[str]]) -> Tuple[bool, float]:
+        similarity = self.similarity(current, previous)
+        return similarity > self.threshold, similarity
+
+
+class JaccardStabilityPredictor(StabilityPredictor):
+    """Per-category Jaccard over item prefixes (ConfidenceTripletExtractor.calculate_similarity)"""
+
+    def similarity(self, current: Dict[str, List[str]], previous: Dict[str, List[str]]) -> float:
+        return ConfidenceTripletExtractor.calculate_similarity(current, previous)
+
+
+class MinHashStabilityPredictor(StabilityPredictor):
+    """
+    MinHash estimate of Jaccard similarity over category-tagged word shingles
+    - Tolerates rewording and reordering that defeats exact prefix matching
+    - Signatures are memoized, so a layer's triplets are hashed only once across comparisons
+    """
+
+    _PRIME = (1 << 61) - 1
+
+    def __init__(self, threshold: float = 0.7, num_perm: int = 64, shingle_size: int = 3, seed: int = 1):
+        super().__init__(threshold)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = random.Random(seed)
+        self._perms = [(rng.randrange(1, self._PRIME), rng.randrange(0, self._PRIME)) for _ in range(num_perm)]
+        self._signature = lru_cache(maxsize=256)(self._compute_signature)
+
+    def _shingles(self, key: Tuple[Tuple[str, ...], ...]) -> set:
+        shingles = set()
+        for category, items in zip(("confident", "speculative", "unknown"), key):
+            for item in items:
+                words = re.findall(r'\w+', item.lower())
+                if len(words) < self.shingle_size:
+                    shingles.add(f"{category}|{' '.join(words)}")
+                    continue
+                for i in range(len(words) - self.shingle_size + 1):
+                    shingles.add(f"{category}|{' '.join(words[i:i + self.shingle_size])}")
+        return shingles
+
+    def _compute_signature(self, key: Tuple[Tuple[str, ...], ...]) -> Optional[Tuple[int, ...]]:
+        shingles = self._shingles(key)
+        if not shingles:
+            return None
+        hashes = [int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=8).digest(), 'little')
+                  for s in shingles]
+        return tuple(min((a * h + b) % self._PRIME for h in hashes) for a, b in self._perms)
+
+    def similarity(self, current: Dict[str, List[str]], previous: Dict[str, List[str]]) -> float:
+        sig1 = self._signature(_triplets_key(current))
+        sig2 = self._signature(_triplets_key(previous))
+        if sig1 is None or sig2 is None:
+            return 0.0
+        return sum(1 for x, y in zip(sig1, sig2) if x == y) / self.num_perm
+
+
+def _triplets_key(triplets: Dict[str, List[str]]) -> Tuple[Tuple[str, ...], ...]:
+    """Hashable snapshot of triplets"""
+    return tuple(tuple(triplets.get(category, [])) for category in ("confident", "speculative", "unknown"))
+
+
+# Predictor used by layers that are not given one
+default_stability_predictor = JaccardStabilityPredictor()
+
+
+# ===================== Progress Events =====================
+# Receiver of progress events for the current run (None = nobody is listening)
+_event_sink: ContextVar[Optional[Callable[[Dict[str, Any]], None]]] = ContextVar("ramtn_event_sink", default=None)
+# Labels (mode / unit / layer) of the step currently executing, merged into every event
+_event_scope: ContextVar[Dict[str, Any]] = ContextVar("ramtn_event_scope", default={})
+
+
+@contextmanager
+def event_scope(**labels):
+    """Attach labels to all events emitted inside the block"""
+    token = _event_scope.set({**_event_scope.get(), **labels})
+    try:
+        yield
+    finally:
+        _event_scope.reset(token)
+
+
+@contextmanager
+def event_listener(sink: Callable[[Dict[str, Any]], None]):
+    """Deliver events emitted inside the block to sink"""
+    token = _event_sink.set(sink)
+    try:
+        yield
+    finally:
+        _event_sink.reset(token)
+
+
+def events_enabled() -> bool:
+    return _event_sink.get() is not None
+
+
+def emit_event(event_type: str, **data):
+    """Emit a progress event (no-op without a listener)"""
+    sink = _event_sink.get()
+    if sink is None:
+        return
+    sink({"type": event_type, **_event_scope.get(), **data, "time": time.time()})
+
+
+def iter_events(fn: Callable, *args, **kwargs) -> Iterator[Dict[str, Any]]:
+    """
+    Run fn in a worker thread and yield its progress events as they happen
+    The last event has type "result" and carries fn's return value; exceptions are re-raised
+    """
+    events = queue.Queue()
+    done = object()
+    outcome = {}
+
+    def worker():
+        with event_listener(events.put):
+            try:
+                outcome["result"] = fn(*args, **kwargs)
+            except BaseException as e:
+                outcome["error"] = e
+        events.put(done)
+
+    # Run in a copy of the caller's context so context-scoped settings (e.g. log capture) carry over
+    context = contextvars.copy_context()
+    thread = threading.Thread(target=context.run, args=(worker,), daemon=True)
+    thread.start()
+
+    while True:
+        event = events.get()
+        if event is done:
+            break
+        yield event
+
+    thread.join()
+    if "error" in outcome:
+        raise outcome["error"]
+    yield {"type": "result", "result": outcome["result"]}
+
+
+# ===================== Call Instrumentation =====================
+# Price per 1K tokens (CNY) used for cost estimates; override per deployment
+MODEL_PRICES_PER_1K = {
+    "qwen-plus": {"input": 0.0008, "cached_input": 0.00032, "output": 0.002}
+}
+
+_SPAN_TOTAL_FIELDS = ("calls", "prompt_tokens", "cached_tokens", "completion_tokens", "latency", "cost",
+                      "retries", "cache_hits", "errors", "streamed_calls", "first_token_latency")
+
+
+def _empty_totals() -> Dict[str, Any]:
+    return {field: 0 for field in _SPAN_TOTAL_FIELDS}
+
+
+def _add_span(totals: Dict[str, Any], span: Dict[str, Any]):
+    totals["calls"] += 1
+    totals["prompt_tokens"] += span["prompt_tokens"]
+    totals["cached_tokens"] += span["cached_tokens"]
+    totals["completion_tokens"] += span["completion_tokens"]
+    totals["latency"] += span["latency"]
+    totals["cost"] += span["cost"]
+    totals["retries"] += span["retries"]
+    totals["cache_hits"] += 1 if span["cache_hit"] else 0
+    totals["errors"] += 1 if span.get("error") else 0
+    if span.get("first_token_latency") is not None:
+        totals["streamed_calls"] += 1
+        totals["first_token_latency"] += span["first_token_latency"]
+
+
+class SpanCollector:
+    """
+    Collects one span per LLM call (role, mode/unit/layer, tokens, latency, cost, retries, cache hit)
+    - Aggregates per role incrementally; keeps raw spans only when keep_spans is set
+    - Exports Prometheus text format for scraping
+    """
+
+    def __init__(self, keep_spans: bool = True):
+        self.keep_spans = keep_spans
+        self.spans: List[Dict[str, Any]] = []
+        self._by_role: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, span: Dict[str, Any]):
+        with self._lock:
+            if self.keep_spans:
+                self.spans.append(span)
+            _add_span(self._by_role.setdefault(span["role"], _empty_totals()), span)
+
+    def by_role(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {role: dict(totals) for role, totals in self._by_role.items()}
+
+    def totals(self) -> Dict[str, Any]:
+        totals = _empty_totals()
+        for role_totals in self.by_role().values():
+            for field in _SPAN_TOTAL_FIELDS:
+                totals[field] += role_totals[field]
+        return totals
+
+    def group_by(self, *labels: str) -> Dict[Tuple, Dict[str, Any]]:
+        """Aggregate kept spans by span labels, e.g. group_by("mode", "unit")"""
+        groups: Dict[Tuple, Dict[str, Any]] = {}
+        with self._lock:
+            for span in self.spans:
+                _add_span(groups.setdefault(tuple(span.get(label) for label in labels), _empty_totals()), span)
+        return groups
+
+    def summary(self) -> Dict[str, Any]:
+        """Roll-up for reports: totals, per role and (if spans are kept) per unit"""
+        summary = {"totals": self.totals(), "by_role": self.by_role()}
+        if self.keep_spans:
+            summary["by_unit"] = {f"{mode}-{unit}": totals
+                                  for (mode, unit), totals in self.group_by("mode", "unit").items()}
+        return summary
+
+    def to_prometheus(self, prefix: str = "ramtn_llm") -> str:
+        """Render per-role aggregates in Prometheus text exposition format"""
+        metrics = [
+            ("calls_total", "counter", "LLM calls", "calls"),
+            ("prompt_tokens_total", "counter", "Prompt tokens sent", "prompt_tokens"),
+            ("cached_tokens_total", "counter", "Prompt tokens served from the provider's prefix cache",
+             "cached_tokens"),
+            ("completion_tokens_total", "counter", "Completion tokens received", "completion_tokens"),
+            ("cost_total", "counter", "Estimated cost (CNY)", "cost"),
+            ("retries_total", "counter", "Retried requests", "retries"),
+            ("cache_hits_total", "counter", "Calls served from the response cache", "cache_hits"),
+            ("errors_total", "counter", "Failed calls", "errors"),
+        ]
+        by_role = self.by_role()
+        lines = []
+        for name, kind, help_text, field in metrics:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for role, totals in sorted(by_role.items()):
+                lines.append(f'{prefix}_{name}{{role="{role}"}} {totals[field]}')
+        lines.append(f"# HELP {prefix}_latency_seconds LLM call latency")
+        lines.append(f"# TYPE {prefix}_latency_seconds summary")
+        for role, totals in sorted(by_role.items()):
+            lines.append(f'{prefix}_latency_seconds_sum{{role="{role}"}} {totals["latency"]:.6f}')
+            lines.append(f'{prefix}_latency_seconds_count{{role="{role}"}} {totals["calls"]}')
+        lines.append(f"# HELP {prefix}_first_token_seconds Time to first streamed token")
+        lines.append(f"# TYPE {prefix}_first_token_seconds summary")
+        for role, totals in sorted(by_role.items()):
+            if totals["streamed_calls"]:
+                lines.append(f'{prefix}_first_token_seconds_sum{{role="{role}"}} {totals["first_token_latency"]:.6f}')
+                lines.append(f'{prefix}_first_token_seconds_count{{role="{role}"}} {totals["streamed_calls"]}')
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide aggregates (no raw spans kept), e.g. for a metrics endpoint
+call_metrics = SpanCollector(keep_spans=False)
+
+# Collectors of the current run (engine run, unit, ...) that also receive spans
+_span_collectors: ContextVar[Tuple[SpanCollector, ...]] = ContextVar("ramtn_span_collectors", default=())
+
+
+@contextmanager
+def collect_spans(collector: Optional[SpanCollector] = None):
+    """Record spans of all LLM calls made inside the block into collector"""
+    collector = collector if collector is not None else SpanCollector()
+    token = _span_collectors.set(_span_collectors.get() + (collector,))
+    try:
+        yield collector
+    finally:
+        _span_collectors.reset(token)
+
+
+def _start_span(role: str, temperature: float, model: str) -> Dict[str, Any]:
+    scope = _event_scope.get()
+    return {
+        "role": role,
+        "mode": scope.get("mode"),
+        "unit": scope.get("unit"),
+        "layer": scope.get("layer"),
+        "model": model,
+        "temperature": temperature,
+        "prompt_tokens": 0,
+        "cached_tokens": 0,
+        "completion_tokens": 0,
+        "first_token_latency": None,
+        "retries": 0,
+        "cache_hit": False,
+        "streamed": False,
+        "start_time": time.time(),
+        "_start": time.perf_counter()
+    }
+
+
+def _end_span(span: Dict[str, Any], error: Optional[BaseException] = None):
+    span["latency"] = time.perf_counter() - span.pop("_start")
+    prices = MODEL_PRICES_PER_1K.get(span["model"], {"input": 0.0, "output": 0.0})
+    uncached_tokens = span["prompt_tokens"] - span["cached_tokens"]
+    span["cost"] = (uncached_tokens * prices["input"]
+                    + span["cached_tokens"] * prices.get("cached_input", prices["input"])
+                    + span["completion_tokens"] * prices["output"]) / 1000
+    if error is not None:
+        span["error"] = str(error)
+    call_metrics.record(span)
+    for collector in _span_collectors.get():
+        collector.record(span)
+
+
+# ===================== Tolerant JSON Parsing =====================
+class IncrementalJSONParser:
+    """
+    Incremental, tolerant parser for a JSON object embedded in LLM output
+    - feed() chunks as they arrive; scanning state carries over, so each character is visited once
+    - Leading prose or ``` fences before the first "{" are skipped
+    - result() parses the complete object, or repairs a truncated one by cutting back to the last
+      complete value and closing the open brackets
+    """
+
+    def __init__(self):
+        self._parts: List[str] = []
+        self._length = 0
+        self._started = False
+        self._start = 0
+        self._frames: List[List[Any]] = []  # [bracket, expecting_key]
+        self._in_string = False
+        self._string_is_key = False
+        self._escape = False
+        self._safe_end: Optional[int] = None
+        self._safe_closers = ""
+        self.complete_end: Optional[int] = None
+
+    def feed(self, chunk: str):
+        offset = self._length
+        self._parts.append(chunk)
+        self._length += len(chunk)
+        if self.complete_end is not None:
+            return
+
+        for i, ch in enumerate(chunk, offset):
+            if not self._started:
+                if ch != "{":
+                    continue
+                self._started = True
+                self._start = i
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if not self._string_is_key:
+                        self._mark_safe(i + 1)
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string_is_key = bool(self._frames) and self._frames[-1][0] == "{" and self._frames[-1][1]
+            elif ch in "{[":
+                self._frames.append([ch, ch == "{"])
+                self._mark_safe(i + 1)
+            elif ch in "}]":
+                if self._frames:
+                    self._frames.pop()
+                if not self._frames:
+                    self.complete_end = i + 1
+                    return
+                self._mark_safe(i + 1)
+            elif ch == ":":
+                if self._frames:
+                    self._frames[-1][1] = False
+            elif ch == ",":
+                # A comma means the value before it is complete
+                self._mark_safe(i)
+                if self._frames and self._frames[-1][0] == "{":
+                    self._frames[-1][1] = True
+
+    def _mark_safe(self, end: int):
+        self._safe_end = end
+        self._safe_closers = "".join("}" if bracket == "{" else "]" for bracket, _ in reversed(self._frames))
+
+    def result(self) -> Tuple[Optional[Any], str]:
+        """Return (parsed value, status) where status is "parsed", "repaired" or "failed" """
+        if not self._started:
+            return None, "failed"
+        text = "".join(self._parts)
+
+        if self.complete_end is not None:
+            candidate = text[self._start:self.complete_end]
+            try:
+                return json.loads(candidate), "parsed"
+            except json.JSONDecodeError:
+                # Common LLM slip: trailing commas before closing brackets
+                try:
+                    return json.loads(_TRAILING_COMMA_PATTERN.sub(r"\1", candidate)), "repaired"
+                except json.JSONDecodeError:
+                    return None, "failed"
+
+        if not self._in_string and self._frames:
+            # Only the closing brackets are missing: keep the trailing value if it is complete
+            closers = "".join("}" if bracket == "{" else "]" for bracket, _ in reversed(self._frames))
+            try:
+                return json.loads(text[self._start:].rstrip().rstrip(",") + closers), "repaired"
+            except json.JSONDecodeError:
+                pass
+
+        if self._safe_end is None:
+            return None, "failed"
+        candidate = text[self._start:self._safe_end].rstrip().rstrip(",") + self._safe_closers
+        try:
+            return json.loads(_TRAILING_COMMA_PATTERN.sub(r"\1", candidate)), "repaired"
+        except json.JSONDecodeError:
+            return None, "failed"
+
+
+_TRAILING_COMMA_PATTERN = re.compile(r",\s*([}\]])")
+
+
+def parse_json_tolerant(text: str) -> Tuple[Optional[Any], str]:
+    """Parse the first JSON object in text, repairing truncation; returns (value, status)"""
+    parser = IncrementalJSONParser()
+    parser.feed(text or "")
+    return parser.result()
+
+
+class ParseStats:
+    """Thread-safe counts and timing of structured-output parses by status"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {"parsed": 0, "repaired": 0, "failed": 0}
+        self.seconds = 0.0
+
+    def record(self, status: str, seconds: float):
+        with self._lock:
+            self.counts[status] = self.counts.get(status, 0) + 1
+            self.seconds += seconds
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = sum(self.counts.values())
+            return {
+                **self.counts,
+                "total": total,
+                "failure_rate": self.counts["failed"] / total if total else 0.0,
+                "mean_parse_ms": self.seconds / total * 1000 if total else 0.0
+            }
+
+
+def _as_score(value: Any, default: float) -> float:
+    """Coerce a model-provided score to float, using default when missing or malformed"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+# Observer evaluation parse outcomes (failures fall back to heuristic evaluation)
+observer_parse_stats = ParseStats()
+
+
+# ===================== Run Checkpoints =====================
+DEFAULT_CHECKPOINT_PATH = os.getenv("RAMTN_CHECKPOINT_DB",
+                                    os.path.join(os.path.expanduser("~"), ".ramtn", "checkpoints.sqlite"))
+
+
+class CheckpointStore:
+    """
+    SQLite store that lets an interrupted extraction/implantation run resume where it stopped
+    - runs: mode, question and status of each run id
+    - layers: every completed layer (result plus the layer state needed to continue)
+    - calls: every model response of the run, so a layer interrupted mid-way replays its finished calls;
+      keyed by call and by the unit/layer that made it, so identical prompts from two units stay separate
+    """
+
+    def __init__(self, path: str = DEFAULT_CHECKPOINT_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS runs ("
+                "run_id TEXT PRIMARY KEY, mode TEXT NOT NULL, question TEXT NOT NULL, framework_id TEXT, "
+                "status TEXT NOT NULL, created REAL NOT NULL, updated REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS layers ("
+                "run_id TEXT NOT NULL, unit INTEGER NOT NULL, layer INTEGER NOT NULL, payload TEXT NOT NULL, "
+                "created REAL NOT NULL, PRIMARY KEY (run_id, unit, layer))"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS calls ("
+                "run_id TEXT NOT NULL, key TEXT NOT NULL, content TEXT NOT NULL, PRIMARY KEY (run_id, key))"
+            )
+
+    @staticmethod
+    def new_run_id() -> str:
+        return uuid.uuid4().hex[:16]
+
+    def open_run(self, run_id: str, mode: str, question: str, framework_id: Optional[str] = None) -> "RunCheckpoint":
+        """Register a run (or reopen an existing one for resumption)"""
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT mode FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+            if row is None:
+                self._conn.execute(
+                    "INSERT INTO runs (run_id, mode, question, framework_id, status, created, updated) "
+                    "VALUES (?, ?, ?, ?, 'running', ?, ?)", (run_id, mode, question, framework_id, now, now)
+                )
+            elif row[0] != mode:
+                raise ValueError(f"Run {run_id} is a {row[0]} run, not {mode}")
+            else:
+                self._conn.execute("UPDATE runs SET status = 'running', updated = ? WHERE run_id = ?", (now, run_id))
+        return RunCheckpoint(self, run_id)
+
+    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT run_id, mode, question, framework_id, status, created, updated FROM runs WHERE run_id = ?",
+                (run_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(["run_id", "mode", "question", "framework_id", "status", "created", "updated"], row))
+
+    def list_runs(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Runs, newest first; status="running" lists runs that were interrupted (or are in progress)"""
+        query = "SELECT run_id FROM runs" + (" WHERE status = ?" if status else "") + " ORDER BY updated DESC"
+        with self._lock:
+            run_ids = [row[0] for row in self._conn.execute(query, (status,) if status else ())]
+        return [self.get_run(run_id) for run_id in run_ids]
+
+    def set_status(self, run_id: str, status: str):
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE runs SET status = ?, updated = ? WHERE run_id = ?", (status, time.time(), run_id))
+
+    def save_layer(self, run_id: str, unit: int, layer: int, payload: Dict[str, Any]):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO layers (run_id, unit, layer, payload, created) VALUES (?, ?, ?, ?, ?)",
+                (run_id, unit, layer, json.dumps(payload, ensure_ascii=False, default=str), now)
+            )
+            self._conn.execute("UPDATE runs SET updated = ? WHERE run_id = ?", (now, run_id))
+
+    def load_layers(self, run_id: str, unit: int) -> List[Dict[str, Any]]:
+        """Completed layers of a unit in order"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT payload FROM layers WHERE run_id = ? AND unit = ? ORDER BY layer", (run_id, unit)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def save_call(self, run_id: str, key: str, content: str):
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO calls (run_id, key, content) VALUES (?, ?, ?)",
+                               (run_id, key, content))
+
+    def load_call(self, run_id: str, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT content FROM calls WHERE run_id = ? AND key = ?", (run_id, key)).fetchone()
+        return row[0] if row else None
+
+    def delete_run(self, run_id: str):
+        with self._lock, self._conn:
+            for table in ("calls", "layers", "runs"):
+                self._conn.execute(f"DELETE FROM {table} WHERE run_id = ?", (run_id,))
+
+
+class RunCheckpoint:
+    """Handle binding a CheckpointStore to one run id"""
+
+    def __init__(self, store: CheckpointStore, run_id: str):
+        self.store = store
+        self.run_id = run_id
+
+    def save_layer(self, unit: int, layer: int, payload: Dict[str, Any]):
+        self.store.save_layer(self.run_id, unit, layer, payload)
+
+    def load_layers(self, unit: int) -> List[Dict[str, Any]]:
+        return self.store.load_layers(self.run_id, unit)
+
+    def save_call(self, key: str, content: str):
+        self.store.save_call(self.run_id, key, content)
+
+    def load_call(self, key: str) -> Optional[str]:
+        return self.store.load_call(self.run_id, key)
+
+    def complete(self):
+        self.store.set_status(self.run_id, "completed")
+
+
+# Run whose call journal call_qwen / acall_qwen read and append to
+_call_journal: ContextVar[Optional[RunCheckpoint]] = ContextVar("ramtn_call_journal", default=None)
+
+
+def _journal_key(key: str) -> str:
+    """Journal key of a call: its cache key plus the unit and layer making it (from the event scope)"""
+    scope = _event_scope.get()
+    return f"{key}:{scope.get('unit', '')}:{scope.get('layer', '')}"
+
+
+@contextmanager
+def call_journal(run: Optional[RunCheckpoint]):
+    """Record (and on resume, replay) model responses of calls made inside this block"""
+    token = _call_journal.set(run)
+    try:
+        yield run
+    finally:
+        _call_journal.reset(token)
+
+
+# ===================== Token Budget =====================
+class TokenCounter:
+    """
+    Counts prompt tokens locally
+    - Uses DashScope's bundled Qwen tokenizer when its optional dependency (tiktoken) is installed
+    - Otherwise estimates: one token per CJK character, about 1.3 per word, one per other symbol
+    """
+
+    _ESTIMATE_PATTERN = re.compile(r'[一-鿿]|[A-Za-z]+|\d+|[^\sA-Za-z\d]')
+
+    def __init__(self, model: str = "qwen-plus"):
+        self.model = model
+        self._tokenizer = None
+        self._loaded = False
+
+    def _get_tokenizer(self):
+        if not self._loaded:
+            try:
+                self._tokenizer = dashscope.get_tokenizer(self.model)
+            except Exception:
+                self._tokenizer = None
+            self._loaded = True
+        return self._tokenizer
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        tokenizer = self._get_tokenizer()
+        if tokenizer is not None:
+            return len(tokenizer.encode(text))
+        words = 0
+        tokens = 0
+        for match in self._ESTIMATE_PATTERN.finditer(text):
+            if match.group()[0].isalpha() and match.group()[0].isascii():
+                words += 1
+            else:
+                tokens += 1
+        return tokens + (words * 4 + 2) // 3
+
+
+class TokenBudgeter:
+    """
+    Keeps carried-forward context (previous response and critique) inside a per-role input ceiling
+    - previous_response is reduced to its confidence triplets (at most max_items per category),
+      previous_critique to its max_critique_points most severe points, ordered 🔴 > 🟡 > 🟢
+    - While over the ceiling, drops 🟢 then 🟡 points, then unknown, speculative, remaining 🔴 points and
+      confident items (one 🔴 point and one confident item are always kept)
+    - Counts tokens before and after for savings reports
+    """
+
+    DEFAULT_CEILINGS = {
+        "strategic_constructor_extraction": 3000,
+        "strategic_constructor_implantation": 3000,
+        "strategic_critic_extraction": 4000,
+        "strategic_critic_implantation": 4000,
+        "strategic_observer_extraction": 6000,
+        "strategic_observer_implantation": 6000
+    }
+    CRITIQUE_MARKERS = ("🔴", "🟡", "🟢")
+
+    def __init__(self, ceilings: Optional[Dict[str, int]] = None, default_ceiling: int = 6000,
+                 counter: Optional[TokenCounter] = None, max_items: int = 8, max_critique_points: int = 3):
+        self.ceilings = {**self.DEFAULT_CEILINGS, **(ceilings or {})}
+        self.default_ceiling = default_ceiling
+        # Prompts ask for 3-8 points per category and one critique point per severity
+        self.max_items = max_items
+        self.max_critique_points = max_critique_points
+        self.counter = counter or TokenCounter()
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "tokens_before": 0, "tokens_after": 0}
+
+    def ceiling(self, role: str) -> int:
+        return self.ceilings.get(role, self.default_ceiling)
+
+    def count(self, text: str) -> int:
+        return self.counter.count(text)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            saved = self._stats["tokens_before"] - self._stats["tokens_after"]
+            return {
+                **self._stats,
+                "tokens_saved": saved,
+                "saved_ratio": saved / self._stats["tokens_before"] if self._stats["tokens_before"] else 0.0
+            }
+
+    @classmethod
+    def critique_points(cls, critique: str) -> List[Tuple[int, str]]:
+        """Split a critique into (priority, point) pairs, most severe first; unmarked text ranks as 🟡"""
+        points: List[List[Any]] = []
+        for line in critique.splitlines():
+            stripped = line.strip()
+            if not stripped:
+                continue
+            priority = next((i for i, marker in enumerate(cls.CRITIQUE_MARKERS) if stripped.startswith(marker)), None)
+            if priority is not None or not points:
+                points.append([1 if priority is None else priority, stripped])
+            else:
+                points[-1][1] += "\n" + stripped
+        return sorted(((priority, text) for priority, text in points), key=lambda point: point[0])
+
+    def carry_forward(self, role: str, previous_response: str, previous_critique: str,
+                      previous_triplets: Optional[Dict[str, List[str]]] = None, fixed_tokens: int = 0,
+                      always: bool = True) -> Tuple[str, str, Dict[str, int]]:
+        """
+        Compress response and critique to fit ceiling(role) - fixed_tokens
+        With always=False, text that already fits is passed through unchanged
+        Returns (response, critique, {"before": tokens, "after": tokens})
+        """
+        before = self.count(previous_response) + self.count(previous_critique)
+        budget = self.ceiling(role) - fixed_tokens
+        if not always and before <= budget:
+            return previous_response, previous_critique, {"before": before, "after": before}
+
+        triplets = previous_triplets
+        if triplets is None:
+            triplets = ConfidenceTripletExtractor.extract_triplets(previous_response)
+
+        points = self.critique_points(previous_critique)[:self.max_critique_points]
+        items = {category: list(triplets.get(category, []))[:self.max_items]
+                 for category in ("confident", "speculative", "unknown")}
+        has_triplets = any(items.values())
+        if not has_triplets:
+            # Nothing parseable to compress into: keep the raw response, truncated to half the budget if needed
+            response = self._truncate(previous_response, max(budget // 2, 0))
+
+        def render() -> Tuple[str, str]:
+            rendered = ConfidenceTripletExtractor.format_triplets(items) if has_triplets else response
+            return rendered, "\n".join(text for _, text in points)
+
+        def fits() -> bool:
+            rendered_response, rendered_critique = render()
+            return self.count(rendered_response) + self.count(rendered_critique) <= budget
+
+        # (source, critique priority, items always kept), in drop order
+        drop_order = [("critique", 2, 0), ("critique", 1, 0), ("unknown", None, 0), ("speculative", None, 0),
+                      ("critique", 0, 1), ("confident", None, 1)]
+        for source, priority, keep in drop_order:
+            if source == "critique":
+                while not fits():
+                    candidates = [i for i, point in enumerate(points) if point[0] == priority]
+                    if len(candidates) <= keep:
+                        break
+                    points.pop(candidates[-1])
+            else:
+                while not fits() and len(items[source]) > keep:
+                    items[source].pop()
+
+        response, critique = render()
+
+        after = self.count(response) + self.count(critique)
+        with self._lock:
+            self._stats["calls"] += 1
+            self._stats["tokens_before"] += before
+            self._stats["tokens_after"] += after
+        return response, critique, {"before": before, "after": after}
+
+    def _truncate(self, text: str, max_tokens: int) -> str:
+        tokens = self.count(text)
+        if tokens <= max_tokens:
+            return text
+        return text[:max(0, len(text) * max_tokens // tokens)]
+
+
+# Budgeter used by layers that are not given one
+default_token_budgeter = TokenBudgeter()
+
+
 # ===================== Thinking Layer Core Components (Dual Mode Support) =====================
 class StrategicThinkingLayer:
     """
@@ -540,12 +1750,30 @@ class StrategicThinkingLayer:
     """
 
     def __init__(self, layer_num: int, question: str, previous_response: str = "",
-                 previous_critique: str = "", mode: str = "extraction"):
+                 previous_critique: str = "", mode: str = "extraction",
+                 framework: Optional[StrategicDecisionFramework] = None,
+                 constructor_temperature: float = 0.1, pipelined: bool = False,
+                 previous_triplets: Optional[Dict[str, List[str]]] = None,
+                 stability_predictor: Optional[StabilityPredictor] = None,
+                 token_budgeter: Optional[TokenBudgeter] = None,
+                 previous_observation: Optional[Dict[str, Any]] = None):
         self.layer_num = layer_num
         self.question = question
         self.previous_response = previous_response
         self.previous_critique = previous_critique
         self.mode = mode  # "extraction" or "implantation"
+        self.framework = framework if framework is not None else strategic_framework
+        self.constructor_temperature = constructor_temperature
+        self.pipelined = pipelined  # Async only: overlap pre-work with calls, early critic on the first layer
+        # Triplets of previous_response, carried forward from the previous layer (parsed lazily if absent)
+        self.previous_triplets = previous_triplets
+        self.stability_predictor = stability_predictor or default_stability_predictor
+        self.token_budgeter = token_budgeter or default_token_budgeter
+        # Observer outcome of the previous layer (final_triplets, confidence_score, critique_validity);
+        # an early-terminated layer reports it unchanged, since its content did not move
+        self.previous_observation = previous_observation or {}
+        # Carried-context tokens before/after budgeting, summed over this layer's calls
+        self.context_tokens = {"before": 0, "after": 0}
         self.response = ""
         self.critique = ""
         self.confidence_triplets = {"confident": [], "speculative": [], "unknown": []}
@@ -557,18 +1785,102 @@ class StrategicThinkingLayer:
 
     def execute(self) -> Dict[str, Any]:
         """Execute single-layer thinking process"""
-        mode_text = "Strategic Extraction" if self.mode == "extraction" else "Strategic Analysis"
-        print(f"\n--- Layer {self.layer_num} {mode_text} Thinking ---")
+        with event_scope(layer=self.layer_num):
+            self._begin()
+
+            # Constructor generates analysis
+            self.response = self._constructor_generate()
+            early_result = self._after_constructor(ConfidenceTripletExtractor.extract_triplets(self.response))
+            if early_result:
+                return early_result
+
+            # Critic provides critique
+            self.critique = self._critic_critique()
+            self._critique_ready()
+
+            # Observer evaluates and generates final triplets
+            return self._finish(self._observer_evaluate())
+
+    async def aexecute(self) -> Dict[str, Any]:
+        """Execute single-layer thinking process asynchronously (same flow as execute)"""
+        if self.pipelined:
+            return await self._aexecute_pipelined()
+
+        with event_scope(layer=self.layer_num):
+            self._begin()
+
+            self.response = await self._aconstructor_generate()
+            early_result = self._after_constructor(ConfidenceTripletExtractor.extract_triplets(self.response))
+            if early_result:
+                return early_result
+
+            self.critique = await self._acritic_critique()
+            self._critique_ready()
+
+            return self._finish(await self._aobserver_evaluate())
+
+    async def _aexecute_pipelined(self) -> Dict[str, Any]:
+        """
+        Pipelined layer execution
+        - Framework pre-analysis and previous-round triplet parsing run while the constructor call is in flight
+        - The critic prompt is fitted against the parsed triplets, so parsing always comes first
+        - When no stability early stop is possible (first layer), the critic call goes out before the stability
+          bookkeeping; otherwise it is only sent once the layer is known to continue, so it is never wasted
+        """
+        with event_scope(layer=self.layer_num):
+            self._announce_layer()
+
+            constructor_task = asyncio.ensure_future(self._aconstructor_generate())
+            try:
+                # Let the request go out before doing local work
+                await asyncio.sleep(0)
+                self._pre_analysis_with_frameworks()
+                self._get_previous_triplets()
+                self.response = await constructor_task
+            except BaseException:
+                constructor_task.cancel()
+                raise
+
+            triplets = ConfidenceTripletExtractor.extract_triplets(self.response)
+            self.confidence_triplets = triplets
+            critic_task = None
+            if not (self.layer_num > 1 and self.previous_response):
+                critic_task = asyncio.ensure_future(self._acritic_critique())
+                await asyncio.sleep(0)
+            try:
+                early_result = self._after_constructor(triplets)
+                if early_result:
+                    return early_result
+
+                self.critique = await (critic_task or self._acritic_critique())
+            except BaseException:
+                if critic_task is not None:
+                    critic_task.cancel()
+                raise
+            self._critique_ready()
+
+            return self._finish(await self._aobserver_evaluate())
+
+    def _begin(self):
+        """Announce the layer and run strategic framework pre-analysis"""
+        self._announce_layer()
 
         # Strategic framework pre-analysis
         self._pre_analysis_with_frameworks()
 
-        # Constructor generates analysis
-        self.response = self._constructor_generate()
+    def _announce_layer(self):
+        mode_text = "Strategic Extraction" if self.mode == "extraction" else "Strategic Analysis"
+        print(f"\n--- Layer {self.layer_num} {mode_text} Thinking ---")
+        emit_event("layer_started")
+
+    def _after_constructor(self, triplets: Dict[str, List[str]]) -> Optional[Dict[str, Any]]:
+        """Take the parsed constructor output; return early termination result if content stabilized"""
+        mode_text = "Strategic Extraction" if self.mode == "extraction" else "Strategic Analysis"
         print(f"Constructor {mode_text} generation completed (length: {len(self.response)} characters)")
+        emit_event("constructor_completed", length=len(self.response))
 
-        # Extract confidence triplets
-        self.confidence_triplets = ConfidenceTripletExtractor.extract_triplets(self.response)
+        # Confidence triplets
+        self.confidence_triplets = triplets
         print(f"Initial triplets - Confident: {len(self.confidence_triplets['confident'])}, "
               f"Speculative: {len(self.confidence_triplets['speculative'])}, "
               f"Unknown: {len(self.confidence_triplets['unknown'])}")
@@ -577,14 +1889,17 @@ class StrategicThinkingLayer:
         if self.layer_num > 1 and self._check_content_stability():
             print("🔍 Content stabilized, suggesting early termination")
             self.should_terminate_early = True
+            emit_event("layer_early_terminated")
             return self._create_early_termination_result()
 
-        # Critic provides critique
-        self.critique = self._critic_critique()
+        return None
+
+    def _critique_ready(self):
         print(f"Critic critique completed")
+        emit_event("critique_ready", critique=self.critique)
 
-        # Observer evaluates and generates final triplets
-        observer_result = self._observer_evaluate()
+    def _finish(self, observer_result: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply observer evaluation and build the layer result"""
         self.final_triplets = observer_result["final_triplets"]
         self.confidence_score = observer_result["confidence_score"]
         self.critique_validity = observer_result["critique_validity"]
@@ -594,6 +1909,8 @@ class StrategicThinkingLayer:
         print(f"Final triplets - Confident: {len(self.final_triplets['confident'])}, "
               f"Speculative: {len(self.final_triplets['speculative'])}, "
               f"Unknown: {len(self.final_triplets['unknown'])}")
+        emit_event("observer_score", confidence_score=self.confidence_score,
+                   critique_validity=self.critique_validity)
 
         return {
             "layer": self.layer_num,
@@ -605,17 +1922,30 @@ class StrategicThinkingLayer:
             "confidence_score": self.confidence_score,
             "critique_validity": self.critique_validity,
             "should_terminate_early": self.should_terminate_early,
-            "framework_analysis": self.framework_analysis
+            "framework_analysis": self.framework_analysis,
+            "context_tokens": self.context_tokens
         }
 
+    CHECKPOINT_FIELDS = ("response", "critique", "confidence_triplets", "final_triplets", "confidence_score",
+                         "critique_validity", "should_terminate_early", "framework_analysis")
+
+    def checkpoint_state(self) -> Dict[str, Any]:
+        """State needed to continue the unit from this layer without re-running it"""
+        return {field: getattr(self, field) for field in self.CHECKPOINT_FIELDS}
+
+    def restore_state(self, state: Dict[str, Any]):
+        for field in self.CHECKPOINT_FIELDS:
+            if field in state:
+                setattr(self, field, state[field])
+
     def _pre_analysis_with_frameworks(self):
         """Pre-process analysis using strategic frameworks"""
         user_traits = self._extract_user_traits()
 
         # Analyze main framework compatibility - fixed method call
         self.framework_analysis = {
-            "3d_matrix": strategic_framework.analyze_framework_fit(user_traits, "three_dimensional_matrix"),
-            "dynamic_stability": strategic_framework.analyze_framework_fit(user_traits, "dynamic_stability")
+            "3d_matrix": self.framework.analyze_framework_fit(user_traits, "three_dimensional_matrix"),
+            "dynamic_stability": self.framework.analyze_framework_fit(user_traits, "dynamic_stability")
         }
 
         mode_text = "extraction" if self.mode == "extraction" else "analysis"
@@ -644,34 +1974,97 @@ class StrategicThinkingLayer:
 
     def _constructor_generate(self) -> str:
         """Constructor generates strategic analysis - dual mode support"""
+        prompt, role = self._constructor_request()
+        return call_qwen(prompt, role, temperature=self.constructor_temperature,
+                         on_token=self._token_callback(), system=self._constructor_system_message(role))
+
+    async def _aconstructor_generate(self) -> str:
+        """Async constructor generation"""
+        prompt, role = self._constructor_request()
+        return await acall_qwen(prompt, role, temperature=self.constructor_temperature,
+                                on_token=self._token_callback(), system=self._constructor_system_message(role))
+
+    def _constructor_system_message(self, role: str) -> str:
+        return self.framework.get_system_message(role, not self.previous_response, self.mode)
+
+    @staticmethod
+    def _token_callback() -> Optional[Callable[[str], None]]:
+        """Stream constructor tokens as events when someone is listening"""
+        if not events_enabled():
+            return None
+        return lambda token: emit_event("constructor_token", token=token)
+
+    def _constructor_request(self) -> Tuple[str, str]:
+        """Build constructor prompt and role (carried context compressed to the role's token budget)"""
         is_first_layer = not self.previous_response
+        role = "strategic_constructor_extraction" if self.mode == "extraction" else "strategic_constructor_implantation"
+
+        previous_response = self.previous_response
+        previous_critique = self.previous_critique
+        if not is_first_layer:
+            template = create_strategic_prompt(self.question, False, "", "", self.layer_num, self.mode, self.framework)
+            fixed_tokens = (self.token_budgeter.count(template)
+                            + self.token_budgeter.count(self._constructor_system_message(role)))
+            previous_response, previous_critique = self._fit_context(
+                role, previous_response, previous_critique, self._get_previous_triplets(), fixed_tokens, always=True
+            )
 
         prompt = create_strategic_prompt(
             question=self.question,
             is_first_layer=is_first_layer,
-            previous_response=self.previous_response,
-            previous_critique=self.previous_critique,
+            previous_response=previous_response,
+            previous_critique=previous_critique,
             layer_num=self.layer_num,
-            mode=self.mode
+            mode=self.mode,
+            framework=self.framework
         )
-
-        role = "strategic_constructor_extraction" if self.mode == "extraction" else "strategic_constructor_implantation"
-        return call_qwen(prompt, role, temperature=0.1)
+        return prompt, role
+
+    def _fit_context(self, role: str, response: str, critique: str, triplets: Optional[Dict[str, List[str]]],
+                     fixed_tokens: int, always: bool) -> Tuple[str, str]:
+        """Compress response/critique with the token budgeter and record the savings"""
+        response, critique, tokens = self.token_budgeter.carry_forward(role, response, critique, triplets,
+                                                                       fixed_tokens, always)
+        self.context_tokens["before"] += tokens["before"]
+        self.context_tokens["after"] += tokens["after"]
+        if tokens["after"] < tokens["before"]:
+            print(f"Context budget - {role}: {tokens['before']} -> {tokens['after']} tokens")
+        return response, critique
+
+    def _fit_prompt(self, build: Callable[[str, str], str], role: str, response: str, critique: str = "") -> str:
+        """Build a prompt from its template with the response/critique compressed to the role's input ceiling"""
+        budgeter = self.token_budgeter
+        fixed_tokens = (budgeter.count(build("", ""))
+                        + budgeter.count(SYSTEM_MESSAGES.get(role, SYSTEM_MESSAGES["default"])))
+        fitted_response, fitted_critique = self._fit_context(role, response, critique, self.confidence_triplets,
+                                                             fixed_tokens, always=False)
+        return build(fitted_response, fitted_critique)
 
     def _critic_critique(self) -> str:
         """Critic provides cognitive critique - dual mode support"""
+        prompt, role = self._critic_request()
+        return call_qwen(prompt, role, temperature=0.3)
+
+    async def _acritic_critique(self) -> str:
+        """Async critic critique"""
+        prompt, role = self._critic_request()
+        return await acall_qwen(prompt, role, temperature=0.3)
+
+    def _critic_request(self) -> Tuple[str, str]:
+        """Build critic prompt and role"""
 
         mode_text = "extraction" if self.mode == "extraction" else "analysis"
         # Fixed method call
-        framework_guidance = strategic_framework.get_framework_guidance("three_level_classification", self.question)
+        framework_guidance = self.framework.get_framework_guidance("three_level_classification", self.question)
 
         if self.mode == "extraction":
-            prompt = f"""You are a strict strategic extraction reviewer, please provide focused critique on key issues in the following strategic extraction:
+            def build(response: str, critique: str) -> str:
+                return f"""You are a strict strategic extraction reviewer, please provide focused critique on key issues in the following strategic extraction:
 
 User Input: {self.question}
 
 Constructor Strategic Extraction:
-{self.response}
+{response}
 
 【Strategic Extraction Critique Requirements】
 Based on strategic decision systems, pay special attention to:
@@ -689,12 +2082,13 @@ Please raise critiques in the following priority order:
 
 Please output focused critique content (limited to 300 characters):"""
         else:
-            prompt = f"""You are a strict analysis reviewer, please provide focused critique on key issues in the following strategic analysis:
+            def build(response: str, critique: str) -> str:
+                return f"""You are a strict analysis reviewer, please provide focused critique on key issues in the following strategic analysis:
 
 User Input: {self.question}
 
 Constructor Strategic Analysis:
-{self.response}
+{response}
 
 【Strategic Analysis Critique Requirements】
 Based on strategic decision systems, pay special attention to:
@@ -713,57 +2107,93 @@ Please raise critiques in the following priority order:
 Please output focused critique content (limited to 300 characters):"""
 
         role = "strategic_critic_extraction" if self.mode == "extraction" else "strategic_critic_implantation"
-        return call_qwen(prompt, role, temperature=0.3)
+        return self._fit_prompt(build, role, self.response), role
 
     def _check_content_stability(self) -> bool:
         """Check if content has stabilized"""
         if not self.previous_response:
             return False
 
-        # Extract current and previous round triplets
+        # Current round triplets vs. previous round's (carried forward, not re-parsed)
         current_triplets = self.confidence_triplets
-        previous_triplets = ConfidenceTripletExtractor.extract_triplets(self.previous_response)
+        previous_triplets = self._get_previous_triplets()
 
-        # Calculate similarity
-        similarity = ConfidenceTripletExtractor.calculate_similarity(current_triplets, previous_triplets)
+        # Calculate similarity; predictor decides whether content stabilized
+        stable, similarity = self.stability_predictor.is_stable(current_triplets, previous_triplets)
         print(f"Content stability check: Similarity {similarity:.2f}")
+        return stable
 
-        # If similarity above threshold, consider content stabilized
-        return similarity > 0.75
+    def _get_previous_triplets(self) -> Dict[str, List[str]]:
+        """Triplets of the previous round's response, parsed once"""
+        if self.previous_triplets is None:
+            self.previous_triplets = ConfidenceTripletExtractor.extract_triplets(self.previous_response)
+        return self.previous_triplets
 
     def _create_early_termination_result(self) -> Dict[str, Any]:
         """Create early termination result"""
         mode_text = "Strategic Extraction" if self.mode == "extraction" else "Strategic Analysis"
+        # The layer was not observed; carry the previous layer's observer outcome
+        self.final_triplets = self.previous_observation.get("final_triplets", self.final_triplets)
+        self.confidence_score = self.previous_observation.get("confidence_score", 0.0)
+        self.critique_validity = self.previous_observation.get("critique_validity", 0.0)
         return {
             "layer": self.layer_num,
             "mode": self.mode,
             "response": f"【Thinking Early Termination】{mode_text} content stabilized, no further iteration needed",
             "critique": f"【Thinking Early Termination】{mode_text} content stability reached threshold",
             "initial_triplets": self.confidence_triplets,
-            "final_triplets": self.confidence_triplets,
-            "confidence_score": 0.85,
-            "critique_validity": 0.5,
+            "final_triplets": self.final_triplets,
+            "confidence_score": self.confidence_score,
+            "critique_validity": self.critique_validity,
             "should_terminate_early": True,
-            "framework_analysis": self.framework_analysis
+            "framework_analysis": self.framework_analysis,
+            "context_tokens": self.context_tokens
         }
 
     def _observer_evaluate(self) -> Dict[str, Any]:
         """Observer evaluates and generates final confidence triplets - dual mode support"""
+        prompt, role = self._observer_request()
+        try:
+            evaluation_text = call_qwen(prompt, role, temperature=0.1, json_mode=True)
+            evaluation = self._parse_observer_evaluation(evaluation_text)
+            if evaluation:
+                return evaluation
+        except Exception as e:
+            print(f"Observer evaluation parsing failed: {e}")
+
+        return self._heuristic_evaluation()
+
+    async def _aobserver_evaluate(self) -> Dict[str, Any]:
+        """Async observer evaluation"""
+        prompt, role = self._observer_request()
+        try:
+            evaluation_text = await acall_qwen(prompt, role, temperature=0.1, json_mode=True)
+            evaluation = self._parse_observer_evaluation(evaluation_text)
+            if evaluation:
+                return evaluation
+        except Exception as e:
+            print(f"Observer evaluation parsing failed: {e}")
+
+        return self._heuristic_evaluation()
+
+    def _observer_request(self) -> Tuple[str, str]:
+        """Build observer prompt and role"""
 
         mode_text = "extraction" if self.mode == "extraction" else "analysis"
         # Fixed method call
-        framework_guidance = strategic_framework.get_framework_guidance("dynamic_stability", self.question)
+        framework_guidance = self.framework.get_framework_guidance("dynamic_stability", self.question)
 
         if self.mode == "extraction":
-            prompt = f"""You are a strategic extraction quality evaluation expert, please generate final confidence classification based on constructor extraction and critic critique.
+            def build(response: str, critique: str) -> str:
+                return f"""You are a strategic extraction quality evaluation expert, please generate final confidence classification based on constructor extraction and critic critique.
 
 User Input: {self.question}
 
 Constructor Strategic Extraction:
-{self.response}
+{response}
 
 Critic Focused Critique:
-{self.critique}
+{critique}
 
 【Strategic Extraction Evaluation Requirements】
 Based on strategic decision systems, complete the following tasks:
@@ -787,15 +2217,16 @@ Please strictly output in JSON format:
 
 Note: Confidence score should reflect strategic extraction quality and system completeness."""
         else:
-            prompt = f"""You are a strategic analysis quality evaluation expert, please generate final confidence classification based on constructor analysis and critic critique.
+            def build(response: str, critique: str) -> str:
+                return f"""You are a strategic analysis quality evaluation expert, please generate final confidence classification based on constructor analysis and critic critique.
 
 User Input: {self.question}
 
 Constructor Strategic Analysis:
-{self.response}
+{response}
 
 Critic Focused Critique:
-{self.critique}
+{critique}
 
 【Strategic Analysis Evaluation Requirements】
 Based on strategic decision systems, complete the following tasks:
@@ -820,31 +2251,40 @@ Please strictly output in JSON format:
 Note: Confidence score should reflect strategic analysis quality and practical value."""
 
         role = "strategic_observer_extraction" if self.mode == "extraction" else "strategic_observer_implantation"
-        try:
-            evaluation_text = call_qwen(prompt, role, temperature=0.1)
-            json_match = re.search(r'\{.*\}', evaluation_text, re.DOTALL)
-            if json_match:
-                evaluation = json.loads(json_match.group())
-
-                # Validate and clean triplet data
-                final_triplets = evaluation.get("final_triplets", {})
-                for category in ["confident", "speculative", "unknown"]:
-                    if category not in final_triplets:
-                        final_triplets[category] = []
-                    elif not isinstance(final_triplets[category], list):
-                        final_triplets[category] = []
-                    # Limit number of items per category
-                    final_triplets[category] = final_triplets[category][:6]
-
-                return {
-                    "final_triplets": final_triplets,
-                    "confidence_score": float(evaluation.get("confidence_score", 0.5)),
-                    "critique_validity": float(evaluation.get("critique_validity", 0.3))
-                }
-        except Exception as e:
-            print(f"Observer evaluation parsing failed: {e}")
+        return self._fit_prompt(build, role, self.response, self.critique), role
 
-        return self._heuristic_evaluation()
+    @staticmethod
+    def _parse_observer_evaluation(evaluation_text: str) -> Optional[Dict[str, Any]]:
+        """Parse observer JSON output (repairing truncation); None if no usable JSON object found"""
+        start = time.perf_counter()
+        evaluation, status = parse_json_tolerant(evaluation_text)
+        if not isinstance(evaluation, dict):
+            evaluation, status = None, "failed"
+        elif status == "repaired" and not any(
+                isinstance(items, list) and items for items in (evaluation.get("final_triplets") or {}).values()):
+            # Truncated before any triplet survived: the heuristic fallback is more informative
+            evaluation, status = None, "failed"
+        observer_parse_stats.record(status, time.perf_counter() - start)
+        if evaluation is None:
+            return None
+
+        # Validate and clean triplet data
+        final_triplets = evaluation.get("final_triplets", {})
+        if not isinstance(final_triplets, dict):
+            final_triplets = {}
+        for category in ["confident", "speculative", "unknown"]:
+            if category not in final_triplets:
+                final_triplets[category] = []
+            elif not isinstance(final_triplets[category], list):
+                final_triplets[category] = []
+            # Limit number of items per category
+            final_triplets[category] = final_triplets[category][:6]
+
+        return {
+            "final_triplets": final_triplets,
+            "confidence_score": _as_score(evaluation.get("confidence_score"), 0.5),
+            "critique_validity": _as_score(evaluation.get("critique_validity"), 0.3)
+        }
 
     def _heuristic_evaluation(self) -> Dict[str, Any]:
         """Heuristic evaluation fallback"""
@@ -890,10 +2330,22 @@ class StrategicThinkingUnit:
     """
 
     def __init__(self, unit_num: int, question: str, mode: str = "extraction",
-                 previous_final_response: str = "", previous_final_critique: str = ""):
+                 previous_final_response: str = "", previous_final_critique: str = "",
+                 framework: Optional[StrategicDecisionFramework] = None,
+                 constructor_temperature: float = 0.1, pipelined: bool = False,
+                 stability_predictor: Optional[StabilityPredictor] = None,
+                 checkpoint: Optional[RunCheckpoint] = None,
+                 token_budgeter: Optional[TokenBudgeter] = None):
         self.unit_num = unit_num
         self.question = question
         self.mode = mode  # "extraction" or "implantation"
+        self.framework = framework if framework is not None else strategic_framework
+        self.constructor_temperature = constructor_temperature
+        self.pipelined = pipelined
+        self.stability_predictor = stability_predictor
+        self.token_budgeter = token_budgeter
+        # Completed layers are saved here and restored instead of re-run when the unit resumes
+        self.checkpoint = checkpoint
         self.previous_final_response = previous_final_response
         self.previous_final_critique = previous_final_critique
         self.layers: List[StrategicThinkingLayer] = []
@@ -907,45 +2359,128 @@ class StrategicThinkingUnit:
 
     def execute(self) -> Dict[str, Any]:
         """Execute unit thinking process (3-layer saturated adversarial thinking)"""
-        mode_text = "Strategic Extraction" if self.mode == "extraction" else "Strategic Analysis"
-        print(f"\n{'=' * 60}")
-        print(f"Launching {mode_text} Thinking Unit {self.unit_num}")
-        print(f"{'=' * 60}")
+        with event_scope(mode=self.mode, unit=self.unit_num), collect_spans() as spans:
+            self._announce()
 
-        current_response = self.previous_final_response
-        current_critique = self.previous_final_critique
+            first_layer, current_response, current_critique, current_triplets = self._restore_layers()
 
-        # Execute up to 3 thinking layers, support early termination
-        for layer_num in range(1, 4):
-            layer = StrategicThinkingLayer(layer_num, self.question, current_response,
-                                           current_critique, self.mode)
-            layer_result = layer.execute()
+            # Execute up to 3 thinking layers, support early termination
+            for layer_num in range(first_layer, 4):
+                layer = self._create_layer(layer_num, current_response, current_critique, current_triplets)
+                layer_result = layer.execute()
+                self._checkpoint_layer(layer, layer_result)
+                if not self._record_layer(layer, layer_result):
+                    break
 
-            self.layers.append(layer)
-            self.layer_history.append(layer_result)
+                # Update current layer results, pass to next layer (parsed triplets carried forward)
+                current_response = layer.response
+                current_critique = layer.critique
+                current_triplets = layer.confidence_triplets
 
-            # Collect framework analysis insights
-            if layer_result.get("framework_analysis"):
-                self.framework_insights.append(layer_result["framework_analysis"])
+            return self._build_result(spans)
 
-            # Check if should terminate early
-            if layer_result.get("should_terminate_early", False) and layer_num > 1:
-                print(f"🛑 Early termination at layer {layer_num}")
-                self.early_terminated = True
-                break
+    async def aexecute(self) -> Dict[str, Any]:
+        """Execute unit thinking process asynchronously (same flow as execute)"""
+        with event_scope(mode=self.mode, unit=self.unit_num), collect_spans() as spans:
+            self._announce()
+
+            first_layer, current_response, current_critique, current_triplets = self._restore_layers()
+
+            for layer_num in range(first_layer, 4):
+                layer = self._create_layer(layer_num, current_response, current_critique, current_triplets)
+                layer_result = await layer.aexecute()
+                self._checkpoint_layer(layer, layer_result)
+                if not self._record_layer(layer, layer_result):
+                    break
+
+                current_response = layer.response
+                current_critique = layer.critique
+                current_triplets = layer.confidence_triplets
+
+            return self._build_result(spans)
+
+    def _create_layer(self, layer_num: int, current_response: str, current_critique: str,
+                      current_triplets: Optional[Dict[str, List[str]]]) -> StrategicThinkingLayer:
+        previous_observation = None
+        if self.layers:
+            previous = self.layers[-1]
+            previous_observation = {"final_triplets": previous.final_triplets,
+                                    "confidence_score": previous.confidence_score,
+                                    "critique_validity": previous.critique_validity}
+        return StrategicThinkingLayer(layer_num, self.question, current_response,
+                                      current_critique, self.mode, self.framework,
+                                      self.constructor_temperature, self.pipelined,
+                                      current_triplets, self.stability_predictor, self.token_budgeter,
+                                      previous_observation)
+
+    def _restore_layers(self) -> Tuple[int, str, str, Optional[Dict[str, List[str]]]]:
+        """
+        Replay checkpointed layers of this unit
+        Returns (next layer number, response, critique, triplets) to continue from; 4 if the unit had finished
+        """
+        current_response = self.previous_final_response
+        current_critique = self.previous_final_critique
+        current_triplets = None
+        if self.checkpoint is None:
+            return 1, current_response, current_critique, current_triplets
+
+        for payload in self.checkpoint.load_layers(self.unit_num):
+            layer = self._create_layer(payload["layer"], current_response, current_critique, current_triplets)
+            layer.restore_state(payload["state"])
+            print(f"♻️ Restored Unit {self.unit_num}-Layer {layer.layer_num} from checkpoint")
+            emit_event("layer_restored", layer=layer.layer_num)
+            if not self._record_layer(layer, payload["result"]):
+                return 4, layer.response, layer.critique, layer.confidence_triplets
 
-            # Update current layer results, pass to next layer
             current_response = layer.response
             current_critique = layer.critique
+            current_triplets = layer.confidence_triplets
 
-            # Record inter-layer progress
-            print(f"Unit {self.unit_num}-Layer {layer_num}: Confidence {layer.confidence_score:.2f} -> ", end="")
-            if layer_num < 3 and not self.early_terminated:
-                print("Proceeding to next layer")
-            else:
-                print("Unit completed")
-                break
+        return len(self.layers) + 1, current_response, current_critique, current_triplets
+
+    def _checkpoint_layer(self, layer: StrategicThinkingLayer, layer_result: Dict[str, Any]):
+        if self.checkpoint is not None:
+            self.checkpoint.save_layer(self.unit_num, layer.layer_num, {
+                "layer": layer.layer_num,
+                "result": layer_result,
+                "state": layer.checkpoint_state()
+            })
+
+    def _announce(self):
+        """Print unit banner"""
+        mode_text = "Strategic Extraction" if self.mode == "extraction" else "Strategic Analysis"
+        print(f"\n{'=' * 60}")
+        print(f"Launching {mode_text} Thinking Unit {self.unit_num}")
+        print(f"{'=' * 60}")
+        emit_event("unit_started", constructor_temperature=self.constructor_temperature)
+
+    def _record_layer(self, layer: StrategicThinkingLayer, layer_result: Dict[str, Any]) -> bool:
+        """Record a finished layer; return True if the next layer should run"""
+        layer_num = layer.layer_num
+        self.layers.append(layer)
+        self.layer_history.append(layer_result)
+
+        # Collect framework analysis insights
+        if layer_result.get("framework_analysis"):
+            self.framework_insights.append(layer_result["framework_analysis"])
+
+        # Check if should terminate early
+        if layer_result.get("should_terminate_early", False) and layer_num > 1:
+            print(f"🛑 Early termination at layer {layer_num}")
+            self.early_terminated = True
+            return False
 
+        # Record inter-layer progress
+        print(f"Unit {self.unit_num}-Layer {layer_num}: Confidence {layer.confidence_score:.2f} -> ", end="")
+        if layer_num < 3 and not self.early_terminated:
+            print("Proceeding to next layer")
+            return True
+
+        print("Unit completed")
+        return False
+
+    def _build_result(self, spans: SpanCollector) -> Dict[str, Any]:
+        """Build unit result from the last executed layer"""
         # Unit final results (use last layer's results)
         if self.layers:
             last_layer = self.layers[-1]
@@ -954,6 +2489,7 @@ class StrategicThinkingUnit:
             self.final_triplets = last_layer.final_triplets
             self.final_confidence = last_layer.confidence_score
 
+        emit_event("unit_completed", final_confidence=self.final_confidence, actual_layers=len(self.layers))
         return {
             "unit": self.unit_num,
             "mode": self.mode,
@@ -964,10 +2500,580 @@ class StrategicThinkingUnit:
             "layer_history": self.layer_history,
             "early_terminated": self.early_terminated,
             "actual_layers": len(self.layers),
-            "framework_insights": self.framework_insights
+            "framework_insights": self.framework_insights,
+            "context_tokens_saved": sum(layer_result.get("context_tokens", {}).get("before", 0)
+                                        - layer_result.get("context_tokens", {}).get("after", 0)
+                                        for layer_result in self.layer_history),
+            "usage": spans.totals()
         }
 
 
+def speculative_temperatures(n: int, low: float = 0.1, high: float = 0.9) -> List[float]:
+    """Spread constructor temperatures evenly over [low, high] for n speculative units"""
+    if n <= 1:
+        return [low]
+    return [round(low + (high - low) * i / (n - 1), 2) for i in range(n)]
+
+
+# ===================== Extracted Framework Store =====================
+# On-disk format version of stored frameworks
+FRAMEWORK_FORMAT_VERSION = 1
+
+DEFAULT_FRAMEWORK_DIR = os.getenv("RAMTN_FRAMEWORK_DIR",
+                                  os.path.join(os.path.expanduser("~"), ".ramtn", "frameworks"))
+
+
+class FrameworkStore:
+    """
+    Versioned on-disk store for extracted strategic frameworks
+    - One JSON file per framework: extracted framework plus best extraction result
+    - Framework ids are derived from the extraction question, so the same expert case maps to the same id
+    - Lets one extraction serve any number of later implantation runs
+    - Consolidated frameworks (fold) keep a snapshot file plus an append-only log of runs folded since
+    """
+
+    # The snapshot of a consolidated framework is rewritten once its log holds this many runs and at least
+    # as many as the snapshot, so rewrites cost amortized O(1) per folded item
+    FOLD_SNAPSHOT_MIN_RUNS = 32
+
+    def __init__(self, directory: str = DEFAULT_FRAMEWORK_DIR):
+        self.directory = directory
+        os.makedirs(self.directory, exist_ok=True)
+        # Consolidated frameworks this store has opened: id -> merger, question, snapshot runs, file stamp
+        self._consolidated_cache: Dict[str, Dict[str, Any]] = {}
+        self._fold_lock = threading.Lock()
+
+    @staticmethod
+    def framework_id_for(extraction_question: str) -> str:
+        """Stable framework id for an extraction question"""
+        return hashlib.sha256(extraction_question.strip().encode('utf-8')).hexdigest()[:16]
+
+    def _path(self, framework_id: str) -> str:
+        return os.path.join(self.directory, f"{framework_id}.json")
+
+    def _fold_log_path(self, framework_id: str) -> str:
+        return os.path.join(self.directory, f"{framework_id}.folds.jsonl")
+
+    def exists(self, framework_id: str) -> bool:
+        return os.path.exists(self._path(framework_id))
+
+    def save(self, extraction_results: Dict[str, Any], framework_id: Optional[str] = None) -> str:
+        """Persist extraction results; returns the framework id"""
+        if framework_id is None:
+            framework_id = self.framework_id_for(extraction_results["extraction_question"])
+
+        record = {
+            "format_version": FRAMEWORK_FORMAT_VERSION,
+            "framework_id": framework_id,
+            "saved_time": str(datetime.now()),
+            "extraction_question": extraction_results["extraction_question"],
+            "extracted_framework": extraction_results["extracted_framework"],
+            "best_result": extraction_results["best_result"]
+        }
+        if "merge_state" in extraction_results:
+            record["merge_state"] = extraction_results["merge_state"]
+
+        # Write to temp file then rename, so readers never see a partial file
+        path = self._path(framework_id)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        return framework_id
+
+    def load(self, framework_id: str) -> Dict[str, Any]:
+        """Load extraction results in the same shape extract_strategic_framework returns"""
+        path = self._path(framework_id)
+        if not os.path.exists(path):
+            raise KeyError(f"Framework not found: {framework_id}")
+
+        if os.path.exists(self._fold_log_path(framework_id)):
+            # Consolidated framework with runs folded since its snapshot
+            with self._fold_lock:
+                entry = self._consolidated(framework_id)
+            results = entry["merger"].extraction_results(entry["question"])
+            results["framework_id"] = framework_id
+            return results
+
+        with open(path, "r", encoding="utf-8") as f:
+            record = json.load(f)
+
+        version = record.get("format_version", 0)
+        if version > FRAMEWORK_FORMAT_VERSION:
+            raise ValueError(f"Framework {framework_id} has unsupported format version {version}")
+
+        results = {
+            "framework_id": framework_id,
+            "extraction_question": record["extraction_question"],
+            "extracted_framework": record["extracted_framework"],
+            "best_result": record["best_result"],
+            "all_results": [record["best_result"]]
+        }
+        if "merge_state" in record:
+            results["merge_state"] = record["merge_state"]
+        return results
+
+    def fold(self, target_id: str, extraction_results: Dict[str, Any],
+             question: Optional[str] = None) -> Dict[str, int]:
+        """
+        Fold extraction results into the consolidated framework stored under target_id (created if missing)
+        - Costs O(new items): the merger stays cached in this store and the run is appended to the fold log
+        - One writer per consolidated framework; changes by another process are picked up, not merged
+        - Returns added/merged item counts and the number of runs folded so far; load() renders the result
+        """
+        with self._fold_lock:
+            entry = self._consolidated(target_id, question)
+            merger = entry["merger"]
+            items = FrameworkMerger.run_items(extraction_results)
+            confidence = extraction_results["best_result"].get("final_confidence", 0.0)
+            source_id = extraction_results.get("framework_id")
+            stats = merger.fold_items(items, confidence, source_id)
+
+            with open(self._fold_log_path(target_id), "a", encoding="utf-8") as f:
+                f.write(json.dumps({"run": merger.runs, "items": items, "confidence": confidence,
+                                    "source": source_id}, ensure_ascii=False) + "\n")
+
+            pending = merger.runs - entry["snapshot_runs"]
+            if not self.exists(target_id) or pending >= max(self.FOLD_SNAPSHOT_MIN_RUNS, entry["snapshot_runs"]):
+                self._write_snapshot(target_id, entry)
+            entry["stamp"] = self._fold_stamp(target_id)
+
+        stats["runs"] = merger.runs
+        return stats
+
+    def flush(self, framework_id: Optional[str] = None):
+        """Write snapshots of consolidated frameworks (default: all this store folded into) and drop their logs"""
+        with self._fold_lock:
+            for target_id in [framework_id] if framework_id else list(self._consolidated_cache):
+                entry = self._consolidated(target_id)
+                if os.path.exists(self._fold_log_path(target_id)):
+                    self._write_snapshot(target_id, entry)
+                    entry["stamp"] = self._fold_stamp(target_id)
+
+    def _fold_stamp(self, framework_id: str) -> Tuple[Optional[int], int]:
+        """(snapshot mtime, log size): changes whenever either file is written"""
+        try:
+            snapshot_mtime = os.stat(self._path(framework_id)).st_mtime_ns
+        except FileNotFoundError:
+            snapshot_mtime = None
+        try:
+            log_size = os.stat(self._fold_log_path(framework_id)).st_size
+        except FileNotFoundError:
+            log_size = 0
+        return snapshot_mtime, log_size
+
+    def _consolidated(self, framework_id: str, question: Optional[str] = None) -> Dict[str, Any]:
+        """Cached merger of a consolidated framework, rebuilt from snapshot and fold log if the files changed"""
+        entry = self._consolidated_cache.get(framework_id)
+        stamp = self._fold_stamp(framework_id)
+        if entry is None or entry["stamp"] != stamp:
+            if stamp[0] is not None:
+                with open(self._path(framework_id), "r", encoding="utf-8") as f:
+                    record = json.load(f)
+                if "merge_state" not in record:
+                    raise ValueError(f"Framework {framework_id} is not a consolidated framework")
+                merger = FrameworkMerger.from_dict(record["merge_state"])
+                stored_question = record["extraction_question"]
+            else:
+                merger = FrameworkMerger()
+                stored_question = f"Consolidated framework {framework_id}"
+            snapshot_runs = merger.runs
+
+            # Replay runs folded since the snapshot (lines already in it are skipped)
+            if stamp[1]:
+                with open(self._fold_log_path(framework_id), "r", encoding="utf-8") as f:
+                    for line in f:
+                        folded = json.loads(line)
+                        if folded["run"] > merger.runs:
+                            merger.fold_items(folded["items"], folded["confidence"], folded["source"])
+
+            entry = self._consolidated_cache[framework_id] = {
+                "merger": merger, "question": stored_question, "snapshot_runs": snapshot_runs, "stamp": stamp
+            }
+        if question:
+            entry["question"] = question
+        return entry
+
+    def _write_snapshot(self, framework_id: str, entry: Dict[str, Any]):
+        """Rewrite the full consolidated framework, then drop the log it now contains"""
+        self.save(entry["merger"].extraction_results(entry["question"]), framework_id)
+        try:
+            os.remove(self._fold_log_path(framework_id))
+        except FileNotFoundError:
+            pass
+        entry["snapshot_runs"] = entry["merger"].runs
+
+    def version(self, framework_id: str) -> str:
+        """Changes whenever the framework is saved again or has runs folded into it (no file is read)"""
+        snapshot_mtime, log_size = self._fold_stamp(framework_id)
+        return f"{snapshot_mtime}:{log_size}"
+
+    def list_frameworks(self) -> List[str]:
+        """List stored framework ids"""
+        return sorted(name[:-len(".json")] for name in os.listdir(self.directory)
+                      if name.endswith(".json") and name != FRAMEWORK_INDEX_FILE)
+
+
+# ===================== Framework Merging =====================
+# Han, kana and hangul: scripts written without spaces between words
+_CJK_CHARACTER = re.compile(r'[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff]')
+
+class FrameworkMerger:
+    """
+    Incrementally consolidates many extraction runs into one framework
+    - An item that nearly repeats an existing one (shingle Jaccard >= similarity_threshold) counts
+      as support for it instead of becoming a new entry; MinHash LSH finds the candidates
+    - Every item keeps its support count and how often it was stated with each confidence level
+    - fold() costs O(new items); extracted_framework() renders the consolidated view on demand
+    """
+
+    _PRIME = (1 << 61) - 1
+    SECTIONS = tuple(name for name, _ in FRAMEWORK_SECTION_KEYWORDS)
+
+    def __init__(self, similarity_threshold: float = 0.7, num_perm: int = 16, bands: int = 8, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.similarity_threshold = similarity_threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.seed = seed
+        rng = random.Random(seed)
+        self._perms = [(rng.randrange(1, self._PRIME), rng.randrange(0, self._PRIME)) for _ in range(num_perm)]
+        self.items: Dict[str, List[Dict[str, Any]]] = {section: [] for section in self.SECTIONS}
+        self.runs = 0
+        self.confidence_sum = 0.0
+        self.sources: List[str] = []
+        # Per section: normalized text -> item index, and LSH band -> item indexes
+        self._exact: Dict[str, Dict[str, int]] = {section: {} for section in self.SECTIONS}
+        self._buckets: Dict[str, Dict[Tuple, List[int]]] = {section: {} for section in self.SECTIONS}
+        self._shingles: Dict[str, List[frozenset]] = {section: [] for section in self.SECTIONS}
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return " ".join(re.findall(r'\w+', text.lower()))
+
+    @staticmethod
+    def _shingle_set(normalized: str) -> frozenset:
+        """Word bigrams; character bigrams for CJK text, which has no spaces between words"""
+        if _CJK_CHARACTER.search(normalized):
+            words = list(normalized.replace(" ", ""))
+            joiner = ""
+        else:
+            words = normalized.split()
+            joiner = " "
+        if len(words) < 2:
+            return frozenset(words)
+        return frozenset(f"{a}{joiner}{b}" for a, b in zip(words, words[1:]))
+
+    def _band_keys(self, shingles: frozenset) -> List[Tuple]:
+        if not shingles:
+            return []
+        hashes = [int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=8).digest(), 'little')
+                  for s in shingles]
+        signature = [min((a * h + b) % self._PRIME for h in hashes) for a, b in self._perms]
+        rows = self.num_perm // self.bands
+        return [(band, tuple(signature[band * rows:(band + 1) * rows])) for band in range(self.bands)]
+
+    def _find_duplicate(self, section: str, normalized: str, shingles: frozenset,
+                        band_keys: List[Tuple]) -> Optional[int]:
+        index = self._exact[section].get(normalized)
+        if index is not None:
+            return index
+
+        best, best_similarity = None, self.similarity_threshold
+        seen = set()
+        for key in band_keys:
+            for candidate in self._buckets[section].get(key, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                other = self._shingles[section][candidate]
+                similarity = len(shingles & other) / len(shingles | other)
+                if similarity >= best_similarity:
+                    best, best_similarity = candidate, similarity
+        return best
+
+    def add_item(self, section: str, text: str, confidence_level: str = "confident"):
+        """Fold one item into a section; returns True if it matched an existing item"""
+        normalized = self._normalize(text)
+        shingles = self._shingle_set(normalized)
+        band_keys = self._band_keys(shingles)
+        index = self._find_duplicate(section, normalized, shingles, band_keys)
+
+        if index is None:
+            index = len(self.items[section])
+            self.items[section].append({"text": text, "support": 0,
+                                        "confidence": {"confident": 0, "speculative": 0, "unknown": 0}})
+            self._shingles[section].append(shingles)
+            for key in band_keys:
+                self._buckets[section].setdefault(key, []).append(index)
+            merged = False
+        else:
+            merged = True
+
+        self._exact[section].setdefault(normalized, index)
+        item = self.items[section][index]
+        item["support"] += 1
+        item["confidence"][confidence_level] = item["confidence"].get(confidence_level, 0) + 1
+        return merged
+
+    @classmethod
+    def run_items(cls, extraction_results: Dict[str, Any]) -> List[List[str]]:
+        """[section, text, confidence level] of every framework item of one extraction run"""
+        framework = extraction_results["extracted_framework"]
+
+        # Confidence level each item was stated with in the run's final triplets
+        levels = {}
+        for level in ("unknown", "speculative", "confident"):
+            for item in extraction_results["best_result"].get("final_triplets", {}).get(level, []):
+                levels[item] = level
+
+        return [[section, text, levels.get(text, "confident")]
+                for section in cls.SECTIONS for text in framework.get(section, [])]
+
+    def fold_items(self, items: List[List[str]], final_confidence: float = 0.0,
+                   source_id: Optional[str] = None) -> Dict[str, int]:
+        """Fold one run given as run_items() output; returns added/merged item counts"""
+        stats = {"added": 0, "merged": 0}
+        for section, text, level in items:
+            merged = self.add_item(section, text, level)
+            stats["merged" if merged else "added"] += 1
+
+        self.runs += 1
+        self.confidence_sum += final_confidence
+        if source_id:
+            self.sources.append(source_id)
+        return stats
+
+    def fold(self, extraction_results: Dict[str, Any], source_id: Optional[str] = None) -> Dict[str, int]:
+        """Fold one extraction run (extract_strategic_framework output); returns added/merged item counts"""
+        return self.fold_items(self.run_items(extraction_results),
+                               extraction_results["best_result"].get("final_confidence", 0.0), source_id)
+
+    def extracted_framework(self, max_items: Optional[int] = None) -> Dict[str, Any]:
+        """Consolidated framework in extract_framework_from_triplets shape, best supported items first"""
+        framework = {
+            "framework_name": "Consolidated Strategic Decision System",
+            "extraction_time": str(datetime.now()),
+            "merged_runs": self.runs,
+            "item_support": {}
+        }
+        for section in self.SECTIONS:
+            ranked = sorted(self.items[section], key=lambda item: -item["support"])[:max_items]
+            framework[section] = [item["text"] for item in ranked]
+            framework["item_support"][section] = [
+                {"text": item["text"], "support": item["support"], "confidence": dict(item["confidence"])}
+                for item in ranked
+            ]
+        return framework
+
+    def consolidated_triplets(self) -> Dict[str, List[str]]:
+        """Every consolidated item under the confidence level it was most often stated with"""
+        triplets = {"confident": [], "speculative": [], "unknown": []}
+        for section in self.SECTIONS:
+            for item in sorted(self.items[section], key=lambda item: -item["support"]):
+                level = max(("confident", "speculative", "unknown"), key=lambda name: item["confidence"].get(name, 0))
+                triplets[level].append(item["text"])
+        return triplets
+
+    def extraction_results(self, question: str) -> Dict[str, Any]:
+        """Consolidated framework as extraction results (FrameworkStore.save / set_extraction_results)"""
+        best_result = {
+            "final_response": "",
+            "final_triplets": self.consolidated_triplets(),
+            "final_confidence": self.confidence_sum / self.runs if self.runs else 0.0,
+            "merged_runs": self.runs
+        }
+        return {
+            "extraction_question": question,
+            "extracted_framework": self.extracted_framework(),
+            "best_result": best_result,
+            "all_results": [best_result],
+            "merge_state": self.to_dict()
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "similarity_threshold": self.similarity_threshold,
+            "num_perm": self.num_perm,
+            "bands": self.bands,
+            "seed": self.seed,
+            "runs": self.runs,
+            "confidence_sum": self.confidence_sum,
+            "sources": self.sources,
+            "items": self.items
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> "FrameworkMerger":
+        """Rebuild a merger (and its lookup indexes) from to_dict() output"""
+        merger = cls(state["similarity_threshold"], state["num_perm"], state["bands"], state["seed"])
+        merger.runs = state["runs"]
+        merger.confidence_sum = state["confidence_sum"]
+        merger.sources = list(state["sources"])
+        for section in cls.SECTIONS:
+            for index, item in enumerate(state["items"].get(section, [])):
+                normalized = merger._normalize(item["text"])
+                shingles = merger._shingle_set(normalized)
+                merger.items[section].append(item)
+                merger._shingles[section].append(shingles)
+                merger._exact[section].setdefault(normalized, index)
+                for key in merger._band_keys(shingles):
+                    merger._buckets[section].setdefault(key, []).append(index)
+        return merger
+
+
+# ===================== Framework Retrieval =====================
+class HashingEmbedder:
+    """
+    Local text embedding by feature hashing, no model download or API call
+    - Features: lowercase words, word bigrams, CJK characters and CJK character bigrams
+    - Each feature is hashed into one of `dim` signed buckets; counts are log-scaled and L2 normalized
+    """
+
+    _TOKEN_PATTERN = re.compile(r'[一-鿿]|[a-z0-9]+')
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+        self._bucket = lru_cache(maxsize=65536)(self._compute_bucket)
+
+    def _compute_bucket(self, feature: str) -> Tuple[int, float]:
+        h = int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'little')
+        return h % self.dim, 1.0 if (h >> 63) & 1 else -1.0
+
+    def _features(self, text: str) -> List[str]:
+        tokens = self._TOKEN_PATTERN.findall(text.lower())
+        features = list(tokens)
+        features.extend(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+        return features
+
+    def embed(self, texts: List[str]):
+        import numpy as np
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                bucket, sign = self._bucket(feature)
+                vectors[row, bucket] += sign
+        np.copysign(np.log1p(np.abs(vectors)), vectors, out=vectors)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+
+class FrameworkIndex:
+    """
+    Vector index over extracted frameworks, for picking the right one for an implantation question
+    - A framework is embedded from its extraction question, key insights and decision patterns
+    - Brute-force cosine search over a numpy matrix; with use_hnsw=True the optional hnswlib package
+      is used instead (approximate, for very large indexes)
+    - save()/load() keep the vectors on disk, so a process does not re-read every stored framework
+    - Each vector remembers the store version it was embedded from; sync() re-embeds changed frameworks
+    """
+
+    def __init__(self, embedder: Optional[HashingEmbedder] = None, use_hnsw: bool = False):
+        import numpy as np
+        self.embedder = embedder or HashingEmbedder()
+        self.ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._versions: Dict[str, str] = {}
+        self._matrix = np.zeros((16, self.embedder.dim), dtype=np.float32)
+        self._hnsw = None
+        if use_hnsw:
+            try:
+                import hnswlib
+            except ImportError:
+                raise ImportError("use_hnsw=True requires hnswlib (pip install hnswlib)")
+            self._hnsw = hnswlib.Index(space="cosine", dim=self.embedder.dim)
+            self._hnsw.init_index(max_elements=1024, ef_construction=200, M=16)
+            self._hnsw.set_ef(64)
+
+    @staticmethod
+    def framework_text(framework: Dict[str, Any], context: str = "") -> str:
+        parts = [context, framework.get("framework_name", "")]
+        parts.extend(framework.get("key_insights", []))
+        parts.extend(framework.get("decision_patterns", []))
+        return "\n".join(part for part in parts if part)
+
+    def add(self, framework_id: str, framework: Dict[str, Any], context: str = "", version: str = ""):
+        """Index (or re-index) one framework; context is usually its extraction question, version its store version"""
+        self._add_vector(framework_id, self.embedder.embed([self.framework_text(framework, context)])[0])
+        self._versions[framework_id] = version
+
+    def _add_vector(self, framework_id: str, vector):
+        import numpy as np
+        row = self._rows.get(framework_id)
+        if row is None:
+            row = len(self.ids)
+            if row == len(self._matrix):
+                self._matrix = np.concatenate([self._matrix, np.zeros_like(self._matrix)])
+            self.ids.append(framework_id)
+            self._rows[framework_id] = row
+        self._matrix[row] = vector
+
+        if self._hnsw is not None:
+            if row >= self._hnsw.get_max_elements():
+                self._hnsw.resize_index(2 * self._hnsw.get_max_elements())
+            self._hnsw.add_items(vector.reshape(1, -1), [row])
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, framework_id: str) -> bool:
+        return framework_id in self._rows
+
+    def search(self, query: str, k: int = 1) -> List[Tuple[str, float]]:
+        """Top-k (framework_id, cosine similarity) pairs, best first"""
+        import numpy as np
+        count = len(self.ids)
+        k = min(k, count)
+        if k <= 0:
+            return []
+        vector = self.embedder.embed([query])[0]
+
+        if self._hnsw is not None:
+            labels, distances = self._hnsw.knn_query(vector.reshape(1, -1), k=k)
+            return [(self.ids[label], float(1.0 - distance)) for label, distance in zip(labels[0], distances[0])]
+
+        scores = self._matrix[:count] @ vector
+        top = np.argpartition(-scores, k - 1)[:k] if k < count else np.arange(count)
+        top = top[np.argsort(-scores[top])]
+        return [(self.ids[row], float(scores[row])) for row in top]
+
+    def sync(self, store: "FrameworkStore") -> int:
+        """Index stored frameworks that are new or changed since they were indexed; returns how many were embedded"""
+        embedded = 0
+        for framework_id in store.list_frameworks():
+            version = store.version(framework_id)
+            if framework_id in self._rows and self._versions.get(framework_id) == version:
+                continue
+            record = store.load(framework_id)
+            self.add(framework_id, record["extracted_framework"], record["extraction_question"], version)
+            embedded += 1
+        return embedded
+
+    def save(self, path: str):
+        """Write ids and versions as fixed-width strings, so load() never needs pickle"""
+        import numpy as np
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp.npz"
+        np.savez(tmp_path, ids=np.array(self.ids, dtype=str),
+                 versions=np.array([self._versions.get(framework_id, "") for framework_id in self.ids], dtype=str),
+                 vectors=self._matrix[:len(self.ids)], dim=np.array(self.embedder.dim))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, embedder: Optional[HashingEmbedder] = None, use_hnsw: bool = False) -> "FrameworkIndex":
+        import numpy as np
+        with np.load(path, allow_pickle=False) as data:
+            dim = int(data["dim"])
+            index = cls(embedder or HashingEmbedder(dim), use_hnsw)
+            if index.embedder.dim != dim:
+                raise ValueError(f"Index {path} has dimension {dim}, embedder has {index.embedder.dim}")
+            for framework_id, version, vector in zip(data["ids"], data["versions"], data["vectors"]):
+                index._add_vector(str(framework_id), vector)
+                index._versions[str(framework_id)] = str(version)
+        return index
+
+
 # ===================== Strategic Cognition Dual Mode Engine =====================
 class StrategicCognitiveEngine:
     """
@@ -977,41 +3083,258 @@ class StrategicCognitiveEngine:
     - Provides comprehensive reporting for both modes
     """
 
-    def __init__(self, confidence_threshold: float = 0.75, max_units: int = 2):
+    def __init__(self, confidence_threshold: float = 0.75, max_units: int = 2,
+                 framework: Optional[StrategicDecisionFramework] = None,
+                 framework_store: Optional[FrameworkStore] = None,
+                 speculative_units: int = 0, pipelined_layers: bool = False,
+                 stability_predictor: Optional[StabilityPredictor] = None,
+                 checkpoint_store: Optional[CheckpointStore] = None,
+                 token_budgeter: Optional[TokenBudgeter] = None,
+                 framework_index: Optional[FrameworkIndex] = None):
         self.confidence_threshold = confidence_threshold
         self.max_units = max_units
+        # >1: run that many independent units concurrently (diversified temperatures), keep the best
+        self.speculative_units = speculative_units
+        # Overlap local work with in-flight calls inside each layer (runs units on the async path)
+        self.pipelined_layers = pipelined_layers
+        # Convergence test that lets a layer skip its critic + observer round (default: Jaccard)
+        self.stability_predictor = stability_predictor
+        # Per-role input ceilings for carried context (default: default_token_budgeter)
+        self.token_budgeter = token_budgeter
+        # Framework context; pass a dedicated instance to isolate concurrent engines
+        self.framework = framework if framework is not None else strategic_framework
+        # Optional persistent store; extractions are saved to it automatically
+        self.framework_store = framework_store
+        # Optional checkpoint store; runs checkpoint every layer and can be resumed by run id
+        self.checkpoint_store = checkpoint_store
+        # Optional retrieval index over stored frameworks; extractions are added to it automatically
+        self.framework_index = framework_index
         self.extraction_results = None  # Store strategic extraction results
         self.implantation_results = None  # Store strategic implantation results
 
-    def extract_strategic_framework(self, extraction_question: str) -> Dict[str, Any]:
-        """Execute strategic extraction process"""
-        print(f"\n{'=' * 80}")
-        print(f"Starting Strategic Extraction Process")
-        print(f"Extraction Question: {extraction_question}")
-        print(f"{'=' * 80}")
+    def reset(self):
+        """Clear results and extracted frameworks so the engine can serve an unrelated request"""
+        self.extraction_results = None
+        self.implantation_results = None
+        self.framework.reset()
+
+    def extract_strategic_framework(self, extraction_question: str, run_id: Optional[str] = None) -> Dict[str, Any]:
+        """Execute strategic extraction process (with a checkpoint store, run_id resumes an interrupted run)"""
+        run = self._open_run(run_id, "extraction", extraction_question)
+        self._announce_extraction(extraction_question)
+        with collect_spans() as spans, call_journal(run):
+            unit_results = self._run_units(extraction_question, "extraction", run)
+        return self._complete_extraction(extraction_question, unit_results, spans, run)
+
+    async def aextract_strategic_framework(self, extraction_question: str,
+                                           run_id: Optional[str] = None) -> Dict[str, Any]:
+        """Execute strategic extraction process asynchronously"""
+        run = self._open_run(run_id, "extraction", extraction_question)
+        self._announce_extraction(extraction_question)
+        with collect_spans() as spans, call_journal(run):
+            unit_results = await self._arun_units(extraction_question, "extraction", run)
+        return self._complete_extraction(extraction_question, unit_results, spans, run)
+
+    def implant_strategy(self, implantation_question: str, run_id: Optional[str] = None,
+                         top_k: int = 0) -> Dict[str, Any]:
+        """
+        Execute strategic implantation process (with a checkpoint store, run_id resumes an interrupted run)
+        - top_k > 0: first select the best matching stored frameworks via the framework index
+        """
+        if top_k > 0:
+            self.select_frameworks(implantation_question, top_k)
+        if not self.extraction_results:
+            print("❌ Please execute strategic extraction process first")
+            return {"error": "Please execute strategic extraction process first"}
+
+        run = self._open_run(run_id, "implantation", implantation_question)
+        self._announce_implantation(implantation_question)
+        with collect_spans() as spans, call_journal(run):
+            unit_results = self._run_units(implantation_question, "implantation", run)
+        return self._complete_implantation(implantation_question, unit_results, spans, run)
+
+    async def aimplant_strategy(self, implantation_question: str, run_id: Optional[str] = None,
+                                top_k: int = 0) -> Dict[str, Any]:
+        """
+        Execute strategic implantation process asynchronously
+        - top_k > 0: first select the best matching stored frameworks via the framework index
+        """
+        if top_k > 0:
+            self.select_frameworks(implantation_question, top_k)
+        if not self.extraction_results:
+            print("❌ Please execute strategic extraction process first")
+            return {"error": "Please execute strategic extraction process first"}
+
+        run = self._open_run(run_id, "implantation", implantation_question)
+        self._announce_implantation(implantation_question)
+        with collect_spans() as spans, call_journal(run):
+            unit_results = await self._arun_units(implantation_question, "implantation", run)
+        return self._complete_implantation(implantation_question, unit_results, spans, run)
+
+    def _open_run(self, run_id: Optional[str], mode: str, question: str) -> Optional[RunCheckpoint]:
+        """Start (or reopen) a checkpointed run; None when no checkpoint store is configured"""
+        if self.checkpoint_store is None:
+            if run_id is not None:
+                print(f"⚠️ No checkpoint store configured, run {run_id} starts from scratch")
+            return None
+
+        run_id = run_id or CheckpointStore.new_run_id()
+        framework_id = (self.extraction_results or {}).get("framework_id") if mode == "implantation" else None
+        run = self.checkpoint_store.open_run(run_id, mode, question, framework_id)
+        print(f"Run id: {run_id}")
+        emit_event("run_started", run_id=run_id)
+        return run
+
+    def resume_run(self, run_id: str) -> Dict[str, Any]:
+        """Resume a checkpointed run by id; completed layers and calls are replayed, not re-requested"""
+        run_info = self._resumable_run(run_id)
+        if run_info["mode"] == "extraction":
+            return self.extract_strategic_framework(run_info["question"], run_id)
+        return self.implant_strategy(run_info["question"], run_id)
+
+    async def aresume_run(self, run_id: str) -> Dict[str, Any]:
+        """Async counterpart of resume_run"""
+        run_info = self._resumable_run(run_id)
+        if run_info["mode"] == "extraction":
+            return await self.aextract_strategic_framework(run_info["question"], run_id)
+        return await self.aimplant_strategy(run_info["question"], run_id)
+
+    def _resumable_run(self, run_id: str) -> Dict[str, Any]:
+        if self.checkpoint_store is None:
+            raise ValueError("Resuming a run requires a checkpoint store")
+        run_info = self.checkpoint_store.get_run(run_id)
+        if run_info is None:
+            raise KeyError(f"Unknown run: {run_id}")
+
+        # Implantation needs its framework; reload it if this engine has none yet
+        if run_info["mode"] == "implantation" and not self.extraction_results and run_info["framework_id"]:
+            self.load_framework(run_info["framework_id"])
+        return run_info
+
+    def _run_units(self, question: str, mode: str, run: Optional[RunCheckpoint] = None) -> List[Dict[str, Any]]:
+        """Run thinking units one after another until threshold or max units"""
+        if self.speculative_units > 1 or self.pipelined_layers:
+            return _run_sync(self._arun_units(question, mode, run))
 
         current_response = ""
         current_critique = ""
         unit_results = []
 
         for unit_num in range(1, self.max_units + 1):
-            print(f"\n>>> Launching Strategic Extraction Unit {unit_num}/{self.max_units}")
-
-            unit = StrategicThinkingUnit(unit_num, extraction_question, "extraction",
-                                         current_response, current_critique)
+            unit = self._create_unit(unit_num, question, mode, current_response, current_critique, run=run)
             unit_result = unit.execute()
             unit_results.append(unit_result)
 
             current_response = unit_result["final_response"]
             current_critique = unit_result["final_critique"]
+            if self._unit_completes_run(unit_num, unit_result, mode):
+                break
+
+        return unit_results
+
+    async def _arun_units(self, question: str, mode: str,
+                          run: Optional[RunCheckpoint] = None) -> List[Dict[str, Any]]:
+        """Async counterpart of _run_units"""
+        if self.speculative_units > 1:
+            return await self._arun_units_speculative(question, mode, run)
+
+        current_response = ""
+        current_critique = ""
+        unit_results = []
 
-            print(f"\nExtraction Unit {unit_num} completed: Confidence {unit_result['final_confidence']:.2f}")
+        for unit_num in range(1, self.max_units + 1):
+            unit = self._create_unit(unit_num, question, mode, current_response, current_critique, run=run)
+            unit_result = await unit.aexecute()
+            unit_results.append(unit_result)
 
-            # Simple termination condition: confidence sufficiently high or reached max units
-            if unit_result["final_confidence"] >= self.confidence_threshold or unit_num >= self.max_units:
-                print(f"\n>>> Strategic extraction terminated at unit {unit_num}")
+            current_response = unit_result["final_response"]
+            current_critique = unit_result["final_critique"]
+            if self._unit_completes_run(unit_num, unit_result, mode):
                 break
 
+        return unit_results
+
+    async def _arun_units_speculative(self, question: str, mode: str,
+                                      run: Optional[RunCheckpoint] = None) -> List[Dict[str, Any]]:
+        """
+        Run independent units concurrently with diversified constructor temperatures
+        Stragglers are cancelled once any unit reaches the confidence threshold
+        """
+        label = "Extraction" if mode == "extraction" else "Implantation"
+        temperatures = speculative_temperatures(self.speculative_units)
+        tasks = [
+            asyncio.ensure_future(
+                self._create_unit(unit_num, question, mode, "", "", total=len(temperatures),
+                                  constructor_temperature=temperature, run=run).aexecute()
+            )
+            for unit_num, temperature in enumerate(temperatures, start=1)
+        ]
+
+        unit_results = []
+        last_error = None
+        try:
+            for finished in asyncio.as_completed(tasks):
+                try:
+                    unit_result = await finished
+                except Exception as e:
+                    # A failed speculative unit does not sink the run while others are pending
+                    print(f"Speculative {label.lower()} unit failed: {e}")
+                    last_error = e
+                    continue
+
+                unit_results.append(unit_result)
+                print(f"\n{label} Unit {unit_result['unit']} completed: Confidence {unit_result['final_confidence']:.2f}")
+                if unit_result["final_confidence"] >= self.confidence_threshold:
+                    print(f"\n>>> Strategic {label.lower()} threshold reached, cancelling remaining units")
+                    break
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        if not unit_results:
+            raise last_error
+        return unit_results
+
+    def _create_unit(self, unit_num: int, question: str, mode: str,
+                     current_response: str, current_critique: str, total: Optional[int] = None,
+                     constructor_temperature: float = 0.1,
+                     run: Optional[RunCheckpoint] = None) -> StrategicThinkingUnit:
+        label = "Extraction" if mode == "extraction" else "Implantation"
+        print(f"\n>>> Launching Strategic {label} Unit {unit_num}/{total or self.max_units}")
+        return StrategicThinkingUnit(unit_num, question, mode, current_response, current_critique,
+                                     self.framework, constructor_temperature, self.pipelined_layers,
+                                     self.stability_predictor, run, self.token_budgeter)
+
+    def _unit_completes_run(self, unit_num: int, unit_result: Dict[str, Any], mode: str) -> bool:
+        """Simple termination condition: confidence sufficiently high or reached max units"""
+        label = "Extraction" if mode == "extraction" else "Implantation"
+        print(f"\n{label} Unit {unit_num} completed: Confidence {unit_result['final_confidence']:.2f}")
+
+        if unit_result["final_confidence"] >= self.confidence_threshold or unit_num >= self.max_units:
+            print(f"\n>>> Strategic {label.lower()} terminated at unit {unit_num}")
+            return True
+        return False
+
+    def _announce_extraction(self, extraction_question: str):
+        print(f"\n{'=' * 80}")
+        print(f"Starting Strategic Extraction Process")
+        print(f"Extraction Question: {extraction_question}")
+        print(f"{'=' * 80}")
+        emit_event("extraction_started")
+
+    def _announce_implantation(self, implantation_question: str):
+        print(f"\n{'=' * 80}")
+        print(f"Starting Strategic Implantation Process")
+        print(f"Implantation Question: {implantation_question}")
+        print(f"Using extracted framework: {self.extraction_results['extracted_framework'].get('framework_name', 'User Strategic System')}")
+        print(f"{'=' * 80}")
+        emit_event("implantation_started")
+
+    def _complete_extraction(self, extraction_question: str, unit_results: List[Dict[str, Any]],
+                             spans: SpanCollector, run: Optional[RunCheckpoint] = None) -> Dict[str, Any]:
+        """Select best unit, extract framework and store extraction results"""
         # Select best result
         best_unit_index = max(range(len(unit_results)), key=lambda i: unit_results[i]["final_confidence"])
         best_result = unit_results[best_unit_index]
@@ -1024,52 +3347,95 @@ class StrategicCognitiveEngine:
             "extraction_question": extraction_question,
             "extracted_framework": extracted_framework,
             "best_result": best_result,
-            "all_results": unit_results
+            "all_results": unit_results,
+            "usage": spans.summary()
         }
 
-        # Set to strategic framework for subsequent use
-        strategic_framework.set_extracted_framework(extracted_framework)
+        if self.framework_store is not None:
+            self.extraction_results["framework_id"] = self.framework_store.save(self.extraction_results)
+            print(f"Framework saved: {self.extraction_results['framework_id']}")
+            if self.framework_index is not None:
+                self.framework_index.add(self.extraction_results["framework_id"], extracted_framework,
+                                         extraction_question,
+                                         self.framework_store.version(self.extraction_results["framework_id"]))
+
+        # Set to strategic framework for subsequent use; registered by id alongside earlier extractions
+        self.framework.set_extracted_framework(extracted_framework,
+                                               FrameworkStore.framework_id_for(extraction_question))
+
+        if run is not None:
+            self.extraction_results["run_id"] = run.run_id
+            run.complete()
 
         print(f"\n✅ Strategic extraction completed")
         print(f"Extraction confidence: {best_result['final_confidence']:.2f}")
         print(f"Key insights count: {len(extracted_framework.get('key_insights', []))}")
+        emit_event("extraction_completed", final_confidence=best_result['final_confidence'],
+                   key_insights=len(extracted_framework.get('key_insights', [])))
 
         return self.extraction_results
 
-    def implant_strategy(self, implantation_question: str) -> Dict[str, Any]:
-        """Execute strategic implantation process"""
-        if not self.extraction_results:
-            print("❌ Please execute strategic extraction process first")
-            return {"error": "Please execute strategic extraction process first"}
+    def load_framework(self, framework_id: str, store: Optional[FrameworkStore] = None) -> Dict[str, Any]:
+        """Load a stored extraction so implantation can run without re-extracting"""
+        store = store or self.framework_store or FrameworkStore()
+        self.set_extraction_results(store.load(framework_id))
 
-        print(f"\n{'=' * 80}")
-        print(f"Starting Strategic Implantation Process")
-        print(f"Implantation Question: {implantation_question}")
-        print(f"Using extracted framework: {self.extraction_results['extracted_framework'].get('framework_name', 'User Strategic System')}")
-        print(f"{'=' * 80}")
-
-        current_response = ""
-        current_critique = ""
-        unit_results = []
-
-        for unit_num in range(1, self.max_units + 1):
-            print(f"\n>>> Launching Strategic Implantation Unit {unit_num}/{self.max_units}")
-
-            unit = StrategicThinkingUnit(unit_num, implantation_question, "implantation",
-                                         current_response, current_critique)
-            unit_result = unit.execute()
-            unit_results.append(unit_result)
-
-            current_response = unit_result["final_response"]
-            current_critique = unit_result["final_critique"]
-
-            print(f"\nImplantation Unit {unit_num} completed: Confidence {unit_result['final_confidence']:.2f}")
-
-            # Simple termination condition
-            if unit_result["final_confidence"] >= self.confidence_threshold or unit_num >= self.max_units:
-                print(f"\n>>> Strategic implantation terminated at unit {unit_num}")
-                break
+        print(f"✅ Strategic framework loaded: {framework_id}")
+        emit_event("framework_loaded", framework_id=framework_id)
+        return self.extraction_results
 
+    def select_frameworks(self, question: str, top_k: int = 1,
+                          store: Optional[FrameworkStore] = None) -> List[Tuple[str, float]]:
+        """
+        Pick the stored frameworks that best match a question and use them for implantation
+        - The best match becomes the extracted framework; the other top_k - 1 are added as supporting
+          frameworks in the guidance
+        """
+        if self.framework_index is None:
+            raise ValueError("Selecting frameworks requires a framework_index")
+        store = store or self.framework_store or FrameworkStore()
+        matches = self.framework_index.search(question, top_k)
+        if not matches:
+            print("⚠️ Framework index is empty, keeping the current framework")
+            return matches
+
+        self.load_framework(matches[0][0], store)
+        supporting = []
+        for framework_id, _ in matches[1:]:
+            if framework_id not in self.framework.frameworks:
+                self.framework.register_extracted(framework_id, store.load(framework_id)["extracted_framework"])
+            supporting.append(framework_id)
+        self.framework.set_supporting_frameworks(supporting)
+
+        print("Selected frameworks: " + ", ".join(f"{framework_id} ({score:.2f})" for framework_id, score in matches))
+        emit_event("frameworks_selected", matches=matches)
+        return matches
+
+    def set_extraction_results(self, extraction_results: Dict[str, Any]):
+        """Use existing extraction results (e.g. shared by a batch) for implantation"""
+        self.extraction_results = extraction_results
+        self.framework.set_extracted_framework(extraction_results["extracted_framework"],
+                                               extraction_results.get("framework_id"))
+
+    def extract_or_load_framework(self, extraction_question: str) -> Dict[str, Any]:
+        """Load the stored framework for this question if present, otherwise extract (and store) it"""
+        if self.framework_store is not None:
+            framework_id = FrameworkStore.framework_id_for(extraction_question)
+            if self.framework_store.exists(framework_id):
+                return self.load_framework(framework_id)
+        return self.extract_strategic_framework(extraction_question)
+
+    async def aextract_or_load_framework(self, extraction_question: str) -> Dict[str, Any]:
+        """Async counterpart of extract_or_load_framework"""
+        if self.framework_store is not None:
+            framework_id = FrameworkStore.framework_id_for(extraction_question)
+            if self.framework_store.exists(framework_id):
+                return self.load_framework(framework_id)
+        return await self.aextract_strategic_framework(extraction_question)
+
+    def _complete_implantation(self, implantation_question: str, unit_results: List[Dict[str, Any]],
+                               spans: SpanCollector, run: Optional[RunCheckpoint] = None) -> Dict[str, Any]:
+        """Select best unit, generate final output and store implantation results"""
         # Select best result
         best_unit_index = max(range(len(unit_results)), key=lambda i: unit_results[i]["final_confidence"])
         best_result = unit_results[best_unit_index]
@@ -1082,11 +3448,16 @@ class StrategicCognitiveEngine:
             "implantation_question": implantation_question,
             "final_output": final_output,
             "best_result": best_result,
-            "all_results": unit_results
+            "all_results": unit_results,
+            "usage": spans.summary()
         }
+        if run is not None:
+            self.implantation_results["run_id"] = run.run_id
+            run.complete()
 
         print(f"\n✅ Strategic implantation completed")
         print(f"Implantation confidence: {best_result['final_confidence']:.2f}")
+        emit_event("implantation_completed", final_confidence=best_result['final_confidence'])
 
         return self.implantation_results
 
@@ -1173,81 +3544,1525 @@ class StrategicCognitiveEngine:
         return report.encode('utf-8').decode('ascii', errors='ignore')
 
 # ===================== Large Language Model API Calls =====================
-def call_qwen(prompt: str, role: str = "default", temperature: float = 0.3) -> str:
-    """Call qwen API - extended to support dual mode roles"""
-    system_messages = {
-        "strategic_constructor_extraction": """You are a professional strategic extraction AI advisor, specialized in extracting strategic decision systems from user input. Your core capabilities:
+# Model used for every role
+QWEN_MODEL = "qwen-plus"
+
+# Connection pool size for asynchronous calls (shared by all in-flight analyses of a process)
+ASYNC_POOL_SIZE = int(os.getenv("RAMTN_ASYNC_POOL_SIZE", "64"))
+
+# System messages for dual mode roles
+SYSTEM_MESSAGES = {
+    "strategic_constructor_extraction": """You are a professional strategic extraction AI advisor, specialized in extracting strategic decision systems from user input. Your core capabilities:
 1. Accurately identify decision patterns and strategic principles from user expressions
 2. Distill core values and decision logic, build structured systems
 3. Clearly label strategic system application boundaries and limitations
 4. Maintain extraction accuracy and completeness, avoid over-inference""",
 
-        "strategic_constructor_implantation": """You are a professional strategic analysis AI advisor, specialized in analyzing user problems using strategic frameworks. Your core capabilities:
+    "strategic_constructor_implantation": """You are a professional strategic analysis AI advisor, specialized in analyzing user problems using strategic frameworks. Your core capabilities:
 1. Reasonably apply strategic frameworks for deep problem analysis
 2. Provide personalized insights combining extracted systems
 3. Clearly label different framework compatibility levels and application boundaries
 4. Provide specific, feasible, and context-based strategic recommendations""",
 
-        "strategic_critic_extraction": """You are a strict strategic extraction reviewer, focused on discovering key issues in strategic extraction. Your critiques:
+    "strategic_critic_extraction": """You are a strict strategic extraction reviewer, focused on discovering key issues in strategic extraction. Your critiques:
 1. Check accuracy and completeness of strategic principle extraction
 2. Evaluate system structural reasonableness and logical clarity
 3. Verify clarity of application boundary labeling
 4. Ensure extracted systems have practical value and guidance significance""",
 
-        "strategic_critic_implantation": """You are a strict analysis reviewer, focused on discovering key issues in strategic analysis. Your critiques:
+    "strategic_critic_implantation": """You are a strict analysis reviewer, focused on discovering key issues in strategic analysis. Your critiques:
 1. Check reasonableness and accuracy of strategic framework application
 2. Evaluate depth of analytical insights and strategic value
 3. Verify specificity and feasibility of recommendations
 4. Ensure analysis sufficiently combines user-specific context""",
 
-        "strategic_observer_extraction": """You are a strategic extraction quality evaluation expert, skilled in:
+    "strategic_observer_extraction": """You are a strategic extraction quality evaluation expert, skilled in:
 1. Evaluating accuracy and completeness of strategic principle extraction
 2. Judging system structural reasonableness and logical clarity
 3. Verifying clarity of application boundary labeling
 4. Measuring practical value and guidance significance of extracted systems""",
 
-        "strategic_observer_implantation": """You are a strategic analysis quality evaluation expert, skilled in:
+    "strategic_observer_implantation": """You are a strategic analysis quality evaluation expert, skilled in:
 1. Evaluating accuracy and reasonableness of strategic framework application
 2. Judging depth of analytical insights and strategic value
 3. Verifying specificity and feasibility of recommendations
 4. Measuring degree of analysis combination with user context""",
 
-        "default": "You are a helpful AI assistant."
-    }
+    "default": "You are a helpful AI assistant."
+}
 
-    system_content = system_messages.get(role, system_messages["default"])
 
-    messages = [
+def _build_messages(prompt: str, role: str, system: Optional[str] = None) -> List[Dict[str, str]]:
+    """Build chat messages for a role (system overrides the role's default system message)"""
+    system_content = system if system is not None else SYSTEM_MESSAGES.get(role, SYSTEM_MESSAGES["default"])
+    return [
         {"role": "system", "content": system_content},
         {"role": "user", "content": prompt},
     ]
 
+
+# ===================== LLM Backends =====================
+class LLMCallError(Exception):
+    """Non-success response from the model API; status_code drives the retry decision"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, code: Optional[str] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.code = code
+
+
+class LLMBackend:
+    """
+    Chat completion backend used by call_qwen / acall_qwen
+    - generate / agenerate return {"content", "prompt_tokens", "completion_tokens", "streamed"}
+    - With on_token, implementations stream and pass each text delta to on_token
+    - With json_mode, implementations request a JSON object response where the model supports it
+    - Raise on failure; caching, spans and logging are handled by the callers
+    """
+
+    model = QWEN_MODEL
+
+    def generate(self, role: str, messages: List[Dict[str, str]], temperature: float,
+                 on_token: Optional[Callable[[str], None]] = None,
+                 json_mode: bool = False) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    async def agenerate(self, role: str, messages: List[Dict[str, str]], temperature: float,
+                        on_token: Optional[Callable[[str], None]] = None,
+                        json_mode: bool = False) -> Dict[str, Any]:
+        """Default async implementation: run the blocking call in the loop's thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, lambda: self.generate(role, messages, temperature, on_token, json_mode))
+
+
+def _completion(content: str, response=None, streamed: bool = False) -> Dict[str, Any]:
+    """Build a backend result, taking token usage from a DashScope response when available"""
+    usage = getattr(response, "usage", None)
+    # Prompt tokens served from the provider's context cache, when reported
+    details = getattr(usage, "prompt_tokens_details", None) if usage is not None else None
+    cached = details.get("cached_tokens", 0) if isinstance(details, dict) else getattr(details, "cached_tokens", 0)
+    return {
+        "content": content.encode('utf-8').decode('utf-8', errors='ignore'),
+        "prompt_tokens": (getattr(usage, "input_tokens", 0) or 0) if usage is not None else 0,
+        "cached_tokens": cached or 0,
+        "completion_tokens": (getattr(usage, "output_tokens", 0) or 0) if usage is not None else 0,
+        "streamed": streamed
+    }
+
+
+def _response_content(response) -> str:
+    """Extract message content from a DashScope response, raising on non-200"""
+    if response.status_code == 200:
+        return response.output.choices[0].message.content
+    else:
+        raise LLMCallError(f"API call failed: {response.message}", response.status_code,
+                           getattr(response, "code", None))
+
+
+def _stream_chunk(response) -> str:
+    """Extract the incremental content of one streamed response chunk, raising on non-200"""
+    if response.status_code != 200:
+        raise LLMCallError(f"API call failed: {response.message}", response.status_code,
+                           getattr(response, "code", None))
+    return response.output.choices[0].message.content or ""
+
+
+class DashScopeBackend(LLMBackend):
+    """DashScope (Tongyi Qianwen) backend; async calls share the pooled aiohttp session"""
+
+    def __init__(self, model: str = QWEN_MODEL, api_key: Optional[str] = None):
+        self.model = model
+        self.api_key = api_key
+
+    def _request(self, messages: List[Dict[str, str]], temperature: float, stream: bool,
+                 json_mode: bool) -> Dict[str, Any]:
+        request = {
+            "api_key": self.api_key or os.getenv("DASHSCOPE_API_KEY"),
+            "model": self.model,
+            "messages": messages,
+            "result_format": "message",
+            "temperature": temperature,
+        }
+        if stream:
+            request.update(stream=True, incremental_output=True)
+        if json_mode:
+            request["response_format"] = {"type": "json_object"}
+        return request
+
+    def generate(self, role: str, messages: List[Dict[str, str]], temperature: float,
+                 on_token: Optional[Callable[[str], None]] = None,
+                 json_mode: bool = False) -> Dict[str, Any]:
+        if on_token is None:
+            response = Generation.call(**self._request(messages, temperature, False, json_mode))
+            return _completion(_response_content(response), response)
+
+        parts = []
+        response = None
+        for response in Generation.call(**self._request(messages, temperature, True, json_mode)):
+            delta = _stream_chunk(response)
+            if delta:
+                parts.append(delta)
+                on_token(delta)
+        return _completion("".join(parts), response, streamed=True)
+
+    async def agenerate(self, role: str, messages: List[Dict[str, str]], temperature: float,
+                        on_token: Optional[Callable[[str], None]] = None,
+                        json_mode: bool = False) -> Dict[str, Any]:
+        session = async_session_pool.get_session()
+        if on_token is None:
+            response = await AioGeneration.call(session=session, **self._request(messages, temperature, False, json_mode))
+            return _completion(_response_content(response), response)
+
+        parts = []
+        response = None
+        responses = await AioGeneration.call(session=session, **self._request(messages, temperature, True, json_mode))
+        async for response in responses:
+            delta = _stream_chunk(response)
+            if delta:
+                parts.append(delta)
+                on_token(delta)
+        return _completion("".join(parts), response, streamed=True)
+
+
+class FakeLLMBackend(LLMBackend):
+    """
+    Offline backend for demos, development and benchmarks
+    - Replays recorded responses (JSONL written by RecordingBackend) when the request matches
+    - Otherwise answers from deterministic per-role templates in the formats the engine parses
+    - Simulates network latency (seconds per call) and streams in small chunks
+    - failure_rate injects throttling errors (HTTP 429) to exercise retry and backoff
+    - Reports a repeated system message as cached prompt tokens, like the provider's prefix cache
+    """
+
+    _CONFIDENT = [
+        "Core principle: buy durable businesses at a reasonable price rather than cheap assets",
+        "Key logic: brand loyalty creates pricing power that compounds over decades",
+        "Decision pattern: set a hard price ceiling before negotiating and walk away above it",
+        "Core values: trust capable management and keep interference to a minimum",
+        "Key evaluation of cash generation: prefer businesses needing little reinvestment",
+    ]
+    _SPECULATIVE = [
+        "Decision logic likely weighs opportunity cost against alternative investments",
+        "Risk consideration: growth limits of a mature industry may cap returns",
+        "Judgment seems to rely on partner challenge to overcome anchoring on book value",
+        "Pattern suggests long holding periods are a deliberate choice, not inertia",
+    ]
+    _UNKNOWN = [
+        "Boundary: applicability to fast-changing technology sectors is unknown",
+        "Limit of the framework under high inflation regimes is immeasurable from this case",
+        "Unknown how the approach handles businesses without an established brand",
+    ]
+
+    def __init__(self, latency: float = 0.0, recording_path: Optional[str] = None,
+                 chunk_size: int = 16, model: str = QWEN_MODEL, failure_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self._failures = random.Random(seed)
+        self._failures_lock = threading.Lock()
+        self._seen_prefixes = set()
+        self.chunk_size = chunk_size
+        self.model = model
+        self.recorded: Dict[str, str] = {}
+        if recording_path and os.path.exists(recording_path):
+            with open(recording_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        self.recorded[record["key"]] = record["content"]
+
+    def respond(self, role: str, messages: List[Dict[str, str]], temperature: float,
+                json_mode: bool = False) -> str:
+        """Deterministic response text for a request"""
+        prompt = messages[-1]["content"]
+        recorded = self.recorded.get(ResponseCache.make_key(role, prompt, temperature, self.model, json_mode))
+        if recorded is not None:
+            return recorded
+
+        rng = random.Random(hashlib.sha256(f"{role}|{temperature}|{prompt}".encode('utf-8')).digest())
+        if "critic" in role:
+            return ("🔴 Quality Issues: some principles lack direct evidence from the input\n"
+                    "🟡 Logic Issues: risk considerations and decision patterns overlap\n"
+                    "🟢 Expression Issues: several points could be more concise")
+        if "observer" in role:
+            return json.dumps({
+                "final_triplets": {
+                    "confident": rng.sample(self._CONFIDENT, 3),
+                    "speculative": rng.sample(self._SPECULATIVE, 2),
+                    "unknown": rng.sample(self._UNKNOWN, 1)
+                },
+                "confidence_score": round(rng.uniform(0.6, 0.9), 2),
+                "critique_validity": round(rng.uniform(0.4, 0.8), 2)
+            }, ensure_ascii=False)
+        if "constructor" in role:
+            sections = [("【I am confident】", rng.sample(self._CONFIDENT, 4)),
+                        ("【I speculate】", rng.sample(self._SPECULATIVE, 3)),
+                        ("【I don't know】", rng.sample(self._UNKNOWN, 2))]
+            return "\n".join(f"{header}\n" + "\n".join(f"• {item}" for item in items)
+                             for header, items in sections)
+        return "OK"
+
+    def _maybe_fail(self):
+        if self.failure_rate:
+            with self._failures_lock:
+                failed = self._failures.random() < self.failure_rate
+            if failed:
+                raise LLMCallError("API call failed: Requests rate limit exceeded", 429, "Throttling.RateQuota")
+
+    def _chunks(self, content: str) -> List[str]:
+        return [content[i:i + self.chunk_size] for i in range(0, len(content), self.chunk_size)] or [""]
+
+    def _result(self, messages: List[Dict[str, str]], content: str, streamed: bool) -> Dict[str, Any]:
+        # Rough token estimate: words and punctuation marks
+        message_tokens = [len(re.findall(r'\w+|[^\w\s]', m["content"])) for m in messages]
+        cached_tokens = 0
+        if messages[0]["role"] == "system":
+            prefix = hashlib.sha256(messages[0]["content"].encode('utf-8')).digest()
+            with self._failures_lock:
+                if prefix in self._seen_prefixes:
+                    cached_tokens = message_tokens[0]
+                self._seen_prefixes.add(prefix)
+        return {
+            "content": content,
+            "prompt_tokens": sum(message_tokens),
+            "cached_tokens": cached_tokens,
+            "completion_tokens": len(re.findall(r'\w+|[^\w\s]', content)),
+            "streamed": streamed
+        }
+
+    def generate(self, role: str, messages: List[Dict[str, str]], temperature: float,
+                 on_token: Optional[Callable[[str], None]] = None,
+                 json_mode: bool = False) -> Dict[str, Any]:
+        content = self.respond(role, messages, temperature, json_mode)
+        if on_token is None:
+            if self.latency:
+                time.sleep(self.latency)
+            self._maybe_fail()
+            return self._result(messages, content, streamed=False)
+
+        self._maybe_fail()
+        chunks = self._chunks(content)
+        for chunk in chunks:
+            if self.latency:
+                time.sleep(self.latency / len(chunks))
+            on_token(chunk)
+        return self._result(messages, content, streamed=True)
+
+    async def agenerate(self, role: str, messages: List[Dict[str, str]], temperature: float,
+                        on_token: Optional[Callable[[str], None]] = None,
+                        json_mode: bool = False) -> Dict[str, Any]:
+        content = self.respond(role, messages, temperature, json_mode)
+        if on_token is None:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            self._maybe_fail()
+            return self._result(messages, content, streamed=False)
+
+        self._maybe_fail()
+        chunks = self._chunks(content)
+        for chunk in chunks:
+            if self.latency:
+                await asyncio.sleep(self.latency / len(chunks))
+            on_token(chunk)
+        return self._result(messages, content, streamed=True)
+
+
+class RecordingBackend(LLMBackend):
+    """Wraps a backend and appends every response to a JSONL file that FakeLLMBackend can replay"""
+
+    def __init__(self, inner: LLMBackend, path: str):
+        self.inner = inner
+        self.model = inner.model
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _record(self, role: str, messages: List[Dict[str, str]], temperature: float, json_mode: bool,
+                result: Dict[str, Any]):
+        record = {
+            "key": ResponseCache.make_key(role, messages[-1]["content"], temperature, self.model, json_mode),
+            "role": role,
+            "content": result["content"]
+        }
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def generate(self, role: str, messages: List[Dict[str, str]], temperature: float,
+                 on_token: Optional[Callable[[str], None]] = None,
+                 json_mode: bool = False) -> Dict[str, Any]:
+        result = self.inner.generate(role, messages, temperature, on_token, json_mode)
+        self._record(role, messages, temperature, json_mode, result)
+        return result
+
+    async def agenerate(self, role: str, messages: List[Dict[str, str]], temperature: float,
+                        on_token: Optional[Callable[[str], None]] = None,
+                        json_mode: bool = False) -> Dict[str, Any]:
+        result = await self.inner.agenerate(role, messages, temperature, on_token, json_mode)
+        self._record(role, messages, temperature, json_mode, result)
+        return result
+
+
+def _llm_backend_from_env() -> LLMBackend:
+    """RAMTN_LLM_BACKEND=fake selects the offline backend (latency from RAMTN_FAKE_LATENCY)"""
+    if os.getenv("RAMTN_LLM_BACKEND", "dashscope") == "fake":
+        return FakeLLMBackend(latency=float(os.getenv("RAMTN_FAKE_LATENCY", "0")),
+                              recording_path=os.getenv("RAMTN_FAKE_RECORDING"),
+                              failure_rate=float(os.getenv("RAMTN_FAKE_FAILURE_RATE", "0")))
+    return DashScopeBackend()
+
+
+# Backend used by call_qwen / acall_qwen
+llm_backend: LLMBackend = _llm_backend_from_env()
+
+
+def configure_llm_backend(backend: LLMBackend):
+    """Install the backend used by call_qwen / acall_qwen"""
+    global llm_backend
+    llm_backend = backend
+
+
+# Backend replacing llm_backend for calls made in the current context (e.g. one web session's API key)
+_llm_backend_override: ContextVar[Optional[LLMBackend]] = ContextVar("ramtn_llm_backend", default=None)
+
+
+@contextmanager
+def use_llm_backend(backend: Optional[LLMBackend]):
+    """Route calls made inside this block to backend (None keeps the installed backend)"""
+    token = _llm_backend_override.set(backend)
     try:
-        print(f"Calling API - {role}: {prompt[:80]}...")
+        yield backend
+    finally:
+        _llm_backend_override.reset(token)
+
+
+def active_llm_backend() -> LLMBackend:
+    """Backend call_qwen / acall_qwen use in the current context"""
+    return _llm_backend_override.get() or llm_backend
+
+
+def backend_for_api_key(api_key: Optional[str]) -> Optional[LLMBackend]:
+    """DashScope backend calling with api_key; None (installed backend) without a key or for a non-DashScope backend"""
+    if not api_key or not isinstance(llm_backend, DashScopeBackend):
+        return None
+    return DashScopeBackend(model=llm_backend.model, api_key=api_key)
+
+
+# ===================== Request Scheduling =====================
+def is_retryable_error(error: BaseException) -> bool:
+    """Throttling (429), server errors (5xx) and transport failures are worth retrying"""
+    if isinstance(error, LLMCallError):
+        status = error.status_code or 0
+        return status == 429 or status >= 500 or "Throttling" in (error.code or "")
+    # The sync DashScope SDK raises requests' own exceptions, which do not subclass the built-in ones
+    return isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError, ConnectionError, TimeoutError,
+                              requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+
+
+def estimate_tokens(messages: List[Dict[str, str]]) -> int:
+    """Rough prompt token estimate for rate limiting (about 3 characters per token)"""
+    return sum(len(m["content"]) for m in messages) // 3 + 1
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by sync and async callers
+    - reserve() takes tokens immediately and returns how long the caller must wait before using them
+    - The level may go negative, so bursts are paid back by later callers instead of being rejected
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._level = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+            self._updated = now
+            self._level -= tokens
+            return max(0.0, -self._level / self.rate)
+
+    def adjust(self, tokens: float):
+        """Charge (positive) or refund (negative) tokens after the real cost is known"""
+        with self._lock:
+            self._level = min(self.capacity, self._level - tokens)
+
 
-        response = Generation.call(
-            api_key=os.getenv("DASHSCOPE_API_KEY"),
-            model="qwen-plus",
-            messages=messages,
-            result_format="message",
-            temperature=temperature,
+class PrioritySemaphore:
+    """
+    Concurrency cap whose free slots go to the waiter with the lowest priority number
+    - Works across threads and event loops: sync waiters block on an Event, async waiters await a future
+    - Waiters of equal priority are served first come, first served
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+        self._waiters: List[List[Any]] = []  # heap of [priority, seq, wake, state]
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def _enqueue(self, priority: int, wake: Callable[[], None]) -> Optional[List[Any]]:
+        """Take a slot (returns None) or queue a waiter entry (called with the lock held)"""
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            return None
+        self._seq += 1
+        entry = [priority, self._seq, wake, "waiting"]
+        heapq.heappush(self._waiters, entry)
+        return entry
+
+    def acquire(self, priority: int = 0):
+        event = threading.Event()
+        with self._lock:
+            entry = self._enqueue(priority, event.set)
+        if entry is not None:
+            event.wait()
+
+    async def aacquire(self, priority: int = 0):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def wake():
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_result(None))
+
+        with self._lock:
+            entry = self._enqueue(priority, wake)
+        if entry is None:
+            return
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                granted = entry[3] == "granted"
+                entry[3] = "cancelled"
+            if granted:
+                self.release()
+            raise
+
+    def release(self):
+        with self._lock:
+            while self._waiters:
+                entry = heapq.heappop(self._waiters)
+                if entry[3] == "waiting":
+                    # Hand the slot straight to the next waiter; in_flight is unchanged
+                    entry[3] = "granted"
+                    entry[2]()
+                    return
+            self.in_flight -= 1
+
+
+def role_priority(role: str) -> int:
+    """Observer calls finish a layer, so they go first; constructors start new work, so they go last"""
+    if "observer" in role:
+        return 0
+    if "critic" in role:
+        return 1
+    if "constructor" in role:
+        return 2
+    return 3
+
+
+class RequestScheduler:
+    """
+    Central admission control for model calls
+    - Caps in-flight requests, admitting waiters by role priority
+    - Token buckets for the requests-per-second and tokens-per-minute quotas (None disables)
+    - Retries throttled (429), 5xx and transport errors with exponential backoff and full jitter
+    - Streamed calls are only retried if no token has been emitted yet
+    """
+
+    def __init__(self, max_in_flight: int = ASYNC_POOL_SIZE, requests_per_second: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None, max_retries: int = 4,
+                 backoff_base: float = 1.0, backoff_max: float = 30.0):
+        self.slots = PrioritySemaphore(max_in_flight)
+        self.request_bucket = TokenBucket(requests_per_second) if requests_per_second else None
+        self.token_bucket = TokenBucket(tokens_per_minute / 60.0, tokens_per_minute) if tokens_per_minute else None
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._random = random.Random()
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "retries": 0, "throttled": 0, "failures": 0, "rate_wait": 0.0}
+
+    def _count(self, key: str, amount: float = 1):
+        with self._lock:
+            self._stats[key] += amount
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "in_flight": self.slots.in_flight}
+
+    def _rate_delay(self, estimated_tokens: int) -> float:
+        delay = 0.0
+        if self.request_bucket is not None:
+            delay = max(delay, self.request_bucket.reserve(1))
+        if self.token_bucket is not None:
+            delay = max(delay, self.token_bucket.reserve(estimated_tokens))
+        if delay:
+            self._count("rate_wait", delay)
+        return delay
+
+    def _settle_tokens(self, estimated_tokens: int, completion: Dict[str, Any]):
+        actual = completion.get("prompt_tokens", 0) + completion.get("completion_tokens", 0)
+        if self.token_bucket is not None and actual:
+            self.token_bucket.adjust(actual - estimated_tokens)
+
+    def _backoff(self, attempt: int) -> float:
+        return self._random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _should_retry(self, error: BaseException, attempt: int, emitted: bool, role: str) -> bool:
+        if isinstance(error, LLMCallError) and error.status_code == 429:
+            self._count("throttled")
+        if emitted or attempt >= self.max_retries or not is_retryable_error(error):
+            self._count("failures")
+            return False
+        self._count("retries")
+        print(f"Retrying {role} after error (attempt {attempt + 1}/{self.max_retries}): {error}")
+        return True
+
+    @staticmethod
+    def _tracking(on_token: Optional[Callable[[str], None]], emitted: List[bool]) -> Optional[Callable[[str], None]]:
+        if on_token is None:
+            return None
+
+        def track(delta: str):
+            emitted[0] = True
+            on_token(delta)
+        return track
+
+    def run(self, role: str, messages: List[Dict[str, str]], send: Callable[..., Dict[str, Any]],
+            on_token: Optional[Callable[[str], None]] = None, span: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Call send(on_token) under the concurrency cap, rate limits and retry policy"""
+        estimated = estimate_tokens(messages)
+        emitted = [False]
+        attempt = 0
+        while True:
+            self.slots.acquire(role_priority(role))
+            try:
+                delay = self._rate_delay(estimated)
+                if delay:
+                    time.sleep(delay)
+                self._count("requests")
+                completion = send(self._tracking(on_token, emitted))
+                self._settle_tokens(estimated, completion)
+                return completion
+            except Exception as e:
+                if not self._should_retry(e, attempt, emitted[0], role):
+                    raise
+            finally:
+                self.slots.release()
+            attempt += 1
+            if span is not None:
+                span["retries"] = attempt
+            time.sleep(self._backoff(attempt))
+
+    async def arun(self, role: str, messages: List[Dict[str, str]], send: Callable[..., Any],
+                   on_token: Optional[Callable[[str], None]] = None,
+                   span: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Async run(): send(on_token) returns an awaitable"""
+        estimated = estimate_tokens(messages)
+        emitted = [False]
+        attempt = 0
+        while True:
+            await self.slots.aacquire(role_priority(role))
+            try:
+                delay = self._rate_delay(estimated)
+                if delay:
+                    await asyncio.sleep(delay)
+                self._count("requests")
+                completion = await send(self._tracking(on_token, emitted))
+                self._settle_tokens(estimated, completion)
+                return completion
+            except Exception as e:
+                if not self._should_retry(e, attempt, emitted[0], role):
+                    raise
+            finally:
+                self.slots.release()
+            attempt += 1
+            if span is not None:
+                span["retries"] = attempt
+            await asyncio.sleep(self._backoff(attempt))
+
+
+def _optional_float_env(name: str) -> Optional[float]:
+    value = os.getenv(name)
+    return float(value) if value else None
+
+
+def _request_scheduler_from_env() -> RequestScheduler:
+    """RAMTN_MAX_IN_FLIGHT, RAMTN_RATE_QPS, RAMTN_RATE_TPM and RAMTN_MAX_RETRIES configure the scheduler"""
+    return RequestScheduler(
+        max_in_flight=int(os.getenv("RAMTN_MAX_IN_FLIGHT", str(ASYNC_POOL_SIZE))),
+        requests_per_second=_optional_float_env("RAMTN_RATE_QPS"),
+        tokens_per_minute=_optional_float_env("RAMTN_RATE_TPM"),
+        max_retries=int(os.getenv("RAMTN_MAX_RETRIES", "4"))
+    )
+
+
+# Scheduler shared by every call_qwen / acall_qwen in the process
+request_scheduler: RequestScheduler = _request_scheduler_from_env()
+
+
+def configure_request_scheduler(scheduler: RequestScheduler):
+    """Install the scheduler used by call_qwen / acall_qwen"""
+    global request_scheduler
+    request_scheduler = scheduler
+
+
+# ===================== LLM Call Entry Points =====================
+def _cache_lookup(prompt: str, role: str, temperature: float, model: str,
+                  json_mode: bool = False) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Return (cache key, cached response) for a call, checking the active run's call journal first
+    Both are None when neither caching nor checkpointing is enabled
+    """
+    cache = response_cache
+    journal = _call_journal.get()
+    if cache is None and journal is None:
+        return None, None
+    key = ResponseCache.make_key(role, prompt, temperature, model, json_mode)
+    if journal is not None:
+        replayed = journal.load_call(_journal_key(key))
+        if replayed is not None:
+            print(f"Checkpoint replay - {role}: {replayed[:80]}...")
+            return key, replayed
+    cached = cache.get(key) if cache is not None else None
+    if cached is not None:
+        print(f"Cache hit - {role}: {cached[:80]}...")
+    return key, cached
+
+
+def _cache_store(key: Optional[str], content: str):
+    if key is None:
+        return
+    cache = response_cache
+    if cache is not None:
+        cache.set(key, content)
+    journal = _call_journal.get()
+    if journal is not None:
+        journal.save_call(_journal_key(key), content)
+
+
+def _timed_on_token(span: Dict[str, Any],
+                    on_token: Optional[Callable[[str], None]]) -> Optional[Callable[[str], None]]:
+    """Wrap a streaming callback so the span records time to first token"""
+    if on_token is None:
+        return None
+
+    def timed(delta: str):
+        if span["first_token_latency"] is None:
+            span["first_token_latency"] = time.perf_counter() - span["_start"]
+        on_token(delta)
+    return timed
+
+
+def _record_completion(span: Dict[str, Any], completion: Dict[str, Any], role: str) -> str:
+    """Copy backend usage into the span and log the response preview"""
+    span["prompt_tokens"] = completion["prompt_tokens"]
+    span["cached_tokens"] = completion.get("cached_tokens", 0)
+    span["completion_tokens"] = completion["completion_tokens"]
+    span["streamed"] = completion["streamed"]
+    content = completion["content"]
+    print(f"API Response - {role}: {content[:80]}...")
+    return content
+
+
+def call_qwen(prompt: str, role: str = "default", temperature: float = 0.3,
+              on_token: Optional[Callable[[str], None]] = None, json_mode: bool = False,
+              system: Optional[str] = None) -> str:
+    """
+    Call qwen API - extended to support dual mode roles
+    With on_token, the response is streamed incrementally and each delta is passed to on_token
+    With json_mode, the model is asked for a JSON object (structured output)
+    With system, that text replaces the role's default system message (stable prefixes are cached by the provider)
+    """
+    backend = active_llm_backend()
+    span = _start_span(role, temperature, backend.model)
+    cache_key, cached = _cache_lookup(prompt if system is None else f"{system}\n\n{prompt}",
+                                      role, temperature, backend.model, json_mode)
+    if cached is not None:
+        span["cache_hit"] = True
+        _end_span(span)
+        if on_token is not None:
+            on_token(cached)
+        return cached
+
+    messages = _build_messages(prompt, role, system)
+    on_token = _timed_on_token(span, on_token)
+
+    try:
+        print(f"Calling API - {role}: {prompt[:80]}...")
+        completion = request_scheduler.run(
+            role, messages,
+            lambda tracked_on_token: backend.generate(role, messages, temperature, tracked_on_token, json_mode),
+            on_token, span
         )
+        content = _record_completion(span, completion, role)
+        _cache_store(cache_key, content)
 
-        if response.status_code == 200:
-            content = response.output.choices[0].message.content
-            content = content.encode('utf-8').decode('utf-8', errors='ignore')
-            print(f"API Response - {role}: {content[:80]}...")
-            return content
-        else:
-            raise Exception(f"API call failed: {response.message}")
+    except Exception as e:
+        print(f"API call exception - {role}: {str(e)}")
+        _end_span(span, error=e)
+        raise e
+
+    _end_span(span)
+    return content
+
+
+class AsyncSessionPool:
+    """
+    Reusable aiohttp connection pool for asynchronous qwen calls
+    - One ClientSession per event loop, shared by every acall_qwen running on it
+    - Bounded connector so many concurrent analyses reuse the same TCP/TLS connections
+    """
+
+    def __init__(self, limit: int = ASYNC_POOL_SIZE):
+        self.limit = limit
+        self._sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = \
+            weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """Get (or lazily create) the session bound to the running event loop"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            session = self._sessions.get(loop)
+            if session is None or session.closed:
+                connector = aiohttp.TCPConnector(limit=self.limit)
+                session = aiohttp.ClientSession(connector=connector, trust_env=True)
+                self._sessions[loop] = session
+            return session
+
+    async def close(self):
+        """Close the session bound to the running event loop"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            session = self._sessions.pop(loop, None)
+        if session is not None and not session.closed:
+            await session.close()
+
+
+# Global connection pool for asynchronous calls
+async_session_pool = AsyncSessionPool()
+
+
+def _run_sync(coro):
+    """
+    Run a coroutine from synchronous code, closing the pooled session of its event loop
+    - Inside a running event loop (Jupyter, async web handlers) asyncio.run() would raise, so the
+      coroutine gets its own loop in a worker thread, with the caller's context variables
+    """
+    async def runner():
+        try:
+            return await coro
+        finally:
+            await async_session_pool.close()
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(runner())
+
+    context = contextvars.copy_context()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(context.run, asyncio.run, runner()).result()
+
+
+async def acall_qwen(prompt: str, role: str = "default", temperature: float = 0.3,
+                     on_token: Optional[Callable[[str], None]] = None, json_mode: bool = False,
+                     system: Optional[str] = None) -> str:
+    """Asynchronous call_qwen - awaits the backend round trip without blocking the event loop"""
+    backend = active_llm_backend()
+    span = _start_span(role, temperature, backend.model)
+    cache_key, cached = _cache_lookup(prompt if system is None else f"{system}\n\n{prompt}",
+                                      role, temperature, backend.model, json_mode)
+    if cached is not None:
+        span["cache_hit"] = True
+        _end_span(span)
+        if on_token is not None:
+            on_token(cached)
+        return cached
+
+    messages = _build_messages(prompt, role, system)
+    on_token = _timed_on_token(span, on_token)
+
+    try:
+        print(f"Calling API (async) - {role}: {prompt[:80]}...")
+        completion = await request_scheduler.arun(
+            role, messages,
+            lambda tracked_on_token: backend.agenerate(role, messages, temperature, tracked_on_token, json_mode),
+            on_token, span
+        )
+        content = _record_completion(span, completion, role)
+        _cache_store(cache_key, content)
 
     except Exception as e:
         print(f"API call exception - {role}: {str(e)}")
+        _end_span(span, error=e)
         raise e
 
+    _end_span(span)
+    return content
+
+
+# ===================== LLM Response Cache =====================
+class ResponseCache(ABC):
+    """
+    Content-addressed cache for LLM responses
+    - Keys hash (system message for role, prompt, temperature, model)
+    - Subclasses provide storage; hit/miss counters are kept here
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    @staticmethod
+    def make_key(role: str, prompt: str, temperature: float, model: str, json_mode: bool = False) -> str:
+        """Build cache key from everything that determines the response (json_mode changes its format)"""
+        system_content = SYSTEM_MESSAGES.get(role, SYSTEM_MESSAGES["default"])
+        payload = json.dumps([system_content, prompt, float(temperature), model, bool(json_mode)],
+                             ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Look up a response, counting hits and misses"""
+        value = self._get(key)
+        with self._stats_lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: str):
+        self._set(key, value)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total > 0 else 0.0,
+            "size": len(self)
+        }
+
+    @abstractmethod
+    def _get(self, key: str) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    def _set(self, key: str, value: str):
+        ...
+
+    @abstractmethod
+    def clear(self):
+        ...
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+
+class MemoryResponseCache(ResponseCache):
+    """In-memory LRU response cache with optional TTL (seconds)"""
+
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = None):
+        super().__init__()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, created = entry
+            if self.ttl is not None and time.time() - created > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _set(self, key: str, value: str):
+        with self._lock:
+            self._entries[key] = (value, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteResponseCache(ResponseCache):
+    """On-disk response cache (SQLite) with TTL and least-recently-used size bound"""
+
+    def __init__(self, path: str, max_entries: int = 100000, ttl: Optional[float] = None):
+        super().__init__()
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed)")
+
+    def _get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT value, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value, created = row
+            if self.ttl is not None and now - created > self.ttl:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            return value
+
+    def _set(self, key: str, value: str):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, value, now, now)
+            )
+            overflow = self._count() - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses ORDER BY accessed ASC LIMIT ?)", (overflow,)
+                )
+
+    def _count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count()
+
+
+class TieredResponseCache(ResponseCache):
+    """Memory LRU in front of a persistent cache; disk hits are promoted to memory"""
+
+    def __init__(self, memory: MemoryResponseCache, disk: ResponseCache):
+        super().__init__()
+        self.memory = memory
+        self.disk = disk
+
+    def _get(self, key: str) -> Optional[str]:
+        value = self.memory._get(key)
+        if value is None:
+            value = self.disk._get(key)
+            if value is not None:
+                self.memory._set(key, value)
+        return value
+
+    def _set(self, key: str, value: str):
+        self.memory._set(key, value)
+        self.disk._set(key, value)
+
+    def clear(self):
+        self.memory.clear()
+        self.disk.clear()
+
+    def __len__(self) -> int:
+        return len(self.disk)
+
+
+def _response_cache_from_env() -> Optional[ResponseCache]:
+    """
+    Build cache from RAMTN_RESPONSE_CACHE:
+    unset -> no cache, "memory" -> in-memory LRU, anything else -> SQLite path behind a memory LRU
+    """
+    setting = os.getenv("RAMTN_RESPONSE_CACHE", "")
+    if not setting:
+        return None
+    ttl = float(os.getenv("RAMTN_RESPONSE_CACHE_TTL", "0")) or None
+    if setting == "memory":
+        return MemoryResponseCache(ttl=ttl)
+    return TieredResponseCache(MemoryResponseCache(ttl=ttl), SQLiteResponseCache(setting, ttl=ttl))
+
+
+# Global response cache used by call_qwen / acall_qwen (None disables caching)
+response_cache: Optional[ResponseCache] = _response_cache_from_env()
+
+
+def configure_response_cache(cache: Optional[ResponseCache]):
+    """Install (or with None, disable) the response cache used by call_qwen"""
+    global response_cache
+    response_cache = cache
+
+
+# ===================== Batch Analysis =====================
+def read_batch_questions(path: str) -> List[Dict[str, Any]]:
+    """Read implantation questions from JSONL: {"id": optional, "question": required} per line"""
+    questions = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_num, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            item = json.loads(line)
+            if not item.get("question"):
+                raise ValueError(f"{path}:{line_num}: missing 'question'")
+            item["id"] = str(item.get("id", line_num))
+            questions.append(item)
+    return questions
+
+
+def completed_batch_ids(output_path: str) -> set:
+    """Ids already answered successfully in an output file (the output doubles as the checkpoint)"""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # Partially written last line of an interrupted run
+            if "error" not in record:
+                done.add(str(record.get("id")))
+    return done
+
+
+def run_batch(input_path: str, output_path: str, extraction_results: Dict[str, Any],
+              workers: int = 4, engine_kwargs: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
+    """
+    Answer many implantation questions against one extracted framework
+    - Questions fan out over a bounded thread pool, one isolated engine per question
+    - Each result is appended to the output JSONL as soon as it finishes
+    - Re-running with the same output skips questions that already succeeded (failed ones are retried)
+    """
+    engine_kwargs = engine_kwargs or {}
+    questions = read_batch_questions(input_path)
+    done = completed_batch_ids(output_path)
+    pending = [item for item in questions if item["id"] not in done]
+    stats = {"total": len(questions), "skipped": len(questions) - len(pending), "completed": 0, "failed": 0}
+    print(f"Batch: {stats['total']} questions, {stats['skipped']} already completed, {len(pending)} to run",
+          file=sys.stderr)
+
+    def analyze_one(item: Dict[str, Any]) -> Dict[str, Any]:
+        engine = StrategicCognitiveEngine(framework=StrategicDecisionFramework(), **engine_kwargs)
+        engine.set_extraction_results(extraction_results)
+        result = engine.implant_strategy(item["question"])
+        best_result = result["best_result"]
+        return {
+            "id": item["id"],
+            "question": item["question"],
+            "framework_id": extraction_results.get("framework_id"),
+            "final_confidence": best_result["final_confidence"],
+            "meets_threshold": best_result["final_confidence"] >= engine.confidence_threshold,
+            "final_triplets": best_result["final_triplets"],
+            "final_output": result["final_output"],
+            "usage": result["usage"]["totals"]
+        }
+
+    with open(output_path, "a", encoding="utf-8") as out, ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(analyze_one, item): item for item in pending}
+        for future in as_completed(futures):
+            item = futures[future]
+            try:
+                record = future.result()
+                stats["completed"] += 1
+            except Exception as e:
+                record = {"id": item["id"], "question": item["question"], "error": str(e)}
+                stats["failed"] += 1
+
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            status = "error" if "error" in record else f"confidence {record['final_confidence']:.2f}"
+            print(f"[{stats['completed'] + stats['failed']}/{len(pending)}] {item['id']}: {status}", file=sys.stderr)
+
+    return stats
+
+
+# ===================== Job Queue =====================
+DEFAULT_JOB_QUEUE_PATH = os.getenv("RAMTN_JOB_DB", os.path.join(os.path.expanduser("~"), ".ramtn", "jobs.sqlite"))
+
+# Seconds between a worker's lease renewals of the job it runs; requeue_stale's timeout should be a few of these
+JOB_HEARTBEAT_INTERVAL = 30.0
+
+
+class JobQueue:
+    """
+    Persistent SQLite job queue shared by a web front end and worker processes
+    - submit() only inserts a row, so accepting a request takes milliseconds
+    - Workers claim queued jobs atomically (oldest first), record progress events and store the result
+    - Workers renew the lease on a running job with heartbeat(); jobs whose lease lapsed are requeued by requeue_stale()
+    - A job carries the API key it was submitted with until it finishes; get() never returns it
+    """
+
+    STATUSES = ("queued", "running", "completed", "failed")
+
+    def __init__(self, path: str = DEFAULT_JOB_QUEUE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        # Autocommit; claim() opens its own write transaction
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30, isolation_level=None)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "job_id TEXT PRIMARY KEY, kind TEXT NOT NULL, payload TEXT NOT NULL, status TEXT NOT NULL, "
+                "events TEXT NOT NULL DEFAULT '[]', result TEXT, error TEXT, worker TEXT, "
+                "attempts INTEGER NOT NULL DEFAULT 0, created REAL NOT NULL, updated REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created)")
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            if "api_key" not in columns:
+                self._conn.execute("ALTER TABLE jobs ADD COLUMN api_key TEXT")
+
+    def submit(self, kind: str, payload: Dict[str, Any], api_key: Optional[str] = None) -> str:
+        """Queue a job (run with api_key, or the worker's own key without one); returns its id"""
+        job_id = uuid.uuid4().hex[:16]
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (job_id, kind, payload, status, api_key, created, updated) "
+                "VALUES (?, ?, ?, 'queued', ?, ?, ?)",
+                (job_id, kind, json.dumps(payload, ensure_ascii=False), api_key, now, now)
+            )
+        return job_id
+
+    def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """Mark the oldest queued job as running for this worker and return it; None when the queue is empty"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT job_id, kind, payload, api_key FROM jobs WHERE status = 'queued' ORDER BY created LIMIT 1"
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = 'running', worker = ?, attempts = attempts + 1, updated = ? "
+                        "WHERE job_id = ?", (worker_id, time.time(), row[0])
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        return {"job_id": row[0], "kind": row[1], "payload": json.loads(row[2]), "api_key": row[3]}
+
+    def set_events(self, job_id: str, events: List[Dict[str, Any]]):
+        """Replace a running job's progress events (also serves as its heartbeat)"""
+        with self._lock:
+            self._conn.execute("UPDATE jobs SET events = ?, updated = ? WHERE job_id = ?",
+                               (json.dumps(events, ensure_ascii=False, default=str), time.time(), job_id))
+
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        """Renew worker_id's lease on a running job; False once the job is no longer held by this worker"""
+        with self._lock:
+            return self._conn.execute(
+                "UPDATE jobs SET updated = ? WHERE job_id = ? AND worker = ? AND status = 'running'",
+                (time.time(), job_id, worker_id)
+            ).rowcount == 1
+
+    def complete(self, job_id: str, result: Dict[str, Any]):
+        with self._lock:
+            self._conn.execute("UPDATE jobs SET status = 'completed', result = ?, api_key = NULL, updated = ? "
+                               "WHERE job_id = ?",
+                               (json.dumps(result, ensure_ascii=False, default=str), time.time(), job_id))
+
+    def fail(self, job_id: str, error: str):
+        with self._lock:
+            self._conn.execute("UPDATE jobs SET status = 'failed', error = ?, api_key = NULL, updated = ? "
+                               "WHERE job_id = ?", (error, time.time(), job_id))
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT job_id, kind, status, events, result, error, worker, attempts, created, updated "
+                "FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(zip(["job_id", "kind", "status", "events", "result", "error", "worker", "attempts",
+                        "created", "updated"], row))
+        job["events"] = json.loads(job["events"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def position(self, job_id: str) -> int:
+        """Number of queued jobs ahead of this one (0 once it is running)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = 'queued' AND created < "
+                "(SELECT created FROM jobs WHERE job_id = ? AND status = 'queued')", (job_id,)
+            ).fetchone()
+        return row[0]
+
+    def requeue_stale(self, timeout: float = 4 * JOB_HEARTBEAT_INTERVAL, max_attempts: int = 3) -> int:
+        """Requeue running jobs without a heartbeat for timeout seconds (crashed worker); fail after max_attempts"""
+        cutoff = time.time() - timeout
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'failed', error = 'Worker stopped responding', api_key = NULL, updated = ? "
+                "WHERE status = 'running' AND updated < ? AND attempts >= ?", (time.time(), cutoff, max_attempts)
+            )
+            return self._conn.execute(
+                "UPDATE jobs SET status = 'queued', worker = NULL, updated = ? WHERE status = 'running' AND updated < ?",
+                (time.time(), cutoff)
+            ).rowcount
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        return {status: counts.get(status, 0) for status in self.STATUSES}
+
+
+def run_analysis_job(payload: Dict[str, Any], framework_store: FrameworkStore,
+                     engine_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Job handler: extract (or load) the expert case's framework, implant the question, build the report"""
+    engine = StrategicCognitiveEngine(framework=StrategicDecisionFramework(), framework_store=framework_store,
+                                      **engine_kwargs)
+    extraction_results = engine.extract_or_load_framework(payload["expert_case"])
+    result = engine.implant_strategy(payload["question"])
+    return {
+        "framework_id": extraction_results.get("framework_id"),
+        "final_confidence": result["best_result"]["final_confidence"],
+        "report": engine.get_comprehensive_report(),
+        "usage": result["usage"]["totals"]
+    }
+
+
+# Job kind -> handler(payload, framework_store, engine_kwargs)
+JOB_HANDLERS: Dict[str, Callable[[Dict[str, Any], FrameworkStore, Dict[str, Any]], Dict[str, Any]]] = {
+    "analysis": run_analysis_job
+}
+
+
+def _renew_job_lease(jobs: JobQueue, job_id: str, worker_id: str, interval: float, stop: threading.Event):
+    """Heartbeat thread of a running job: keeps a slow but live job from being requeued and billed twice"""
+    while not stop.wait(interval):
+        if not jobs.heartbeat(job_id, worker_id):
+            print(f"Worker {worker_id}: lost the lease on job {job_id}", file=sys.stderr)
+            return
+
+
+def job_worker(queue_path: str = DEFAULT_JOB_QUEUE_PATH, framework_dir: str = DEFAULT_FRAMEWORK_DIR,
+               engine_kwargs: Optional[Dict[str, Any]] = None, poll_interval: float = 0.5,
+               max_jobs: Optional[int] = None, verbose: bool = False, stop_event=None,
+               heartbeat_interval: float = JOB_HEARTBEAT_INTERVAL) -> int:
+    """
+    Worker loop: claim jobs, run their handler and store the outcome; returns the number of jobs run
+    - Progress events are written to the job at most every half second; constructor tokens are merged
+      into one event per layer so the web page can show the text as it is generated
+    - A heartbeat thread renews the job's lease every heartbeat_interval seconds while the handler runs
+    - Stops after max_jobs jobs or once stop_event is set (runs forever otherwise)
+    """
+    jobs = JobQueue(queue_path)
+    framework_store = FrameworkStore(framework_dir)
+    engine_kwargs = engine_kwargs or {}
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    processed = 0
+
+    while max_jobs is None or processed < max_jobs:
+        if stop_event is not None and stop_event.is_set():
+            break
+        job = jobs.claim(worker_id)
+        if job is None:
+            time.sleep(poll_interval)
+            continue
+
+        events = []
+        last_write = [0.0]
+
+        def record(event: Dict[str, Any]):
+            if event["type"] == "constructor_token" and events and events[-1]["type"] == "constructor_token":
+                events[-1]["token"] += event["token"]
+            else:
+                events.append(event)
+            if event["time"] - last_write[0] >= 0.5:
+                last_write[0] = event["time"]
+                jobs.set_events(job["job_id"], events)
+
+        print(f"Worker {worker_id}: running job {job['job_id']}", file=sys.stderr)
+        stop_heartbeat = threading.Event()
+        threading.Thread(target=_renew_job_lease, daemon=True,
+                         args=(jobs, job["job_id"], worker_id, heartbeat_interval, stop_heartbeat)).start()
+        try:
+            handler = JOB_HANDLERS[job["kind"]]
+            with open(os.devnull, "w") as devnull, redirect_stdout(sys.stdout if verbose else devnull), \
+                    event_listener(record), use_llm_backend(backend_for_api_key(job["api_key"])):
+                result = handler(job["payload"], framework_store, engine_kwargs)
+            jobs.set_events(job["job_id"], events)
+            jobs.complete(job["job_id"], result)
+        except Exception as e:
+            jobs.set_events(job["job_id"], events)
+            jobs.fail(job["job_id"], f"{type(e).__name__}: {e}")
+            print(f"Worker {worker_id}: job {job['job_id']} failed: {e}", file=sys.stderr)
+        finally:
+            stop_heartbeat.set()
+        processed += 1
+
+    return processed
+
+
+def start_job_workers(processes: int, queue_path: str = DEFAULT_JOB_QUEUE_PATH,
+                      framework_dir: str = DEFAULT_FRAMEWORK_DIR,
+                      engine_kwargs: Optional[Dict[str, Any]] = None) -> List[multiprocessing.Process]:
+    """Start worker processes (spawned, so they share no threads or state with the caller)"""
+    context = multiprocessing.get_context("spawn")
+    workers = []
+    for _ in range(processes):
+        worker = context.Process(target=job_worker, args=(queue_path, framework_dir, engine_kwargs), daemon=True)
+        worker.start()
+        workers.append(worker)
+    return workers
+
+
+# ===================== Command Line Interface =====================
+def cli_main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry: `python RAMTN.py batch|resume|worker ...` (no arguments runs the demo below)"""
+    parser = argparse.ArgumentParser(prog="ramtn", description="Recursive Adversarial Meta-Thinking Network")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    batch = subparsers.add_parser("batch", help="Run many implantation questions against one extracted framework")
+    source = batch.add_mutually_exclusive_group(required=True)
+    source.add_argument("--framework-id", help="Id of a stored framework to load")
+    source.add_argument("--extraction-file", help="Text file with the expert case; extracted once (or loaded if stored)")
+    batch.add_argument("--input", required=True, help="JSONL file of {\"id\", \"question\"} objects")
+    batch.add_argument("--output", required=True, help="JSONL results file (appended; also the resume checkpoint)")
+    batch.add_argument("--workers", type=int, default=4, help="Questions analyzed in parallel")
+    batch.add_argument("--framework-dir", default=DEFAULT_FRAMEWORK_DIR, help="Framework store directory")
+    batch.add_argument("--confidence-threshold", type=float, default=0.75)
+    batch.add_argument("--max-units", type=int, default=2)
+    batch.add_argument("--speculative-units", type=int, default=0)
+    batch.add_argument("--verbose", action="store_true", help="Keep per-call engine logs on stdout")
+
+    resume = subparsers.add_parser("resume", help="Resume interrupted checkpointed runs")
+    target = resume.add_mutually_exclusive_group(required=True)
+    target.add_argument("--run-id", help="Id of the run to resume")
+    target.add_argument("--all", action="store_true", help="Resume every run that did not complete")
+    resume.add_argument("--checkpoint-db", default=DEFAULT_CHECKPOINT_PATH, help="Checkpoint database path")
+    resume.add_argument("--framework-dir", default=DEFAULT_FRAMEWORK_DIR, help="Framework store directory")
+    resume.add_argument("--confidence-threshold", type=float, default=0.75)
+    resume.add_argument("--max-units", type=int, default=2)
+    resume.add_argument("--verbose", action="store_true", help="Keep per-call engine logs on stdout")
+
+    worker = subparsers.add_parser("worker", help="Run job queue workers (jobs are submitted by the web interface)")
+    worker.add_argument("--processes", type=int, default=2, help="Worker processes")
+    worker.add_argument("--jobs-db", default=DEFAULT_JOB_QUEUE_PATH, help="Job queue database path")
+    worker.add_argument("--framework-dir", default=DEFAULT_FRAMEWORK_DIR, help="Framework store directory")
+    worker.add_argument("--confidence-threshold", type=float, default=0.75)
+    worker.add_argument("--max-units", type=int, default=2)
+    worker.add_argument("--stale-timeout", type=float, default=4 * JOB_HEARTBEAT_INTERVAL,
+                        help=f"Seconds without a heartbeat (sent every {JOB_HEARTBEAT_INTERVAL:.0f}s) "
+                             f"after which a running job is requeued")
+
+    args = parser.parse_args(argv)
+
+    # Workers run each job with the key it was submitted with
+    if args.command != "worker" and isinstance(llm_backend, DashScopeBackend) and not os.getenv("DASHSCOPE_API_KEY"):
+        print("Error: DASHSCOPE_API_KEY environment variable not set", file=sys.stderr)
+        return 1
+
+    if args.command == "resume":
+        return _cli_resume(args)
+    if args.command == "worker":
+        return _cli_worker(args)
+    return _cli_batch(args)
+
+
+def _cli_batch(args: argparse.Namespace) -> int:
+    engine_kwargs = {
+        "confidence_threshold": args.confidence_threshold,
+        "max_units": args.max_units,
+        "speculative_units": args.speculative_units
+    }
+    store = FrameworkStore(args.framework_dir)
+
+    with open(os.devnull, "w") as devnull, redirect_stdout(sys.stdout if args.verbose else devnull):
+        engine = StrategicCognitiveEngine(framework=StrategicDecisionFramework(), framework_store=store,
+                                          **engine_kwargs)
+        if args.framework_id:
+            extraction_results = engine.load_framework(args.framework_id)
+        else:
+            with open(args.extraction_file, "r", encoding="utf-8") as f:
+                extraction_results = engine.extract_or_load_framework(f.read())
+        print(f"Using framework {extraction_results.get('framework_id')}", file=sys.stderr)
+
+        stats = run_batch(args.input, args.output, extraction_results, args.workers, engine_kwargs)
+
+    print(f"Batch finished: {json.dumps(stats)}", file=sys.stderr)
+    return 0 if stats["failed"] == 0 else 2
+
+
+def _cli_resume(args: argparse.Namespace) -> int:
+    checkpoint_store = CheckpointStore(args.checkpoint_db)
+    framework_store = FrameworkStore(args.framework_dir)
+    run_ids = [args.run_id] if args.run_id else [run["run_id"] for run in checkpoint_store.list_runs("running")]
+
+    failed = 0
+    for run_id in run_ids:
+        # Each run gets a fresh engine: an implantation run reloads its own framework
+        engine = StrategicCognitiveEngine(confidence_threshold=args.confidence_threshold, max_units=args.max_units,
+                                          framework=StrategicDecisionFramework(), framework_store=framework_store,
+                                          checkpoint_store=checkpoint_store)
+        try:
+            with open(os.devnull, "w") as devnull, redirect_stdout(sys.stdout if args.verbose else devnull):
+                result = engine.resume_run(run_id)
+            print(f"Run {run_id} completed: confidence {result['best_result']['final_confidence']:.2f}",
+                  file=sys.stderr)
+        except Exception as e:
+            failed += 1
+            print(f"Run {run_id} failed: {e}", file=sys.stderr)
+
+    print(f"Resumed {len(run_ids) - failed}/{len(run_ids)} runs", file=sys.stderr)
+    return 0 if failed == 0 else 2
+
+
+def _cli_worker(args: argparse.Namespace) -> int:
+    jobs = JobQueue(args.jobs_db)
+    engine_kwargs = {"confidence_threshold": args.confidence_threshold, "max_units": args.max_units}
+    workers = start_job_workers(args.processes, args.jobs_db, args.framework_dir, engine_kwargs)
+    print(f"Started {len(workers)} workers on {args.jobs_db}", file=sys.stderr)
+    # Exit normally on SIGTERM so the (daemonic) workers are stopped with the supervisor
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    try:
+        while any(worker.is_alive() for worker in workers):
+            requeued = jobs.requeue_stale(args.stale_timeout)
+            if requeued:
+                print(f"Requeued {requeued} stalled jobs", file=sys.stderr)
+            time.sleep(min(args.stale_timeout / 4, 30.0))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
 
 # ===================== Testing =====================
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(cli_main(sys.argv[1:]))
+
     try:
         if not os.getenv("DASHSCOPE_API_KEY"):
             raise Exception("Error: DASHSCOPE_API_KEY environment variable not set")
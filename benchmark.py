@@ -0,0 +1,358 @@
+"""
+RAMTN benchmark harness
+- Runs parsing, framework extraction, reporting and the full dual-mode pipeline offline
+- The pipeline uses FakeLLMBackend, so results are deterministic and need no API key
+- Compare against a saved baseline to catch performance regressions
+
+Usage:
+    python benchmark.py                          # run all cases
+    python benchmark.py -k parse --rounds 50     # cases whose name contains "parse"
+    python benchmark.py --json baseline.json     # save results
+    python benchmark.py --compare baseline.json  # flag cases slower than the baseline
+"""
+
+import sys
+import io
+import shutil
+import json
+import time
+import asyncio
+import tempfile
+import argparse
+import statistics
+from contextlib import redirect_stdout
+from typing import Dict, List, Any, Callable
+
+import RAMTN
+
+
+# ===================== Benchmark Cases =====================
+BENCHMARKS: Dict[str, Callable[[], Callable[[], Any]]] = {}
+# Cleanup callbacks registered by the running case's setup, called when the case finishes
+_CLEANUPS: List[Callable[[], None]] = []
+
+
+def benchmark(name: str):
+    """Register a case; the decorated function does the setup and returns the callable to time"""
+    def register(setup: Callable[[], Callable[[], Any]]):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def temp_dir() -> str:
+    """Temporary directory removed when the current case finishes"""
+    directory = tempfile.mkdtemp(prefix="ramtn-bench-")
+    _CLEANUPS.append(lambda: shutil.rmtree(directory, ignore_errors=True))
+    return directory
+
+
+def sample_constructor_output(items_per_section: int = 4) -> str:
+    """Constructor-style output produced by the fake backend, repeated to the requested size"""
+    backend = RAMTN.FakeLLMBackend()
+    text = backend.respond("strategic_constructor", [{"role": "user", "content": "benchmark"}], 0.1)
+    repeat = max(1, items_per_section // 4)
+    return "\n".join([text] * repeat)
+
+
+EXPERT_CASE = ("Buffett acquired See's Candies for $25 million in 1972 despite a book value of $8 million, "
+               "valuing brand loyalty, pricing power and capable management over cheap assets.")
+USER_QUESTION = "I have 500,000 in savings and I'm torn between real estate and index funds."
+
+
+def _offline_engine(latency: float = 0.0, **engine_kwargs) -> RAMTN.StrategicCognitiveEngine:
+    RAMTN.configure_llm_backend(RAMTN.FakeLLMBackend(latency=latency))
+    RAMTN.configure_response_cache(None)
+    return RAMTN.StrategicCognitiveEngine(framework=RAMTN.StrategicDecisionFramework(), **engine_kwargs)
+
+
+@benchmark("parse_triplets")
+def bench_parse_triplets():
+    text = sample_constructor_output()
+    return lambda: RAMTN.ConfidenceTripletExtractor.extract_triplets(text)
+
+
+@benchmark("parse_triplets_large")
+def bench_parse_triplets_large():
+    text = sample_constructor_output(items_per_section=200)
+    return lambda: RAMTN.ConfidenceTripletExtractor.extract_triplets(text)
+
+
+@benchmark("parse_triplets_huge")
+def bench_parse_triplets_huge():
+    text = sample_constructor_output(items_per_section=2000)
+    return lambda: RAMTN.ConfidenceTripletExtractor.extract_triplets(text)
+
+
+@benchmark("parse_triplets_bare_headers")
+def bench_parse_triplets_bare_headers():
+    # "I am confident: ..." headers without 【】, which each used to trigger a scan to the end of the text
+    block = ("I am confident: durable brands earn pricing power\n"
+             "I speculate: management quality drives long term returns\n"
+             "I don't know: behaviour under high inflation\n")
+    text = block * 500
+    return lambda: RAMTN.ConfidenceTripletExtractor.extract_triplets(text)
+
+
+def sample_observer_output() -> str:
+    backend = RAMTN.FakeLLMBackend()
+    return backend.respond("strategic_observer_extraction", [{"role": "user", "content": "benchmark"}], 0.1)
+
+
+@benchmark("observer_parse")
+def bench_observer_parse():
+    text = "```json\n" + sample_observer_output() + "\n```"
+    return lambda: RAMTN.StrategicThinkingLayer._parse_observer_evaluation(text)
+
+
+@benchmark("observer_parse_truncated")
+def bench_observer_parse_truncated():
+    text = sample_observer_output()
+    truncated = text[:int(len(text) * 0.7)]
+    return lambda: RAMTN.StrategicThinkingLayer._parse_observer_evaluation(truncated)
+
+
+@benchmark("constructor_request")
+def bench_constructor_request():
+    framework = RAMTN.StrategicDecisionFramework()
+
+    def build():
+        role = "strategic_constructor_implantation"
+        return (RAMTN.create_strategic_system_message(role, True, "implantation", framework),
+                RAMTN.create_strategic_prompt(USER_QUESTION, True, mode="implantation", framework=framework))
+    return build
+
+
+@benchmark("carry_forward_budget")
+def bench_carry_forward_budget():
+    budgeter = RAMTN.TokenBudgeter()
+    response = sample_constructor_output(items_per_section=40)
+    critique = "\n".join(f"{marker} Point {i}: evidence for this claim is thin"
+                         for i, marker in enumerate(["🟢", "🟡", "🔴"] * 5))
+    return lambda: budgeter.carry_forward("strategic_constructor_extraction", response, critique)
+
+
+@benchmark("layer_framework_overhead")
+def bench_layer_framework_overhead():
+    # Framework work a layer does besides model calls: fit pre-analysis, per-role guidance, system prefix
+    framework = RAMTN.StrategicDecisionFramework()
+
+    def run():
+        layer = RAMTN.StrategicThinkingLayer(1, USER_QUESTION, mode="implantation", framework=framework)
+        layer._pre_analysis_with_frameworks()
+        framework.get_framework_guidance("three_level_classification", USER_QUESTION)
+        framework.get_framework_guidance("dynamic_stability", USER_QUESTION)
+        return framework.get_comprehensive_guidance(USER_QUESTION, mode="implantation")
+    return run
+
+
+@benchmark("framework_registry_open")
+def bench_framework_registry_open():
+    # Open a directory of 300 stored frameworks and use one of them; only the index and that file are read
+    directory = temp_dir()
+    for i in range(300):
+        RAMTN.FrameworkRegistry().save(directory, f"pcf{i:03d}", {
+            "framework_name": f"Strategic System {i}",
+            "key_insights": [f"Insight {j} of system {i}" for j in range(20)],
+            "decision_patterns": [f"Pattern {j}" for j in range(20)]
+        }, kind=RAMTN.FrameworkRegistry.EXTRACTED)
+
+    def run():
+        framework = RAMTN.StrategicDecisionFramework(RAMTN.FrameworkRegistry())
+        framework.frameworks.add_directory(directory)
+        return framework.use_extracted_framework("pcf150")
+    return run
+
+
+@benchmark("framework_search")
+def bench_framework_search():
+    # Top-3 lookup among 300 indexed frameworks (numpy brute force)
+    index = RAMTN.FrameworkIndex()
+    topics = ["real estate leverage and rental yield", "career moves into management", "venture fundraising",
+              "index funds and diversification", "retirement and pension planning", "brand pricing power"]
+    for i in range(300):
+        topic = topics[i % len(topics)]
+        index.add(f"pcf{i:03d}", {"key_insights": [f"Insight {j} on {topic}" for j in range(10)],
+                                  "decision_patterns": [f"Decide on {topic} case {i}"]}, f"Expert case {i}: {topic}")
+    return lambda: index.search(USER_QUESTION, 3)
+
+
+@benchmark("extract_framework")
+def bench_extract_framework():
+    triplets = RAMTN.ConfidenceTripletExtractor.extract_triplets(sample_constructor_output(items_per_section=40))
+    return lambda: RAMTN.ConfidenceTripletExtractor.extract_framework_from_triplets(triplets)
+
+
+def sample_merged_triplets(runs: int = 100) -> Dict[str, List[str]]:
+    """Triplets pooled from many extraction runs: thousands of mostly distinct items"""
+    words = ["core principle", "decision logic", "risk of leverage", "boundary of the model", "key values",
+             "choice under uncertainty", "evaluation of management", "blind spot", "pricing power", "cash flow"]
+    triplets = {"confident": [], "speculative": [], "unknown": []}
+    for run in range(runs):
+        for i, category in enumerate(triplets):
+            for j in range(10):
+                triplets[category].append(f"Run {run} item {j}: {words[(run + i + j) % len(words)]} "
+                                          f"and {words[(run * 3 + j) % len(words)]} in context {run % 7}")
+    return triplets
+
+
+@benchmark("extract_framework_merged")
+def bench_extract_framework_merged():
+    triplets = sample_merged_triplets()
+    return lambda: RAMTN.ConfidenceTripletExtractor.extract_framework_from_triplets(triplets)
+
+
+def sample_extraction_run(run: int) -> Dict[str, Any]:
+    """One extraction run whose items mostly restate a shared pool of insights, with small wording changes"""
+    triplets = {"confident": [], "speculative": [], "unknown": []}
+    for i, category in enumerate(triplets):
+        for j in range(10):
+            k = (run * 7 + i * 10 + j) % 60
+            suffix = " overall" if run % 3 == 0 else ""
+            triplets[category].append(f"Insight {k}: weigh {['risk', 'moat', 'price', 'cash flow'][k % 4]} "
+                                      f"against long-term value before committing capital{suffix}")
+        if run % 4 == 0:
+            triplets[category].append(f"Case-specific note from run {run} about {category} judgment")
+    framework = RAMTN.ConfidenceTripletExtractor.extract_framework_from_triplets(triplets)
+    return {"extracted_framework": framework,
+            "best_result": {"final_triplets": triplets, "final_confidence": 0.8}}
+
+
+@benchmark("framework_store_fold")
+def bench_framework_store_fold():
+    # Fold one more run into a stored consolidated framework that already holds 300 runs
+    # (includes the fold log append and the amortized snapshot rewrites)
+    store = RAMTN.FrameworkStore(temp_dir())
+    for run in range(300):
+        store.fold("consolidated", sample_extraction_run(run))
+    new_run = sample_extraction_run(300)
+    return lambda: store.fold("consolidated", new_run)
+
+
+@benchmark("comprehensive_report")
+def bench_comprehensive_report():
+    engine = _offline_engine()
+    with redirect_stdout(io.StringIO()):
+        engine.extract_strategic_framework(EXPERT_CASE)
+        engine.implant_strategy(USER_QUESTION)
+    return engine.get_comprehensive_report
+
+
+@benchmark("pipeline_sync")
+def bench_pipeline_sync():
+    def run():
+        engine = _offline_engine()
+        engine.extract_strategic_framework(EXPERT_CASE)
+        return engine.implant_strategy(USER_QUESTION)
+    return run
+
+
+@benchmark("pipeline_async_latency")
+def bench_pipeline_async_latency():
+    def run():
+        engine = _offline_engine(latency=0.01, speculative_units=2, pipelined_layers=True)
+
+        async def both():
+            await engine.aextract_strategic_framework(EXPERT_CASE)
+            return await engine.aimplant_strategy(USER_QUESTION)
+        return asyncio.run(both())
+    return run
+
+
+# ===================== Runner =====================
+def run_case(name: str, rounds: int, warmup: int) -> Dict[str, Any]:
+    """Time one case; the pipeline's print output is discarded"""
+    try:
+        with redirect_stdout(io.StringIO()):
+            fn = BENCHMARKS[name]()
+            for _ in range(warmup):
+                fn()
+            timings = []
+            for _ in range(rounds):
+                start = time.perf_counter()
+                fn()
+                timings.append(time.perf_counter() - start)
+    finally:
+        while _CLEANUPS:
+            _CLEANUPS.pop()()
+    return {
+        "name": name,
+        "rounds": rounds,
+        "min": min(timings),
+        "mean": statistics.mean(timings),
+        "median": statistics.median(timings),
+        "stdev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "ops": 1.0 / statistics.mean(timings) if statistics.mean(timings) > 0 else float("inf")
+    }
+
+
+def format_table(results: List[Dict[str, Any]], baseline: Dict[str, Dict[str, Any]] = None) -> str:
+    header = f"{'case':<28}{'min (ms)':>12}{'mean (ms)':>12}{'median (ms)':>13}{'ops/s':>12}"
+    if baseline:
+        header += f"{'vs base':>10}"
+    lines = [header, "-" * len(header)]
+    for r in results:
+        line = (f"{r['name']:<28}{r['min'] * 1000:>12.3f}{r['mean'] * 1000:>12.3f}"
+                f"{r['median'] * 1000:>13.3f}{r['ops']:>12.1f}")
+        if baseline:
+            base = baseline.get(r["name"])
+            line += f"{r['median'] / base['median']:>9.2f}x" if base else f"{'-':>10}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def find_regressions(results: List[Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+                     tolerance: float) -> List[str]:
+    """Cases whose median is slower than the baseline median by more than tolerance"""
+    regressions = []
+    for r in results:
+        base = baseline.get(r["name"])
+        if base and r["median"] > base["median"] * (1 + tolerance):
+            regressions.append(f"{r['name']}: {base['median'] * 1000:.3f}ms -> {r['median'] * 1000:.3f}ms")
+    return regressions
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="RAMTN offline benchmarks")
+    parser.add_argument("-k", dest="keyword", default="", help="Only run cases whose name contains this text")
+    parser.add_argument("--rounds", type=int, default=20, help="Timed rounds per case")
+    parser.add_argument("--warmup", type=int, default=2, help="Untimed rounds per case")
+    parser.add_argument("--json", dest="json_path", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON file written by --json")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed median slowdown against the baseline (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    names = [name for name in BENCHMARKS if args.keyword in name]
+    if not names:
+        print(f"No benchmark matches '{args.keyword}'", file=sys.stderr)
+        return 2
+
+    results = []
+    for name in names:
+        print(f"Running {name}...", file=sys.stderr)
+        results.append(run_case(name, args.rounds, args.warmup))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = {r["name"]: r for r in json.load(f)["results"]}
+
+    print(format_table(results, baseline))
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "created": time.time(), "results": results}, f, indent=2)
+
+    if baseline:
+        regressions = find_regressions(results, baseline, args.tolerance)
+        if regressions:
+            print("\nRegressions:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+"""
+Shared fixtures for the RAMTN test suite
+- Every test runs offline against FakeLLMBackend with no response cache and a retry-fast scheduler
+- Run with: python -m pytest
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import RAMTN
+
+
+class CountingBackend(RAMTN.FakeLLMBackend):
+    """Fake backend that counts the calls reaching it"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.calls = 0
+
+    def generate(self, *args, **kwargs):
+        self.calls += 1
+        return super().generate(*args, **kwargs)
+
+    async def agenerate(self, *args, **kwargs):
+        self.calls += 1
+        return await super().agenerate(*args, **kwargs)
+
+
+@pytest.fixture(autouse=True)
+def offline():
+    """Restore the module-level backend, cache and scheduler after each test"""
+    saved = RAMTN.llm_backend, RAMTN.response_cache, RAMTN.request_scheduler
+    RAMTN.configure_llm_backend(RAMTN.FakeLLMBackend())
+    RAMTN.configure_response_cache(None)
+    RAMTN.configure_request_scheduler(RAMTN.RequestScheduler(backoff_base=0.0))
+    yield
+    RAMTN.configure_llm_backend(saved[0])
+    RAMTN.configure_response_cache(saved[1])
+    RAMTN.configure_request_scheduler(saved[2])
+
+
+@pytest.fixture
+def backend():
+    counting = CountingBackend()
+    RAMTN.configure_llm_backend(counting)
+    return counting
+
+
+@pytest.fixture
+def engine_factory():
+    """Engines with their own framework, so tests do not share extracted frameworks"""
+    def create(**kwargs):
+        return RAMTN.StrategicCognitiveEngine(framework=RAMTN.StrategicDecisionFramework(), **kwargs)
+    return create
@@ -0,0 +1,46 @@
+"""
+benchmark.py cases as a pytest-benchmark suite (timed cases are skipped when pytest-benchmark is not installed)
+    python -m pytest tests/test_benchmarks.py --benchmark-autosave
+    python -m pytest tests/test_benchmarks.py --benchmark-compare --benchmark-compare-fail=median:20%
+"""
+
+import os
+
+import pytest
+
+import benchmark as cases
+
+
+def result(name, median):
+    return {"name": name, "median": median}
+
+
+def test_find_regressions_flags_slowdowns():
+    baseline = {"parse": result("parse", 0.010), "search": result("search", 0.002)}
+    results = [result("parse", 0.013), result("search", 0.0021), result("new_case", 1.0)]
+    assert cases.find_regressions(results, baseline, tolerance=0.2) == ["parse: 10.000ms -> 13.000ms"]
+    assert cases.find_regressions(results, baseline, tolerance=0.5) == []
+
+
+def test_run_case_removes_temporary_directories(monkeypatch):
+    created = []
+
+    def setup():
+        created.append(cases.temp_dir())
+        return lambda: None
+
+    monkeypatch.setitem(cases.BENCHMARKS, "temp_dir_case", setup)
+    timing = cases.run_case("temp_dir_case", rounds=2, warmup=0)
+    assert timing["rounds"] == 2
+    assert not os.path.exists(created[0])
+
+
+@pytest.mark.parametrize("name", sorted(cases.BENCHMARKS))
+def test_benchmark(request, name):
+    pytest.importorskip("pytest_benchmark")
+    benchmark = request.getfixturevalue("benchmark")
+    try:
+        benchmark(cases.BENCHMARKS[name]())
+    finally:
+        while cases._CLEANUPS:
+            cases._CLEANUPS.pop()()
@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+import RAMTN
+from conftest import CountingBackend
+
+
+class CrashingBackend(CountingBackend):
+    """Fake backend that fails at its crash_at-th call, like a worker killed mid-run"""
+
+    def __init__(self, crash_at: int):
+        super().__init__()
+        self.crash_at = crash_at
+
+    def generate(self, *args, **kwargs):
+        if self.calls + 1 == self.crash_at:
+            self.calls += 1
+            raise RuntimeError("worker killed")
+        return super().generate(*args, **kwargs)
+
+    async def agenerate(self, *args, **kwargs):
+        if self.calls + 1 == self.crash_at:
+            self.calls += 1
+            raise RuntimeError("worker killed")
+        return await super().agenerate(*args, **kwargs)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return RAMTN.CheckpointStore(str(tmp_path / "checkpoints.sqlite"))
+
+
+def test_uninterrupted_run_is_completed(store, engine_factory, backend):
+    result = engine_factory(checkpoint_store=store).extract_strategic_framework("Buffett case")
+    assert store.get_run(result["run_id"])["status"] == "completed"
+    assert store.list_runs("running") == []
+
+
+@pytest.mark.parametrize("crash_at", [2, 5, 13])
+def test_resume_continues_where_the_run_stopped(store, engine_factory, crash_at):
+    full_backend = CountingBackend()
+    RAMTN.configure_llm_backend(full_backend)
+    full = engine_factory(confidence_threshold=0.99).extract_strategic_framework("Buffett case")
+
+    RAMTN.configure_llm_backend(CrashingBackend(crash_at))
+    with pytest.raises(RuntimeError):
+        engine_factory(confidence_threshold=0.99, checkpoint_store=store).extract_strategic_framework(
+            "Buffett case", run_id="interrupted")
+    assert store.get_run("interrupted")["status"] == "running"
+
+    resumed_backend = CountingBackend()
+    RAMTN.configure_llm_backend(resumed_backend)
+    resumed = engine_factory(confidence_threshold=0.99, checkpoint_store=store).resume_run("interrupted")
+
+    assert resumed["best_result"]["final_triplets"] == full["best_result"]["final_triplets"]
+    assert resumed_backend.calls <= full_backend.calls - crash_at + 1
+    assert store.get_run("interrupted")["status"] == "completed"
+
+
+def test_async_pipelined_resume(store, engine_factory):
+    RAMTN.configure_llm_backend(CrashingBackend(5))
+    with pytest.raises(RuntimeError):
+        engine_factory(confidence_threshold=0.99, pipelined_layers=True,
+                       checkpoint_store=store).extract_strategic_framework("Buffett case", run_id="async")
+
+    RAMTN.configure_llm_backend(RAMTN.FakeLLMBackend())
+    engine = engine_factory(confidence_threshold=0.99, pipelined_layers=True, checkpoint_store=store)
+    resumed = asyncio.run(engine.aresume_run("async"))
+    assert resumed["run_id"] == "async"
+    assert store.get_run("async")["status"] == "completed"
+
+
+def test_fresh_run_does_not_replay_its_own_calls(store, engine_factory, backend, capsys):
+    engine_factory(checkpoint_store=store, speculative_units=2).extract_strategic_framework("Buffett case")
+    assert "Checkpoint replay" not in capsys.readouterr().out
+
+
+def test_identical_prompts_of_two_units_are_separate_calls(store, backend):
+    run = store.open_run("r", "extraction", "Buffett case")
+    with RAMTN.call_journal(run):
+        with RAMTN.event_scope(unit=1, layer=1):
+            RAMTN.call_qwen("same prompt", "strategic_critic_extraction")
+        with RAMTN.event_scope(unit=2, layer=1):
+            RAMTN.call_qwen("same prompt", "strategic_critic_extraction")
+        assert backend.calls == 2
+        with RAMTN.event_scope(unit=2, layer=1):
+            RAMTN.call_qwen("same prompt", "strategic_critic_extraction")
+        assert backend.calls == 2
+
+
+def test_resume_rejects_unknown_run(store, engine_factory):
+    with pytest.raises(KeyError):
+        engine_factory(checkpoint_store=store).resume_run("missing")
@@ -0,0 +1,24 @@
+import RAMTN
+
+
+def test_fit_analysis_accepts_unhashable_traits():
+    framework = RAMTN.StrategicDecisionFramework()
+    traits = {"strengths": ["analysis", "negotiation"], "context": {"industry": "finance"}}
+    fit = framework.analyze_framework_fit(traits, "dynamic_stability")
+    expected = dict(fit)
+    fit["strengths"] = "modified by the caller"
+    cached = len(framework._cache)
+
+    reordered = {"context": {"industry": "finance"}, "strengths": ["analysis", "negotiation"]}
+    assert framework.analyze_framework_fit(reordered, "dynamic_stability") == expected
+    assert len(framework._cache) == cached
+    framework.analyze_framework_fit({"strengths": ["analysis"]}, "dynamic_stability")
+    assert len(framework._cache) == cached + 1
+
+
+def test_guidance_is_memoized_per_version():
+    framework = RAMTN.StrategicDecisionFramework()
+    guidance = framework.get_comprehensive_guidance("question", mode="implantation")
+    assert framework.get_comprehensive_guidance("other question", mode="implantation") is guidance
+    framework.set_extracted_framework({"framework_name": "Value investing", "key_insights": ["Buy moats"]})
+    assert framework.get_comprehensive_guidance("question", mode="implantation") is not guidance
@@ -0,0 +1,85 @@
+import pytest
+
+import RAMTN
+
+pytest.importorskip("numpy")
+
+TOPICS = ["real estate leverage and rental yield", "career moves into management", "venture fundraising",
+          "index funds and diversification", "retirement and pension planning", "brand pricing power"]
+
+
+@pytest.fixture
+def index():
+    index = RAMTN.FrameworkIndex()
+    for i, topic in enumerate(TOPICS):
+        index.add(f"pcf{i}", {"key_insights": [f"Insight on {topic}"],
+                              "decision_patterns": [f"Decide on {topic}"]}, f"Expert case: {topic}")
+    return index
+
+
+def test_search_ranks_matching_topic_first(index):
+    results = index.search("Should I buy index funds to get diversification?", 3)
+    assert len(results) == 3
+    assert results[0][0] == "pcf3"
+    assert results[0][1] >= results[1][1] >= results[2][1]
+
+
+def test_search_on_empty_index():
+    assert RAMTN.FrameworkIndex().search("anything", 3) == []
+
+
+def test_save_and_load_round_trip(index, tmp_path):
+    path = str(tmp_path / "index.npz")
+    index.save(path)
+    loaded = RAMTN.FrameworkIndex.load(path)
+    assert len(loaded) == len(index)
+    query = "career change into a management role"
+    assert loaded.search(query, 2) == index.search(query, 2)
+
+
+def test_sync_indexes_stored_frameworks_once(tmp_path):
+    store = RAMTN.FrameworkStore(str(tmp_path))
+    for i, topic in enumerate(TOPICS[:3]):
+        store.save({"extraction_question": f"Expert case: {topic}",
+                    "extracted_framework": {"key_insights": [f"Insight on {topic}"]},
+                    "best_result": {"final_confidence": 0.8}}, f"pcf{i}")
+    index = RAMTN.FrameworkIndex()
+    assert index.sync(store) == 3
+    assert index.sync(store) == 0
+    assert index.search("raising a venture round", 1)[0][0] == "pcf2"
+
+
+def test_saved_index_loads_without_pickle(index, tmp_path):
+    import numpy as np
+    path = str(tmp_path / "index.npz")
+    index.save(path)
+    with np.load(path, allow_pickle=False) as data:
+        assert data["ids"].dtype.kind == "U"
+        assert list(data["ids"]) == index.ids
+
+
+def test_sync_re_embeds_changed_frameworks(tmp_path):
+    store = RAMTN.FrameworkStore(str(tmp_path))
+    store.save({"extraction_question": "Expert case", "extracted_framework": {"key_insights": ["Insight on brand"]},
+                "best_result": {"final_confidence": 0.8}}, "pcf0")
+    index = RAMTN.FrameworkIndex()
+    index.sync(store)
+    index.save(str(tmp_path / "index.npz"))
+    index = RAMTN.FrameworkIndex.load(str(tmp_path / "index.npz"))
+    assert index.sync(store) == 0
+
+    store.save({"extraction_question": "Expert case",
+                "extracted_framework": {"key_insights": ["Insight on retirement and pension planning"]},
+                "best_result": {"final_confidence": 0.8}}, "pcf0")
+    assert index.sync(store) == 1
+    assert index.search("pension planning", 1)[0][1] > 0.3
+
+    run = {"extraction_question": "Expert case", "framework_id": "pcf1",
+           "extracted_framework": {"key_insights": ["Insight on venture fundraising"]},
+           "best_result": {"final_confidence": 0.8, "final_triplets": {
+               "confident": ["Insight on venture fundraising"], "speculative": [], "unknown": []}}}
+    store.fold("merged", run)
+    assert index.sync(store) == 1
+    store.fold("merged", dict(run, framework_id="pcf2"))
+    assert index.sync(store) == 1
+    assert index.sync(store) == 0
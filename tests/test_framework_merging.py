@@ -0,0 +1,111 @@
+import os
+
+import pytest
+
+import RAMTN
+
+
+def extraction_run(insights, confidence=0.8, speculative=()):
+    """Extraction results holding the given key insights (speculative ones are stated as such)"""
+    triplets = {"confident": [text for text in insights if text not in speculative],
+                "speculative": list(speculative), "unknown": []}
+    return {"extracted_framework": {"key_insights": list(insights)},
+            "best_result": {"final_triplets": triplets, "final_confidence": confidence}}
+
+
+def rendered(results):
+    """Extraction results without the fields that change on every render"""
+    framework = {key: value for key, value in results["extracted_framework"].items() if key != "extraction_time"}
+    return framework, results["best_result"], results["merge_state"]
+
+
+def test_near_duplicates_count_as_support():
+    merger = RAMTN.FrameworkMerger()
+    merger.fold(extraction_run(["Core principle: buy businesses with a durable moat at a fair price"]))
+    stats = merger.fold(extraction_run(["Core principle: buy businesses with a durable moat at a fair price today",
+                                        "Core principle: never borrow to buy stocks"]))
+    assert stats == {"added": 1, "merged": 1}
+
+    support = merger.extracted_framework()["item_support"]["key_insights"]
+    assert [item["support"] for item in support] == [2, 1]
+    assert support[0]["text"] == "Core principle: buy businesses with a durable moat at a fair price"
+
+
+def test_confidence_levels_are_counted_per_item():
+    merger = RAMTN.FrameworkMerger()
+    merger.fold(extraction_run(["Key insight: patience pays"], confidence=0.9))
+    merger.fold(extraction_run(["Key insight: patience pays"], confidence=0.5,
+                               speculative=["Key insight: patience pays"]))
+    merger.fold(extraction_run(["Key insight: patience pays"], confidence=0.7))
+
+    item = merger.extracted_framework()["item_support"]["key_insights"][0]
+    assert item["confidence"] == {"confident": 2, "speculative": 1, "unknown": 0}
+    results = merger.extraction_results("Buffett")
+    assert results["best_result"]["final_confidence"] == pytest.approx(0.7)
+    assert results["best_result"]["final_triplets"]["confident"] == ["Key insight: patience pays"]
+
+
+def test_state_round_trip_continues_identically():
+    runs = [extraction_run([f"Key principle {i % 5}: weigh risk against value", f"Core logic of case {i}"])
+            for i in range(20)]
+    merger = RAMTN.FrameworkMerger()
+    for run in runs[:10]:
+        merger.fold(run)
+    restored = RAMTN.FrameworkMerger.from_dict(merger.to_dict())
+    for run in runs[10:]:
+        assert restored.fold(run) == merger.fold(run)
+    assert restored.to_dict() == merger.to_dict()
+
+
+def test_store_fold_matches_in_memory_merger(tmp_path):
+    store = RAMTN.FrameworkStore(str(tmp_path))
+    merger = RAMTN.FrameworkMerger()
+    for i in range(50):
+        run = extraction_run([f"Key principle {i % 7}: weigh risk against value", f"Core logic of case {i}"])
+        stats = store.fold("consolidated", run, question="Buffett")
+        merger.fold(run)
+    assert stats["runs"] == 50
+    assert os.path.exists(tmp_path / "consolidated.folds.jsonl")
+
+    expected = rendered(merger.extraction_results("Buffett"))
+    assert rendered(store.load("consolidated")) == expected
+    assert rendered(RAMTN.FrameworkStore(str(tmp_path)).load("consolidated")) == expected
+
+    store.flush()
+    assert not os.path.exists(tmp_path / "consolidated.folds.jsonl")
+    assert rendered(RAMTN.FrameworkStore(str(tmp_path)).load("consolidated")) == expected
+    assert store.list_frameworks() == ["consolidated"]
+
+
+def test_store_picks_up_folds_from_another_store(tmp_path):
+    first = RAMTN.FrameworkStore(str(tmp_path))
+    first.fold("consolidated", extraction_run(["Core principle: margin of safety"]))
+    RAMTN.FrameworkStore(str(tmp_path)).fold("consolidated", extraction_run(["Core principle: circle of competence"]))
+    assert first.fold("consolidated", extraction_run(["Core principle: margin of safety"]))["runs"] == 3
+    assert len(first.load("consolidated")["extracted_framework"]["key_insights"]) == 2
+
+
+def test_store_refuses_to_fold_into_plain_extraction(tmp_path):
+    store = RAMTN.FrameworkStore(str(tmp_path))
+    store.save({"extraction_question": "q", "extracted_framework": {}, "best_result": {}}, "plain")
+    with pytest.raises(ValueError):
+        store.fold("plain", extraction_run(["Core principle: margin of safety"]))
+
+
+def test_consolidated_framework_drives_implantation(tmp_path, engine_factory):
+    store = RAMTN.FrameworkStore(str(tmp_path))
+    for i in range(3):
+        store.fold("consolidated", extraction_run([f"Core principle {i}: buy quality at a fair price"]), question="q")
+    engine = engine_factory()
+    engine.set_extraction_results(store.load("consolidated"))
+    result = engine.implant_strategy("Should I buy index funds?")
+    assert result["best_result"]["final_confidence"] > 0
+
+
+def test_chinese_items_are_compared_by_character_bigrams():
+    merger = RAMTN.FrameworkMerger()
+    merger.fold(extraction_run(["Core principle: 以合理的价格买入拥有持久护城河的优秀企业"]))
+    stats = merger.fold(extraction_run(["Core principle: 以合理的价格买入拥有持久护城河的优秀企业并长期持有",
+                                        "Core principle: 永远不要借钱买股票"]))
+    assert stats == {"added": 1, "merged": 1}
+    assert len(RAMTN.FrameworkMerger._shingle_set(RAMTN.FrameworkMerger._normalize("永远不要借钱买股票"))) == 8
@@ -0,0 +1,100 @@
+import json
+import os
+
+import pytest
+
+import RAMTN
+
+
+def write_frameworks(directory, count):
+    registry = RAMTN.FrameworkRegistry()
+    for i in range(count):
+        registry.save(str(directory), f"pcf{i}", {
+            "framework_name": f"System {i}",
+            "key_insights": [f"Insight {i}"]
+        }, kind=RAMTN.FrameworkRegistry.EXTRACTED)
+
+
+def test_directory_is_loaded_lazily(tmp_path):
+    write_frameworks(tmp_path, 5)
+    registry = RAMTN.FrameworkRegistry()
+    assert registry.add_directory(str(tmp_path)) == 5
+    assert registry.loads == 0
+    assert registry.summaries(RAMTN.FrameworkRegistry.EXTRACTED)[0] == ("pcf0", "System 0", "")
+    assert registry.loads == 0
+
+    assert registry["pcf3"]["key_insights"] == ["Insight 3"]
+    assert registry.loads == 1 and registry.is_loaded("pcf3") and not registry.is_loaded("pcf2")
+
+
+def test_index_picks_up_new_files(tmp_path):
+    write_frameworks(tmp_path, 2)
+    RAMTN.FrameworkRegistry().add_directory(str(tmp_path))
+    with open(tmp_path / "added.json", "w", encoding="utf-8") as f:
+        json.dump({"name": "Added", "description": "Dropped in later"}, f)
+
+    registry = RAMTN.FrameworkRegistry()
+    registry.add_directory(str(tmp_path))
+    assert "added" in registry
+    assert set(RAMTN.FrameworkRegistry.read_index(str(tmp_path))) == {"pcf0", "pcf1", "added"}
+
+
+def test_max_loaded_evicts_least_recently_used(tmp_path):
+    write_frameworks(tmp_path, 3)
+    registry = RAMTN.FrameworkRegistry(max_loaded=2)
+    registry.add_directory(str(tmp_path))
+    registry["pcf0"], registry["pcf1"], registry["pcf0"], registry["pcf2"]
+    assert registry.is_loaded("pcf0") and registry.is_loaded("pcf2") and not registry.is_loaded("pcf1")
+    assert registry.stats()["loaded"] == 2
+
+
+def test_yaml_definitions(tmp_path):
+    yaml = pytest.importorskip("yaml")
+    with open(tmp_path / "moat.yaml", "w", encoding="utf-8") as f:
+        yaml.safe_dump({"name": "Moat Check", "description": "Durable advantage first"}, f)
+    registry = RAMTN.FrameworkRegistry()
+    registry.add_directory(str(tmp_path))
+    assert registry["moat"]["name"] == "Moat Check"
+
+
+def test_stored_extractions_expose_their_framework(tmp_path):
+    store = RAMTN.FrameworkStore(str(tmp_path))
+    store.save({"extraction_question": "Buffett case", "extracted_framework": {"key_insights": ["Moats"]},
+                "best_result": {"final_confidence": 0.8}}, "buffett")
+    registry = RAMTN.FrameworkRegistry()
+    registry.add_directory(str(tmp_path))
+    assert registry["buffett"] == {"key_insights": ["Moats"]}
+    assert RAMTN.FRAMEWORK_INDEX_FILE in os.listdir(tmp_path)
+    assert store.list_frameworks() == ["buffett"]
+
+
+def test_framework_version_follows_registrations():
+    framework = RAMTN.StrategicDecisionFramework()
+    version = framework.version
+    guidance = framework.get_system_message("strategic_constructor_extraction")
+    assert framework.get_system_message("strategic_constructor_extraction") is guidance
+
+    framework.set_extracted_framework({"framework_name": "Extracted", "key_insights": ["Moats"]}, "pcf")
+    assert framework.version != version
+    assert framework.use_extracted_framework("pcf")["framework_name"] == "Extracted"
+    framework.reset()
+    assert "pcf" not in framework.frameworks
+
+
+def test_extracted_frameworks_are_bounded(engine_factory):
+    framework = RAMTN.StrategicDecisionFramework(max_extracted=3)
+    for i in range(10):
+        framework.set_extracted_framework({"framework_name": f"case {i}", "key_insights": [f"insight {i}"]},
+                                          f"pcf{i}")
+    framework.set_supporting_frameworks(["pcf7"])
+    framework.set_extracted_framework({"framework_name": "case 10"}, "pcf10")
+    # pcf7 was used more recently than pcf8
+    assert set(framework.frameworks.keys(RAMTN.FrameworkRegistry.EXTRACTED)) == {"pcf7", "pcf9", "pcf10"}
+    assert len(framework.frameworks.keys(RAMTN.FrameworkRegistry.DEFINITION)) == 6
+
+    engine = engine_factory()
+    engine.framework.max_extracted = 2
+    for question in ("Buffett case", "Munger case", "Dalio case"):
+        engine.extract_strategic_framework(question)
+    assert len(engine.framework.frameworks.keys(RAMTN.FrameworkRegistry.EXTRACTED)) == 2
+    assert engine.framework.extracted_framework_id in engine.framework.frameworks
@@ -0,0 +1,111 @@
+import time
+
+import pytest
+
+import RAMTN
+
+
+@pytest.fixture
+def jobs(tmp_path):
+    return RAMTN.JobQueue(str(tmp_path / "jobs.sqlite"))
+
+
+def test_job_lifecycle(jobs):
+    job_id = jobs.submit("analysis", {"question": "q"})
+    assert jobs.get(job_id)["status"] == "queued"
+
+    claimed = jobs.claim("worker-1")
+    assert claimed["job_id"] == job_id and claimed["payload"] == {"question": "q"}
+    assert jobs.claim("worker-2") is None
+
+    jobs.set_events(job_id, [{"type": "layer_started"}])
+    jobs.complete(job_id, {"report": "done"})
+    job = jobs.get(job_id)
+    assert job["status"] == "completed" and job["result"] == {"report": "done"}
+    assert job["events"] == [{"type": "layer_started"}] and job["worker"] == "worker-1"
+    assert jobs.stats()["completed"] == 1
+
+
+def test_jobs_are_claimed_in_submission_order(jobs):
+    first, second, third = (jobs.submit("analysis", {"n": n}) for n in range(3))
+    assert jobs.position(third) == 2
+    assert jobs.claim("w")["job_id"] == first
+    assert jobs.position(first) == 0 and jobs.position(third) == 1
+    assert jobs.claim("w")["job_id"] == second
+
+
+def test_stale_jobs_are_requeued_then_failed(jobs):
+    job_id = jobs.submit("analysis", {})
+    jobs.claim("crashed")
+    assert jobs.requeue_stale(timeout=-1, max_attempts=2) == 1
+    assert jobs.get(job_id)["status"] == "queued"
+
+    jobs.claim("crashed-again")
+    jobs.requeue_stale(timeout=-1, max_attempts=2)
+    job = jobs.get(job_id)
+    assert job["status"] == "failed" and job["error"] == "Worker stopped responding"
+
+
+def test_worker_runs_analysis_job(jobs, tmp_path):
+    job_id = jobs.submit("analysis", {"expert_case": "Buffett bought See's Candies", "question": "Index funds?"})
+    processed = RAMTN.job_worker(jobs.path, str(tmp_path / "frameworks"), poll_interval=0.01, max_jobs=1)
+    assert processed == 1
+
+    job = jobs.get(job_id)
+    assert job["status"] == "completed", job["error"]
+    assert job["result"]["final_confidence"] > 0
+    assert "Strategic" in job["result"]["report"]
+    assert any(event["type"] == "layer_started" for event in job["events"])
+    assert RAMTN.FrameworkStore(str(tmp_path / "frameworks")).exists(job["result"]["framework_id"])
+
+
+def test_worker_records_failures(jobs, tmp_path):
+    job_id = jobs.submit("no_such_kind", {})
+    RAMTN.job_worker(jobs.path, str(tmp_path / "frameworks"), poll_interval=0.01, max_jobs=1)
+    job = jobs.get(job_id)
+    assert job["status"] == "failed" and "KeyError" in job["error"]
+
+
+def test_worker_runs_each_job_with_its_own_api_key(jobs, tmp_path, monkeypatch):
+    RAMTN.configure_llm_backend(RAMTN.DashScopeBackend())
+    monkeypatch.setitem(RAMTN.JOB_HANDLERS, "whoami",
+                        lambda payload, store, kwargs: {"api_key": RAMTN.active_llm_backend().api_key})
+    first = jobs.submit("whoami", {}, api_key="sk-first")
+    second = jobs.submit("whoami", {}, api_key="sk-second")
+    RAMTN.job_worker(jobs.path, str(tmp_path / "frameworks"), poll_interval=0.01, max_jobs=2)
+
+    assert jobs.get(first)["result"] == {"api_key": "sk-first"}
+    assert jobs.get(second)["result"] == {"api_key": "sk-second"}
+    assert "api_key" not in jobs.get(first)
+    assert jobs._conn.execute("SELECT COUNT(*) FROM jobs WHERE api_key IS NOT NULL").fetchone()[0] == 0
+
+
+def test_heartbeat_keeps_a_slow_job_leased(jobs, tmp_path, monkeypatch):
+    def slow_handler(payload, store, kwargs):
+        time.sleep(0.3)
+        return {"requeued": jobs.requeue_stale(timeout=0.1)}
+
+    monkeypatch.setitem(RAMTN.JOB_HANDLERS, "slow", slow_handler)
+    job_id = jobs.submit("slow", {})
+    RAMTN.job_worker(jobs.path, str(tmp_path / "frameworks"), poll_interval=0.01, max_jobs=1,
+                     heartbeat_interval=0.02)
+    job = jobs.get(job_id)
+    assert job["result"] == {"requeued": 0} and job["attempts"] == 1
+
+
+def test_heartbeat_fails_once_the_job_was_requeued(jobs):
+    job_id = jobs.submit("analysis", {})
+    jobs.claim("w")
+    assert jobs.heartbeat(job_id, "w")
+    assert not jobs.heartbeat(job_id, "other")
+    jobs.requeue_stale(timeout=-1)
+    assert not jobs.heartbeat(job_id, "w")
+
+
+def test_worker_relays_constructor_tokens(jobs, tmp_path):
+    job_id = jobs.submit("analysis", {"expert_case": "Buffett bought See's Candies", "question": "Index funds?"})
+    RAMTN.job_worker(jobs.path, str(tmp_path / "frameworks"), poll_interval=0.01, max_jobs=1)
+    events = jobs.get(job_id)["events"]
+    tokens = [event for event in events if event["type"] == "constructor_token"]
+    assert tokens and all(len(event["token"]) > 1 for event in tokens)
+    assert all(a["type"] != "constructor_token" or b["type"] != "constructor_token" for a, b in zip(events, events[1:]))
@@ -0,0 +1,34 @@
+import pytest
+
+import RAMTN
+
+
+@pytest.mark.parametrize("text, expected, status", [
+    ('{"a": 1, "b": [1, 2]}', {"a": 1, "b": [1, 2]}, "parsed"),
+    ('Here is the evaluation:\n```json\n{"a": 1}\n```', {"a": 1}, "parsed"),
+    ('{"a": 1} and some trailing prose', {"a": 1}, "parsed"),
+    ('{"a": [1, 2,], "b": 3,}', {"a": [1, 2], "b": 3}, "repaired"),
+    ('{"a": [1, 2', {"a": [1, 2]}, "repaired"),
+    ('{"a": 1, "b": "trunc', {"a": 1}, "repaired"),
+    ('{"a": {"b": 1}, "c": [{"d": 2}, 3', {"a": {"b": 1}, "c": [{"d": 2}, 3]}, "repaired"),
+    ("no json here", None, "failed"),
+    ("", None, "failed"),
+])
+def test_parse_json_tolerant(text, expected, status):
+    assert RAMTN.parse_json_tolerant(text) == (expected, status)
+
+
+def test_incremental_feed_matches_single_pass():
+    text = '```json\n{"final_triplets": {"confident": ["a", "b"], "speculative": ["c"]}, "confidence_score": 0.8}'
+    for size in (1, 3, 7, 50):
+        parser = RAMTN.IncrementalJSONParser()
+        for start in range(0, len(text), size):
+            parser.feed(text[start:start + size])
+        assert parser.result() == RAMTN.parse_json_tolerant(text)
+
+
+def test_truncated_observer_output_keeps_complete_items():
+    text = '{"final_triplets": {"confident": ["Moat matters", "Price disci'
+    value, status = RAMTN.parse_json_tolerant(text)
+    assert status == "repaired"
+    assert value["final_triplets"]["confident"] == ["Moat matters"]
@@ -0,0 +1,23 @@
+import RAMTN
+from conftest import CountingBackend
+
+
+def test_use_llm_backend_routes_calls_of_the_current_context(backend):
+    session_backend = CountingBackend()
+    with RAMTN.use_llm_backend(session_backend):
+        for event in RAMTN.iter_events(RAMTN.call_qwen, "Evaluate the case", "strategic_observer_extraction"):
+            pass
+    RAMTN.call_qwen("Another question", "strategic_observer_extraction")
+    assert session_backend.calls == 1
+    assert backend.calls == 1
+
+
+def test_backend_for_api_key_keeps_the_process_environment(monkeypatch):
+    monkeypatch.delenv("DASHSCOPE_API_KEY", raising=False)
+    assert RAMTN.backend_for_api_key("sk-session") is None
+    RAMTN.configure_llm_backend(RAMTN.DashScopeBackend())
+    session_backend = RAMTN.backend_for_api_key("sk-session")
+    assert session_backend.api_key == "sk-session"
+    assert session_backend._request([], 0.3, False, False)["api_key"] == "sk-session"
+    assert RAMTN.backend_for_api_key("") is None
+    assert "DASHSCOPE_API_KEY" not in RAMTN.os.environ
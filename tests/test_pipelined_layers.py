@@ -0,0 +1,21 @@
+import RAMTN
+
+
+def test_critic_is_built_from_parsed_triplets_and_skipped_on_early_stop(engine_factory, monkeypatch):
+    critic_layers = []
+    original = RAMTN.StrategicThinkingLayer._critic_request
+
+    def critic_request(layer):
+        assert layer.confidence_triplets == RAMTN.ConfidenceTripletExtractor.extract_triplets(layer.response)
+        critic_layers.append(layer.layer_num)
+        return original(layer)
+
+    monkeypatch.setattr(RAMTN.StrategicThinkingLayer, "_critic_request", critic_request)
+    monkeypatch.setattr(RAMTN.StrategicThinkingLayer, "_check_content_stability", lambda layer: True)
+    events = []
+    with RAMTN.event_listener(events.append):
+        engine_factory(confidence_threshold=0.99, max_units=1,
+                       pipelined_layers=True).extract_strategic_framework("Buffett case")
+
+    assert [event["layer"] for event in events if event["type"] == "layer_early_terminated"] == [2]
+    assert critic_layers == [1]
@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+import requests
+
+import RAMTN
+
+MESSAGES = [{"role": "user", "content": "question"}]
+COMPLETION = {"content": "ok", "prompt_tokens": 3, "completion_tokens": 1, "streamed": False}
+
+
+def failing_send(errors):
+    """send() that raises the given errors in turn, then succeeds"""
+    attempts = []
+
+    def send(on_token):
+        attempts.append(on_token)
+        if len(attempts) <= len(errors):
+            raise errors[len(attempts) - 1]
+        return COMPLETION
+    return send, attempts
+
+
+@pytest.mark.parametrize("error", [
+    RAMTN.LLMCallError("throttled", status_code=429),
+    RAMTN.LLMCallError("server error", status_code=503),
+    RAMTN.LLMCallError("throttled", code="Throttling.RateQuota"),
+    ConnectionError("reset"),
+    requests.exceptions.ConnectionError("reset"),
+    requests.exceptions.ReadTimeout("timed out"),
+])
+def test_retryable_errors(error):
+    assert RAMTN.is_retryable_error(error)
+
+
+@pytest.mark.parametrize("error", [RAMTN.LLMCallError("bad request", status_code=400), ValueError("bad")])
+def test_non_retryable_errors(error):
+    assert not RAMTN.is_retryable_error(error)
+
+
+def test_run_retries_until_success():
+    scheduler = RAMTN.RequestScheduler(backoff_base=0.0)
+    send, attempts = failing_send([RAMTN.LLMCallError("throttled", status_code=429),
+                                   requests.exceptions.ConnectionError("reset")])
+    span = {}
+    assert scheduler.run("strategic_constructor_extraction", MESSAGES, send, span=span) == COMPLETION
+    assert len(attempts) == 3
+    assert span["retries"] == 2
+    stats = scheduler.stats()
+    assert stats["retries"] == 2 and stats["throttled"] == 1 and stats["in_flight"] == 0
+
+
+def test_run_gives_up_after_max_retries():
+    scheduler = RAMTN.RequestScheduler(max_retries=2, backoff_base=0.0)
+    send, attempts = failing_send([RAMTN.LLMCallError("down", status_code=500)] * 5)
+    with pytest.raises(RAMTN.LLMCallError):
+        scheduler.run("strategic_constructor_extraction", MESSAGES, send)
+    assert len(attempts) == 3
+    assert scheduler.stats()["failures"] == 1
+
+
+def test_run_does_not_retry_client_errors():
+    scheduler = RAMTN.RequestScheduler(backoff_base=0.0)
+    send, attempts = failing_send([ValueError("bad prompt")])
+    with pytest.raises(ValueError):
+        scheduler.run("strategic_constructor_extraction", MESSAGES, send)
+    assert len(attempts) == 1
+
+
+def test_streamed_call_is_not_retried_after_first_token():
+    scheduler = RAMTN.RequestScheduler(backoff_base=0.0)
+    attempts = []
+
+    def send(on_token):
+        attempts.append(1)
+        on_token("partial")
+        raise ConnectionError("dropped mid-stream")
+
+    with pytest.raises(ConnectionError):
+        scheduler.run("strategic_constructor_extraction", MESSAGES, send, on_token=lambda delta: None)
+    assert len(attempts) == 1
+
+
+def test_arun_retries_like_run():
+    scheduler = RAMTN.RequestScheduler(backoff_base=0.0)
+    sync_send, attempts = failing_send([RAMTN.LLMCallError("throttled", status_code=429)])
+
+    async def send(on_token):
+        return sync_send(on_token)
+
+    assert asyncio.run(scheduler.arun("strategic_observer_extraction", MESSAGES, send)) == COMPLETION
+    assert len(attempts) == 2
+
+
+def test_token_bucket_charges_bursts_to_later_callers():
+    bucket = RAMTN.TokenBucket(rate=10.0, capacity=10.0)
+    assert bucket.reserve(10) == 0.0
+    assert bucket.reserve(5) == pytest.approx(0.5, abs=0.05)
+
+
+def test_call_qwen_retries_failing_backend():
+    RAMTN.configure_llm_backend(RAMTN.FakeLLMBackend(failure_rate=0.5, seed=3))
+    RAMTN.configure_request_scheduler(RAMTN.RequestScheduler(max_retries=10, backoff_base=0.0))
+    for i in range(5):
+        assert RAMTN.call_qwen(f"question {i}", "strategic_critic_extraction")
+    assert RAMTN.request_scheduler.stats()["retries"] > 0
@@ -0,0 +1,84 @@
+import pytest
+
+import RAMTN
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = RAMTN.MemoryResponseCache(max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1" and cache.get("c") == "3"
+    assert cache.stats()["hits"] == 3 and cache.stats()["misses"] == 1
+
+
+def test_memory_cache_expires_entries(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(RAMTN.time, "time", lambda: now[0])
+    cache = RAMTN.MemoryResponseCache(ttl=10)
+    cache.set("a", "1")
+    now[0] += 5
+    assert cache.get("a") == "1"
+    now[0] += 6
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_sqlite_cache_persists_and_bounds_size(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = RAMTN.SQLiteResponseCache(path, max_entries=3)
+    for i in range(5):
+        cache.set(f"k{i}", f"v{i}")
+    assert len(cache) == 3
+
+    reopened = RAMTN.SQLiteResponseCache(path, max_entries=3)
+    assert reopened.get("k4") == "v4"
+    assert reopened.get("k0") is None
+
+
+def test_tiered_cache_promotes_disk_hits(tmp_path):
+    disk = RAMTN.SQLiteResponseCache(str(tmp_path / "cache.sqlite"))
+    disk.set("k", "v")
+    cache = RAMTN.TieredResponseCache(RAMTN.MemoryResponseCache(), disk)
+    assert cache.get("k") == "v"
+    assert cache.memory.get("k") == "v"
+
+
+def test_incomplete_cache_subclass_cannot_be_created():
+    class GetOnly(RAMTN.ResponseCache):
+        def _get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        GetOnly()
+
+
+def test_key_covers_role_temperature_and_model():
+    key = RAMTN.ResponseCache.make_key("strategic_constructor_extraction", "prompt", 0.1, "m")
+    assert key == RAMTN.ResponseCache.make_key("strategic_constructor_extraction", "prompt", 0.1, "m")
+    assert key != RAMTN.ResponseCache.make_key("strategic_critic_extraction", "prompt", 0.1, "m")
+    assert key != RAMTN.ResponseCache.make_key("strategic_constructor_extraction", "prompt", 0.2, "m")
+    assert key != RAMTN.ResponseCache.make_key("strategic_constructor_extraction", "prompt", 0.1, "other")
+
+
+def test_call_qwen_serves_repeated_calls_from_cache(backend):
+    RAMTN.configure_response_cache(RAMTN.MemoryResponseCache())
+    first = RAMTN.call_qwen("Summarize the case", "strategic_critic_extraction", temperature=0.2)
+    second = RAMTN.call_qwen("Summarize the case", "strategic_critic_extraction", temperature=0.2)
+    assert first == second
+    assert backend.calls == 1
+    RAMTN.call_qwen("Summarize the case", "strategic_critic_extraction", temperature=0.7)
+    assert backend.calls == 2
+
+
+def test_json_mode_responses_are_cached_separately(backend):
+    RAMTN.configure_response_cache(RAMTN.MemoryResponseCache())
+    assert RAMTN.ResponseCache.make_key("default", "p", 0.1, "m") != \
+        RAMTN.ResponseCache.make_key("default", "p", 0.1, "m", json_mode=True)
+    RAMTN.call_qwen("Evaluate the case", "strategic_observer_extraction", temperature=0.1)
+    RAMTN.call_qwen("Evaluate the case", "strategic_observer_extraction", temperature=0.1, json_mode=True)
+    assert backend.calls == 2
+    RAMTN.call_qwen("Evaluate the case", "strategic_observer_extraction", temperature=0.1, json_mode=True)
+    assert backend.calls == 2
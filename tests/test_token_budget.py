@@ -0,0 +1,20 @@
+import RAMTN
+
+
+def test_critic_prompt_is_rebuilt_around_the_fitted_response():
+    response = "\n".join(["【I am confident】"] + [f"- Pricing power point {i} " + "detail " * 30 for i in range(12)]
+                         + ["【I speculate】", "- Brands age slowly"])
+    # The question quotes the response, so patching the first occurrence would rewrite the question instead
+    question = f"Review this earlier draft:\n{response}"
+    budgeter = RAMTN.TokenBudgeter(ceilings={"strategic_critic_extraction": 800})
+    layer = RAMTN.StrategicThinkingLayer(1, question, framework=RAMTN.StrategicDecisionFramework(),
+                                         token_budgeter=budgeter)
+    layer.response = response
+    layer.confidence_triplets = RAMTN.ConfidenceTripletExtractor.extract_triplets(response)
+
+    prompt, role = layer._critic_request()
+    assert f"User Input: {question}\n" in prompt
+    constructor_section = prompt.split("Constructor Strategic Extraction:\n", 1)[1]
+    assert response not in constructor_section
+    assert "Pricing power point 0" in constructor_section
+    assert layer.context_tokens["after"] < layer.context_tokens["before"]
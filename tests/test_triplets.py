@@ -0,0 +1,43 @@
+import pytest
+
+import RAMTN
+
+extract = RAMTN.ConfidenceTripletExtractor.extract_triplets
+
+
+@pytest.mark.parametrize("text", [
+    "【I am confident】\n- Pricing power matters\n【I speculate】\n- Brands age slowly",
+    "I am confident:\n- Pricing power matters\nI speculate:\n- Brands age slowly",
+    "**I am confident**:\n- Pricing power matters\n**I speculate**:\n- Brands age slowly",
+    "**I am confident:**\n- Pricing power matters\n**I speculate:**\n- Brands age slowly",
+    "### I am confident\n- Pricing power matters\n### I speculate\n- Brands age slowly",
+    "1. I am confident:\n- Pricing power matters\n2. I speculate:\n- Brands age slowly",
+    "I am confident\n- Pricing power matters\nI speculate\n- Brands age slowly",
+    "I am confident:\r\n- Pricing power matters\r\nI speculate:\r\n- Brands age slowly",
+])
+def test_header_styles(text):
+    triplets = extract(text)
+    assert triplets["confident"] == ["Pricing power matters"]
+    assert triplets["speculative"] == ["Brands age slowly"]
+    assert triplets["unknown"] == []
+
+
+def test_sentence_starting_with_phrase_is_not_a_header():
+    assert extract("I am confident that this plan works\n- not an item") == \
+        {"confident": [], "speculative": [], "unknown": []}
+
+
+def test_unknown_headers_end_a_section():
+    triplets = extract("【I am confident】\n- Pricing power matters\n【Summary】\n- Not a triplet item")
+    assert triplets["confident"] == ["Pricing power matters"]
+
+
+def test_framework_sections_are_deduplicated_in_order():
+    triplets = {"confident": ["Core principle: buy moats", "High risk of leverage", "Core principle: buy moats",
+                               "Every decision weighs price"],
+                "speculative": [], "unknown": ["Boundary of the model is unknown"]}
+    framework = RAMTN.ConfidenceTripletExtractor.extract_framework_from_triplets(triplets)
+    assert framework["key_insights"] == ["Core principle: buy moats"]
+    assert framework["decision_patterns"] == ["Every decision weighs price"]
+    assert framework["risk_considerations"] == ["High risk of leverage"]
+    assert framework["application_boundaries"] == ["Boundary of the model is unknown"]
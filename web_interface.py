@@ -19,12 +19,27 @@ import gradio as gr
 import webbrowser
 from datetime import datetime
 import io
+import time
+import uuid
+import queue
 import threading
-from contextlib import redirect_stdout, redirect_stderr
+import atexit
+import subprocess
+from contextvars import ContextVar
+from contextlib import contextmanager
 
 original_stdout = sys.stdout
 original_stderr = sys.stderr
 
+# Maximum number of analyses running in parallel
+MAX_CONCURRENT_ANALYSES = int(os.getenv("RAMTN_MAX_CONCURRENCY", "4"))
+# Speculative parallel thinking units per analysis (0 = sequential units)
+SPECULATIVE_UNITS = int(os.getenv("RAMTN_SPECULATIVE_UNITS", "0"))
+# Worker processes consuming the job queue (0 = run analyses inside the web process)
+JOB_WORKERS = int(os.getenv("RAMTN_JOB_WORKERS", "2"))
+# Seconds between job status polls in the browser
+JOB_POLL_INTERVAL = float(os.getenv("RAMTN_JOB_POLL_INTERVAL", "2"))
+
 
 class SafeSilentStream(io.BytesIO):
     def write(self, s):
@@ -45,65 +60,262 @@ class SafeSilentStream(io.BytesIO):
         pass
 
 
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-engine = None
-engine_lock = threading.Lock()
+# Per-request log sink; None means write through to the original stream
+log_capture: ContextVar = ContextVar("log_capture", default=None)
 
 
-def init_engine(api_key):
-    global engine
-    with engine_lock:
-        init_stream = SafeSilentStream()
-        os.environ["DASHSCOPE_API_KEY"] = api_key
+class ContextRoutedStream(io.TextIOBase):
+    """Process stream that forwards writes to the current context's log sink"""
+
+    def __init__(self, fallback):
+        self.fallback = fallback
+
+    @property
+    def encoding(self):
+        return getattr(self.fallback, "encoding", "utf-8")
+
+    def _target(self):
+        capture = log_capture.get()
+        return capture if capture is not None else self.fallback
 
-        with redirect_stdout(init_stream), redirect_stderr(init_stream):
-            from RAMTN import StrategicCognitiveEngine
-            engine = StrategicCognitiveEngine(confidence_threshold=0.75, max_units=2)
+    def write(self, s):
+        return self._target().write(s)
 
-    return "✅ Engine initialized successfully!"
+    def flush(self):
+        self._target().flush()
 
+    def isatty(self):
+        return False
+
+    def fileno(self):
+        return self.fallback.fileno()
 
-def analyze(expert_case, user_question):
-    if not engine:
-        return "❌ Please initialize the engine first with a valid API key!"
 
+@contextmanager
+def capture_logs(stream):
+    """Route print output of the current request (thread/task) into stream"""
+    token = log_capture.set(stream)
     try:
-        # Preprocess input
-        expert_case = expert_case.encode('utf-8', errors='ignore').decode('utf-8', errors='ignore')
-        user_question = user_question.encode('utf-8', errors='ignore').decode('utf-8', errors='ignore')
+        yield stream
+    finally:
+        log_capture.reset(token)
 
-        analysis_stream = SafeSilentStream()
 
-        with engine_lock:
-            sys.stdout = analysis_stream
-            sys.stderr = analysis_stream
+# Installed once; each request only sets its own context variable
+sys.stdout = ContextRoutedStream(original_stdout)
+sys.stderr = ContextRoutedStream(original_stderr)
 
-            # Reinitialize engine
-            from RAMTN import StrategicCognitiveEngine
-            temp_engine = StrategicCognitiveEngine(confidence_threshold=0.75, max_units=2)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from RAMTN import (StrategicCognitiveEngine, StrategicDecisionFramework, FrameworkStore, JobQueue, iter_events,
+                   use_llm_backend, backend_for_api_key)
+
+
+class EnginePool:
+    """
+    Pre-warmed engines handed out one per request
+    - Each engine owns its StrategicDecisionFramework, so one user's extracted framework never reaches another
+    - Engines are reset (results and extracted frameworks cleared) on release and reused
+    """
+
+    def __init__(self, size, framework_store):
+        self._idle = queue.Queue()
+        for _ in range(size):
+            framework = StrategicDecisionFramework()
+            framework.frameworks.items()  # Build the built-in frameworks now rather than on first request
+            self._idle.put(StrategicCognitiveEngine(confidence_threshold=0.75, max_units=2,
+                                                    framework=framework,
+                                                    framework_store=framework_store,
+                                                    speculative_units=SPECULATIVE_UNITS))
+
+    @contextmanager
+    def engine(self):
+        """Borrow an engine for one request; blocks while all engines are busy"""
+        pooled_engine = self._idle.get()
+        try:
+            yield pooled_engine
+        finally:
+            pooled_engine.reset()
+            self._idle.put(pooled_engine)
+
+
+engine_pool = None
+job_queue = None
+job_workers = None  # `RAMTN.py worker` supervisor process
+saved_reports = {}  # job id -> report file written for it
+engine_lock = threading.Lock()  # Guards engine initialization only
+
+
+def start_job_workers():
+    """Start the worker supervisor once; each job carries its own API key, so it is never restarted for a new key"""
+    global job_workers
+    if job_workers is not None and job_workers.poll() is None:
+        return
+
+    ramtn_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "RAMTN.py")
+    job_workers = subprocess.Popen([sys.executable, ramtn_path, "worker", "--processes", str(JOB_WORKERS),
+                                    "--jobs-db", job_queue.path],
+                                   env=dict(os.environ), stdout=subprocess.DEVNULL)
+
+
+@atexit.register
+def stop_job_workers():
+    if job_workers is not None and job_workers.poll() is None:
+        job_workers.terminate()
+        job_workers.wait()
 
-            # Execute core analysis (完整获取报告的步骤)
-            extraction_result = temp_engine.extract_strategic_framework(expert_case)
-            implantation_result = temp_engine.implant_strategy(user_question)
-            full_report = temp_engine.get_comprehensive_report()  # 补上这行！
 
-            # Cleanse report
-            full_report = full_report.encode('utf-8', errors='ignore').decode('utf-8', errors='ignore')
+def init_engine(api_key):
+    """Set up the shared engines once; the API key is kept in the session state, never in the process environment"""
+    global engine_pool, job_queue
+    with engine_lock:
+        if JOB_WORKERS > 0:
+            if job_queue is None:
+                job_queue = JobQueue()
+            start_job_workers()
+        # Each analysis calls with its own session's key, so the pool is shared by all sessions
+        elif engine_pool is None:
+            with capture_logs(SafeSilentStream()):
+                engine_pool = EnginePool(MAX_CONCURRENT_ANALYSES, FrameworkStore())
+
+    return "✅ Engine initialized successfully!", api_key
+
+
+class ProgressLog:
+    """Renders engine progress events as live text (constructor tokens shown as they arrive)"""
+
+    def __init__(self):
+        self.lines = ["⏳ Analysis started..."]
+        self.tokens = []
+
+    def add(self, event):
+        kind = event["type"]
+        if kind == "constructor_token":
+            self.tokens.append(event["token"])
+            return
+
+        prefix = f"[Unit {event['unit']} · Layer {event['layer']}] " if "layer" in event else ""
+        if kind == "extraction_started":
+            self.lines.append("🔎 Strategic extraction started")
+        elif kind == "framework_loaded":
+            self.lines.append(f"📂 Reusing stored framework {event['framework_id']}")
+        elif kind == "implantation_started":
+            self.lines.append("🧭 Strategic implantation started")
+        elif kind == "unit_started":
+            self.lines.append(f"▶ {event['mode'].capitalize()} unit {event['unit']} started")
+        elif kind == "layer_started":
+            self.tokens = []
+            self.lines.append(f"{prefix}Constructor generating...")
+        elif kind == "constructor_completed":
+            self.tokens = []
+            self.lines.append(f"{prefix}Constructor done ({event['length']} characters)")
+        elif kind == "layer_early_terminated":
+            self.lines.append(f"{prefix}Content stabilized, early termination")
+        elif kind == "critique_ready":
+            self.lines.append(f"{prefix}Critique ready")
+        elif kind == "observer_score":
+            self.lines.append(f"{prefix}Observer confidence {event['confidence_score']:.2f}")
+        elif kind == "unit_completed":
+            self.lines.append(f"✔ Unit {event['unit']} completed: confidence {event['final_confidence']:.2f}")
+        elif kind in ("extraction_completed", "implantation_completed"):
+            self.lines.append(f"✅ {kind.split('_')[0].capitalize()} completed: "
+                              f"confidence {event['final_confidence']:.2f}")
+
+    def render(self):
+        text = "\n".join(self.lines)
+        if self.tokens:
+            text += "\n\n" + "".join(self.tokens)
+        return text
+
+
+def run_analysis(expert_case, user_question, api_key):
+    """Full analysis for one request; runs in the event worker thread with its own log capture and API key"""
+    with capture_logs(SafeSilentStream()), use_llm_backend(backend_for_api_key(api_key)), \
+            engine_pool.engine() as pooled_engine:
+        # Execute core analysis (完整获取报告的步骤); reuse the stored framework for a known case
+        pooled_engine.extract_or_load_framework(expert_case)
+        pooled_engine.implant_strategy(user_question)
+        return pooled_engine.get_comprehensive_report()
+
+
+def analyze(expert_case, user_question, session_key):
+    if engine_pool is None or not session_key:
+        yield "❌ Please initialize the engine first with a valid API key!"
+        return
 
-            sys.stdout = original_stdout
-            sys.stderr = original_stderr
+    try:
+        # Preprocess input
+        expert_case = expert_case.encode('utf-8', errors='ignore').decode('utf-8', errors='ignore')
+        user_question = user_question.encode('utf-8', errors='ignore').decode('utf-8', errors='ignore')
 
-        # Save report
-        report_path = os.path.join(os.path.expanduser("~"),
-                                   f"ramtn_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md")
-        with open(report_path, "wb") as f:
-            f.write(full_report.encode('utf-8', errors='ignore'))
+        progress = ProgressLog()
+        yield progress.render()
 
-        return f"✅ Analysis completed! Report saved to: {report_path}\n\n{full_report}"
+        full_report = ""
+        last_render = 0.0
+        for event in iter_events(run_analysis, expert_case, user_question, session_key):
+            if event["type"] == "result":
+                full_report = event["result"]
+                break
+            progress.add(event)
+            # Throttle token-only updates; structural events always refresh
+            if event["type"] != "constructor_token" or time.time() - last_render > 0.1:
+                last_render = time.time()
+                yield progress.render()
+
+        full_report, report_path = save_report(full_report)
+        yield f"✅ Analysis completed! Report saved to: {report_path}\n\n{full_report}"
 
     except Exception as e:
         safe_error = str(e).encode('utf-8', errors='ignore').decode('utf-8', errors='ignore')
-        return f"❌ Analysis failed: {safe_error}"
+        yield f"❌ Analysis failed: {safe_error}"
+
+
+def save_report(full_report):
+    """Write a report to the home directory (unique suffix: reports may finish within the same second)"""
+    full_report = full_report.encode('utf-8', errors='ignore').decode('utf-8', errors='ignore')
+    report_path = os.path.join(os.path.expanduser("~"),
+                               f"ramtn_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}.md")
+    with open(report_path, "wb") as f:
+        f.write(full_report.encode('utf-8', errors='ignore'))
+    return full_report, report_path
+
+
+def submit_analysis(expert_case, user_question, session_key):
+    """Queue an analysis (run with this session's API key) and return its job id right away; poll_job reports progress"""
+    if job_queue is None or not session_key:
+        return "❌ Please initialize the engine first with a valid API key!", ""
+
+    expert_case = expert_case.encode('utf-8', errors='ignore').decode('utf-8', errors='ignore')
+    user_question = user_question.encode('utf-8', errors='ignore').decode('utf-8', errors='ignore')
+    job_id = job_queue.submit("analysis", {"expert_case": expert_case, "question": user_question},
+                              api_key=session_key)
+    return f"⏳ Job {job_id} queued", job_id
+
+
+def poll_job(job_id):
+    """Render the status of a job; the finished report is saved to a file once"""
+    job_id = (job_id or "").strip()
+    if not job_id or job_queue is None:
+        return gr.skip()
+
+    job = job_queue.get(job_id)
+    if job is None:
+        return f"❌ Unknown job id: {job_id}"
+    if job["status"] == "queued":
+        return f"⏳ Job {job_id} queued ({job_queue.position(job_id)} jobs ahead)"
+    if job["status"] == "failed":
+        return f"❌ Analysis failed: {job['error']}"
+
+    if job["status"] == "completed":
+        if job_id not in saved_reports:
+            saved_reports[job_id] = save_report(job["result"]["report"])
+        full_report, report_path = saved_reports[job_id]
+        return f"✅ Analysis completed! Report saved to: {report_path}\n\n{full_report}"
+
+    progress = ProgressLog()
+    for event in job["events"]:
+        progress.add(event)
+    return f"Job {job_id} running\n\n" + progress.render()
 
 
 # ===================== Gradio Interface =====================
@@ -123,16 +335,25 @@ with gr.Blocks() as demo:
     api_key = gr.Textbox(label="DashScope API Key", type="password", placeholder="Paste your API key here...")
     init_btn = gr.Button("Initialize Engine")
     init_status = gr.Textbox(label="Initialization Status", interactive=False)
+    session_key = gr.State()  # This session's API key
 
     expert_case = gr.Textbox(label="Expert Case (Strategic Scenario)", lines=8,
                              placeholder="Enter the strategic case text here...")
     user_question = gr.Textbox(label="Analysis Question", lines=3, placeholder="Enter your strategic question here...")
     analyze_btn = gr.Button("Start Analysis")
+    job_id = gr.Textbox(label="Job ID (paste an earlier id to check on it)", visible=JOB_WORKERS > 0)
     result = gr.Textbox(label="Analysis Result", lines=15)
 
-    init_btn.click(init_engine, inputs=[api_key], outputs=[init_status])
-    analyze_btn.click(analyze, inputs=[expert_case, user_question], outputs=[result])
+    init_btn.click(init_engine, inputs=[api_key], outputs=[init_status, session_key])
+    if JOB_WORKERS > 0:
+        analyze_btn.click(submit_analysis, inputs=[expert_case, user_question, session_key],
+                          outputs=[result, job_id])
+        gr.Timer(JOB_POLL_INTERVAL).tick(poll_job, inputs=[job_id], outputs=[result])
+    else:
+        analyze_btn.click(analyze, inputs=[expert_case, user_question, session_key], outputs=[result],
+                          concurrency_limit=MAX_CONCURRENT_ANALYSES)
 
 if __name__ == "__main__":
+    demo.queue(default_concurrency_limit=MAX_CONCURRENT_ANALYSES)
     demo.launch(server_port=8080)
     webbrowser.open("http://localhost:8080")
\ No newline at end of file